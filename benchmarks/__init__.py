@@ -0,0 +1 @@
+"""Benchmarks for Shadeform SDK, run against the local stand-in API."""
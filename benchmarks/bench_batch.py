@@ -0,0 +1,87 @@
+"""
+Benchmark preparing a mass launch row by row and as a columnar batch.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_batch
+
+Both paths validate every row and produce each request's JSON body and
+idempotency key for ROWS launches spread over a few types and regions;
+nothing is sent.
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+from shadeform.batch import LaunchBatch
+from shadeform.utils.helpers import (
+    LaunchConfiguration,
+    idempotency_key,
+    validate_instance_type,
+)
+
+ROWS = 5000
+RUNS = 5
+TYPES = ["A100_80Gx1", "H100_80Gx8", "T4_16Gx1"]
+REGIONS = ["us-west-2", "us-east-1", "us-central1", "fin-01"]
+
+NAMES = [f"worker-{i}" for i in range(ROWS)]
+INSTANCE_TYPES = [TYPES[i % len(TYPES)] for i in range(ROWS)]
+ROW_REGIONS = [REGIONS[i % len(REGIONS)] for i in range(ROWS)]
+
+
+def launch_config() -> Dict[str, Any]:
+    return LaunchConfiguration.docker(
+        "pytorch/pytorch:latest",
+        command="python train.py",
+        env_vars={"EPOCHS": "10", "DATASET": "s3://bucket/data"},
+        ports=[8080],
+    )
+
+
+def per_row() -> List[Tuple[bytes, str]]:
+    prepared = []
+    for name, instance_type, region in zip(NAMES, INSTANCE_TYPES, ROW_REGIONS):
+        if not validate_instance_type(instance_type):
+            raise ValueError(instance_type)
+        payload = {
+            "provider": "aws",
+            "name": name,
+            "region": region,
+            "instance_type": instance_type,
+            "launch_configuration": launch_config(),
+        }
+        key = idempotency_key("POST", "/instances/create", payload)
+        prepared.append((json.dumps(payload).encode(), key))
+    return prepared
+
+
+def batched() -> List[Tuple[bytes, str]]:
+    batch = LaunchBatch(
+        names=NAMES,
+        instance_types=INSTANCE_TYPES,
+        regions=ROW_REGIONS,
+        providers="aws",
+        launch_configs=launch_config(),
+    )
+    batch.check()
+    return list(zip(batch.bodies(), batch.keys()))
+
+
+def main() -> None:
+    for label, prepare in [("per-row", per_row), ("batch", batched)]:
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            prepare()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(
+            f"{label:>8}: {best * 1000:7.1f}ms for {ROWS} rows "
+            f"({best / ROWS * 1e6:5.2f}us/row)"
+        )
+
+
+if __name__ == "__main__":
+    main()
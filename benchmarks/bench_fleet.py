@@ -0,0 +1,64 @@
+"""
+Benchmark converging a 1,000-instance fleet spec against the stand-in API.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fleet
+"""
+
+import time
+
+from shadeform import ShadeformClient
+from shadeform.fleet import FleetReconciler, FleetSpec, InstanceGroup, VolumeSpec
+from tests.standin import StandInServer
+
+LAUNCH = {"type": "docker", "image": "busybox"}
+
+
+def spec(scale: int) -> FleetSpec:
+    groups = [
+        InstanceGroup("aws", "A100_80Gx1", "us-west-2", 4 * scale, LAUNCH),
+        InstanceGroup("lambdalabs", "A100_80Gx1", "us-south-1", 3 * scale, LAUNCH),
+        InstanceGroup("gcp", "T4_16Gx1", "us-central1", 2 * scale, LAUNCH),
+        InstanceGroup(
+            "datacrunch",
+            "A100_80Gx1",
+            "fin-01",
+            scale,
+            LAUNCH,
+            volumes={"scratch": "/mnt/scratch"},
+        ),
+    ]
+    return FleetSpec(
+        "bench", instances=groups, volumes=[VolumeSpec("aws", "scratch", 500, "gp3")]
+    )
+
+
+def step(reconciler: FleetReconciler, label: str, target: FleetSpec) -> None:
+    start = time.perf_counter()
+    plan = reconciler.plan(target)
+    planned = time.perf_counter()
+    result = reconciler.apply(plan)
+    result.raise_for_errors()
+    done = time.perf_counter()
+    print(
+        f"{label:>18}: {len(plan):5d} actions, plan {(planned - start) * 1000:7.1f}ms, "
+        f"apply {done - planned:6.2f}s"
+    )
+
+
+def main() -> None:
+    with StandInServer() as server:
+        client = ShadeformClient(
+            api_key="bench", base_url=server.base_url, max_connections=32
+        )
+        reconciler = FleetReconciler(client, parallelism=32)
+        step(reconciler, "create 1000", spec(100))
+        step(reconciler, "no-op", spec(100))
+        step(reconciler, "scale to 500", spec(50))
+        step(reconciler, "teardown", FleetSpec("bench"))
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark tail latency of GET requests with and without hedging.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_hedging
+"""
+
+import random
+import time
+from typing import List
+
+from shadeform import ShadeformClient
+from shadeform.hedging import HedgePolicy
+from tests.standin import StandInServer
+
+REQUESTS = 300
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+
+def run(client: ShadeformClient) -> List[float]:
+    latencies = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        client.instances.list_all()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> None:
+    rng = random.Random(42)
+
+    def latency(method: str, path: str) -> float:
+        # 2% of requests stall for 500ms, the rest take 2-5ms
+        return 0.5 if rng.random() < 0.02 else rng.uniform(0.002, 0.005)
+
+    with StandInServer(latency=latency) as server:
+        for label, policy in [
+            ("baseline", None),
+            ("hedged", HedgePolicy(percentile=95)),
+        ]:
+            client = ShadeformClient(
+                api_key="bench", base_url=server.base_url, hedging=policy
+            )
+            latencies = run(client)
+            print(
+                f"{label:>8}: p50={percentile(latencies, 50) * 1000:7.1f}ms "
+                f"p99={percentile(latencies, 99) * 1000:7.1f}ms "
+                f"max={max(latencies) * 1000:7.1f}ms"
+            )
+            if policy is not None:
+                print(f"          {policy.stats()}")
+                policy.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark decoding a large instance listing eagerly and lazily.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_lazy
+
+Each mode decodes a listing of RECORDS instances and reads three fields of
+every record, as a status loop does; CPU time and peak traced memory are
+reported.
+"""
+
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from shadeform.lazy import loads
+
+RECORDS = 10000
+RUNS = 5
+
+
+def listing() -> bytes:
+    records = [
+        {
+            "id": f"inst-{i:06d}",
+            "name": f"worker-{i}",
+            "status": "active",
+            "public_ip": f"10.0.{i // 250}.{i % 250}",
+            "cloud": "aws",
+            "region": "us-west-2",
+            "shade_instance_type": "A100_80Gx1",
+            "cloud_instance_type": "p4d.24xlarge",
+            "configuration": {
+                "memory_in_gb": 80,
+                "storage_in_gb": 512,
+                "vcpus": 12,
+                "num_gpus": 1,
+                "gpu_type": "A100",
+                "interconnect": "pcie",
+                "vram_per_gpu_in_gb": 80,
+                "os": "ubuntu22.04_cuda12.2_shade",
+            },
+            "launch_configuration": {
+                "type": "docker",
+                "docker_configuration": {
+                    "image": "pytorch/pytorch:latest",
+                    "envs": [{"name": "TOKEN", "value": "x" * 40}],
+                    "port_mappings": [{"host_port": 80, "container_port": 8080}],
+                },
+            },
+            "hourly_price": 350,
+            "ssh_user": "shadeform",
+            "ssh_port": 22,
+            "created_at": "2024-01-01T00:00:00Z",
+            "deleted_at": None,
+        }
+        for i in range(RECORDS)
+    ]
+    return json.dumps({"instances": records}).encode()
+
+
+def read(decode: Callable[[bytes], Any], body: bytes) -> List[Tuple[Any, ...]]:
+    data = decode(body)
+    return [(r["id"], r["status"], r["public_ip"]) for r in data["instances"]]
+
+
+def main() -> None:
+    body = listing()
+    print(f"listing: {RECORDS} instances, {len(body) / 1e6:.1f}MB")
+    for label, decode in [("eager", json.loads), ("lazy", loads)]:
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            read(decode, body)
+            timings.append(time.perf_counter() - start)
+        tracemalloc.start()
+        read(decode, body)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"{label:>6}: best={min(timings) * 1000:7.1f}ms "
+            f"peak={peak / 1e6:6.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
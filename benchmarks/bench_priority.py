@@ -0,0 +1,74 @@
+"""
+Benchmark interactive latency while a bulk teardown saturates the client.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_priority
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from shadeform import ShadeformClient
+from shadeform.scheduler import BULK, INTERACTIVE, PriorityScheduler
+from tests.standin import StandInServer
+
+BULK_DELETES = 1000
+INTERACTIVE_CALLS = 100
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+
+def run(server: StandInServer, bulk: bool, prioritize: bool) -> List[float]:
+    client = ShadeformClient(
+        api_key="bench",
+        base_url=server.base_url,
+        scheduler=PriorityScheduler(max_in_flight=8),
+    )
+    launch = {"type": "docker", "image": "busybox"}
+    target = client.instances.create("aws", "ui", "us-west-2", "A100_80Gx1", launch)
+    ids = [
+        client.instances.create("aws", f"n{i}", "us-west-2", "A100_80Gx1", launch)["id"]
+        for i in range(BULK_DELETES if bulk else 0)
+    ]
+    bulk_priority: Optional[str] = BULK if prioritize else None
+    ui_priority: Optional[str] = INTERACTIVE if prioritize else None
+
+    pool = ThreadPoolExecutor(max_workers=64)
+    done = threading.Event()
+    futures = [pool.submit(client.instances.delete, i, bulk_priority) for i in ids]
+    threading.Thread(
+        target=lambda: [f.result() for f in futures] and done.set(), daemon=True
+    ).start()
+
+    latencies = []
+    for _ in range(INTERACTIVE_CALLS):
+        start = time.perf_counter()
+        client.instances.get_info(target["id"], priority=ui_priority)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.005)
+    pool.shutdown(wait=True)
+    return latencies
+
+
+def main() -> None:
+    with StandInServer(latency=lambda method, path: 0.005) as server:
+        for label, bulk, prioritize in [
+            ("idle", False, False),
+            ("bulk fifo", True, False),
+            ("bulk prio", True, True),
+        ]:
+            latencies = run(server, bulk, prioritize)
+            print(
+                f"{label:>10}: interactive p50={percentile(latencies, 50) * 1000:7.1f}ms "
+                f"p99={percentile(latencies, 99) * 1000:7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark import and construction time against a regression budget.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup
+
+Each measurement runs in a fresh interpreter and the median of several runs
+is compared to its budget. The script exits with status 1 if a budget is
+exceeded.
+"""
+
+import statistics
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+RUNS = 7
+
+# Measurement name -> (setup, timed statement, budget in milliseconds)
+MEASUREMENTS: Dict[str, Tuple[str, str, float]] = {
+    "import shadeform": ("", "import shadeform", 25.0),
+    "ShadeformClient()": (
+        "from shadeform import ShadeformClient",
+        "ShadeformClient(api_key='bench')",
+        1.0,
+    ),
+    "first .instances": (
+        "from shadeform import ShadeformClient; c = ShadeformClient(api_key='bench')",
+        "c.instances",
+        10.0,
+    ),
+}
+
+TEMPLATE = """
+import time
+{setup}
+start = time.perf_counter()
+{statement}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def measure(setup: str, statement: str) -> float:
+    samples = []
+    for _ in range(RUNS):
+        code = TEMPLATE.format(setup=setup, statement=statement)
+        output = subprocess.check_output([sys.executable, "-c", code], text=True)
+        samples.append(float(output))
+    return statistics.median(samples)
+
+
+def main() -> int:
+    failed = False
+    for name, (setup, statement, budget) in MEASUREMENTS.items():
+        elapsed = measure(setup, statement)
+        status = "ok" if elapsed <= budget else "OVER BUDGET"
+        failed = failed or elapsed > budget
+        print(f"{name:>20}: {elapsed:7.2f}ms (budget {budget:.1f}ms) {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
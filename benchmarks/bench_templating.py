@@ -0,0 +1,84 @@
+"""
+Benchmark building per-job launch configurations from scratch and by
+rendering a compiled template.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_templating
+
+Both paths produce the canonical JSON of JOBS launch configurations that
+differ in image tag, environment variables and script arguments; nothing
+is sent.
+"""
+
+import json
+import time
+from typing import Any, Dict, List
+
+from shadeform.templating import CompiledTemplate
+from shadeform.utils.helpers import LaunchConfiguration
+
+JOBS = 10000
+RUNS = 5
+
+TEMPLATE = LaunchConfiguration.docker(
+    "pytorch/pytorch:{{ tag }}",
+    command="python train.py --run {{ run_id }} --seed {{ seed }} --lr 3e-4",
+    env_vars={
+        "RUN_ID": "{{ run_id }}",
+        "DATASET": "s3://bucket/datasets/imagenet",
+        "CHECKPOINTS": "s3://bucket/checkpoints/{{ run_id }}",
+        "WANDB_PROJECT": "vision",
+        "NCCL_DEBUG": "WARN",
+    },
+    ports=[22, 8888, 6006],
+)
+
+VALUES = [{"tag": f"2.{i % 4}", "run_id": f"job-{i}", "seed": i} for i in range(JOBS)]
+
+
+def from_scratch() -> List[bytes]:
+    rendered = []
+    for values in VALUES:
+        run_id = values["run_id"]
+        config: Dict[str, Any] = LaunchConfiguration.docker(
+            f"pytorch/pytorch:{values['tag']}",
+            command=f"python train.py --run {run_id} --seed {values['seed']} "
+            "--lr 3e-4",
+            env_vars={
+                "RUN_ID": run_id,
+                "DATASET": "s3://bucket/datasets/imagenet",
+                "CHECKPOINTS": f"s3://bucket/checkpoints/{run_id}",
+                "WANDB_PROJECT": "vision",
+                "NCCL_DEBUG": "WARN",
+            },
+            ports=[22, 8888, 6006],
+        )
+        rendered.append(
+            json.dumps(config, sort_keys=True, separators=(",", ":")).encode()
+        )
+    return rendered
+
+
+def compiled() -> List[bytes]:
+    template = CompiledTemplate(TEMPLATE)
+    return [template.render_json(values) for values in VALUES]
+
+
+def main() -> None:
+    assert from_scratch() == compiled()
+    for label, build in [("scratch", from_scratch), ("compiled", compiled)]:
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            build()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(
+            f"{label:>8}: {best * 1000:7.1f}ms for {JOBS} jobs "
+            f"({best / JOBS * 1e6:5.2f}us/job)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark the per-call overhead of schema validation in each mode.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_validation
+
+Each mode checks a create payload and its response, and an instance
+listing, as ``BaseResource`` does for every call; the time is reported per
+call, excluding the network.
+"""
+
+import time
+from typing import Any, Dict, List
+
+from shadeform.validation import SchemaValidator
+
+CALLS = 2000
+LISTED = 50
+
+PAYLOAD: Dict[str, Any] = {
+    "provider": "aws",
+    "name": "worker",
+    "region": "us-west-2",
+    "instance_type": "A100_80Gx1",
+    "launch_configuration": {"type": "docker", "image": "pytorch/pytorch:latest"},
+    "ssh_key_id": "key-1",
+}
+
+LISTING: Dict[str, List[Dict[str, Any]]] = {
+    "instances": [
+        {
+            "id": f"inst-{i}",
+            "name": f"worker-{i}",
+            "status": "active",
+            "ip": f"10.0.0.{i}",
+            "region": "us-west-2",
+            "instance_type": "A100_80Gx1",
+            "launch_configuration": PAYLOAD["launch_configuration"],
+        }
+        for i in range(LISTED)
+    ]
+}
+
+
+def run(validator: SchemaValidator) -> Dict[str, float]:
+    # Compile the adapters outside the timed loop
+    validator.check_request("POST", "/instances/create", PAYLOAD)
+    timings = {}
+    for label, call in [
+        (
+            "create",
+            lambda: (
+                validator.check_request("POST", "/instances/create", PAYLOAD),
+                validator.check_response("POST", "/instances/create", {"id": "x"}),
+            ),
+        ),
+        ("list_all", lambda: validator.check_response("GET", "/instances", LISTING)),
+    ]:
+        call()
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            call()
+        timings[label] = (time.perf_counter() - start) / CALLS * 1e6
+    return timings
+
+
+def main() -> None:
+    for label, validator in [
+        ("off", SchemaValidator("off")),
+        ("sampled", SchemaValidator("sampled", sample_rate=100)),
+        ("strict", SchemaValidator("strict")),
+    ]:
+        timings = run(validator)
+        print(
+            f"{label:>8}: create={timings['create']:7.2f}us "
+            f"list_all({LISTED})={timings['list_all']:7.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,12 @@ setup(
             'sphinx-rtd-theme>=0.5.2',
             'pytest-cov>=2.12.1',
         ],
+        'validation': [
+            'pydantic>=2.0',
+        ],
+        'lazy': [
+            'msgspec>=0.18',
+        ],
     },
     classifiers=[
         'Development Status :: 3 - Alpha',
@@ -4,17 +4,25 @@ Shadeform Python SDK
 A Python SDK for managing GPU instances and infrastructure through the Shadeform API.
 """
 
-from .client import ShadeformClient
+from typing import TYPE_CHECKING, Any
+
 from .error import (
     ShadeformAPIError,
     ShadeformAuthError,
+    ShadeformBatchValidationError,
+    ShadeformCircuitOpenError,
     ShadeformConfigurationError,
     ShadeformError,
+    ShadeformRateLimitError,
     ShadeformResourceError,
     ShadeformValidationError,
+    ShadeformWorkflowError,
 )
 from .utils.helpers import LaunchConfiguration, VolumeConfiguration
 
+if TYPE_CHECKING:
+    from .client import ShadeformClient
+
 __version__ = "0.1.0"
 __author__ = "Shadeform, Inc."
 __license__ = "MIT"
@@ -29,8 +37,12 @@ __all__ = [
     "ShadeformAPIError",
     "ShadeformAuthError",
     "ShadeformValidationError",
+    "ShadeformBatchValidationError",
     "ShadeformResourceError",
     "ShadeformConfigurationError",
+    "ShadeformRateLimitError",
+    "ShadeformCircuitOpenError",
+    "ShadeformWorkflowError",
     "LaunchConfiguration",
     "VolumeConfiguration",
 ]
@@ -46,6 +58,15 @@ LaunchConfigType = dict
 VolumeAttachmentType = dict
 
 
+def __getattr__(name: str) -> Any:
+    """Import the client (and with it, requests) only when first used."""
+    if name == "ShadeformClient":
+        from .client import ShadeformClient
+
+        return ShadeformClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_version() -> str:
     """Return the current version of the SDK."""
     return __version__
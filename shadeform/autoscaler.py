@@ -0,0 +1,295 @@
+"""Queue-driven autoscaling of instance groups for Shadeform SDK."""
+
+import logging
+import math
+import threading
+import time
+import uuid
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+)
+
+from .fleet import TERMINAL_STATUSES, InstanceGroup
+from .futures import gather
+from .instrumentation import AUTOSCALE
+from .scheduler import BULK
+
+if TYPE_CHECKING:
+    from .client import ShadeformClient
+
+logger = logging.getLogger(__name__)
+
+QueueDepthSource = Callable[[], Mapping[str, float]]
+BusySource = Callable[[], Iterable[str]]
+
+# Length of the random suffix ending every autoscaled instance name
+SUFFIX_LENGTH = 8
+
+
+class ScalingPolicy:
+    """How one instance group is sized from the depth of its queue."""
+
+    def __init__(
+        self,
+        group: InstanceGroup,
+        throughput: float,
+        drain_time: float = 300.0,
+        max_count: int = 10,
+        queue: Optional[str] = None,
+        hysteresis: int = 1,
+        scale_up_cooldown: float = 30.0,
+        scale_down_cooldown: float = 300.0,
+        max_batch: int = 10,
+    ) -> None:
+        """
+        Initialize the scaling policy.
+
+        Args:
+            group: Instances to launch; ``count`` is the minimum kept running
+            throughput: Jobs per second one instance completes
+            drain_time: Seconds in which the current backlog should be done
+            max_count: Upper bound on instances
+            queue: Queue name in the depth source (default: the group name)
+            hysteresis: Scale down only when the target is more than this
+                many instances below the current count, or is the minimum
+            scale_up_cooldown: Seconds after a scale-up before the next one
+            scale_down_cooldown: Seconds after any scaling before a scale-down
+            max_batch: Maximum instances launched per evaluation
+
+        Raises:
+            ValueError: If throughput, drain_time or the bounds are invalid
+        """
+        if throughput <= 0 or drain_time <= 0:
+            raise ValueError("throughput and drain_time must be positive")
+        if max_count < group.count:
+            raise ValueError("max_count must be at least the group's count")
+        self.group = group
+        self.throughput = throughput
+        self.drain_time = drain_time
+        self.min_count = group.count
+        self.max_count = max_count
+        self.queue = queue or group.name
+        self.hysteresis = hysteresis
+        self.scale_up_cooldown = scale_up_cooldown
+        self.scale_down_cooldown = scale_down_cooldown
+        self.max_batch = max_batch
+
+    def target(self, depth: float) -> int:
+        """
+        Return the number of instances needed to drain a backlog in time.
+
+        Args:
+            depth: Jobs waiting in the queue
+
+        Returns:
+            Target instance count within the policy bounds
+        """
+        needed = math.ceil(max(depth, 0) / (self.throughput * self.drain_time))
+        return max(self.min_count, min(self.max_count, needed))
+
+
+class Autoscaler:
+    """
+    Size instance groups to pending work.
+
+    Every evaluation reads queue depths from a pluggable source and the
+    inventory from one ``instances.list_all()`` sweep, then moves each group
+    towards ``ceil(depth / (throughput * drain_time))`` instances. Launches
+    run in parallel batches; scale-downs wait for the cooldown, are damped by
+    the hysteresis, and only remove instances the optional ``busy`` source
+    does not report as working (launching ones first).
+
+    Example:
+        scaler = Autoscaler(
+            client,
+            [ScalingPolicy(InstanceGroup("aws", "A100_80Gx1", "us-west-2", 0, launch),
+                           throughput=0.1)],
+            queue_depth=lambda: {"A100_80Gx1-us-west-2": queue.qsize()},
+            busy=lambda: workers.busy_instance_ids(),
+        )
+        scaler.start()
+    """
+
+    def __init__(
+        self,
+        client: "ShadeformClient",
+        policies: Iterable[ScalingPolicy],
+        queue_depth: QueueDepthSource,
+        busy: Optional[BusySource] = None,
+        prefix: str = "autoscale",
+        interval: float = 30.0,
+        ssh_key_id: Optional[str] = None,
+        priority: Optional[str] = BULK,
+    ) -> None:
+        """
+        Initialize the autoscaler.
+
+        Args:
+            client: The Shadeform client instance
+            policies: One scaling policy per instance group
+            queue_depth: Callable returning the depth of each queue by name
+            busy: Optional callable returning IDs of instances running jobs
+            prefix: Name prefix marking instances owned by the autoscaler
+            interval: Seconds between evaluations in the background
+            ssh_key_id: Optional SSH key ID for launched instances
+            priority: Scheduling priority for launches and deletes
+        """
+        self.client = client
+        self.policies = list(policies)
+        self.queue_depth = queue_depth
+        self.busy = busy
+        self.prefix = prefix
+        self.interval = interval
+        self.ssh_key_id = ssh_key_id
+        self.priority = priority
+
+        self._last_scaled: Dict[str, float] = {}
+        self._last_scaled_up: Dict[str, float] = {}
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _name_prefix(self, policy: ScalingPolicy) -> str:
+        return f"{self.prefix}-{policy.group.name}-"
+
+    def inventory(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch the autoscaled instances with one ``list_all`` call.
+
+        Returns:
+            Live instances per group name
+        """
+        listed = self.client.instances.list_all()
+        inventory: Dict[str, List[Dict[str, Any]]] = {
+            policy.group.name: [] for policy in self.policies
+        }
+        # Compare whole names, so group 'gpu' never counts 'gpu-east' instances
+        groups = {self._name_prefix(p): p.group.name for p in self.policies}
+        for instance in listed:
+            if instance.get("status") in TERMINAL_STATUSES:
+                continue
+            head, _, suffix = str(instance.get("name", "")).rpartition("-")
+            group = groups.get(head + "-")
+            if group is not None and len(suffix) == SUFFIX_LENGTH:
+                inventory[group].append(instance)
+        return inventory
+
+    def step(self) -> Dict[str, Dict[str, float]]:
+        """
+        Evaluate every group once and scale it.
+
+        Returns:
+            Per group name: depth, current, target, launched and deleted
+        """
+        depths = self.queue_depth()
+        inventory = self.inventory()
+        busy = set(self.busy()) if self.busy is not None else set()
+        now = time.monotonic()
+        decisions = {}
+        for policy in self.policies:
+            name = policy.group.name
+            instances = inventory[name]
+            depth = depths.get(policy.queue, 0)
+            current = len(instances)
+            target = policy.target(depth)
+            launched = deleted = 0
+
+            since_scaled = now - self._last_scaled.get(name, -math.inf)
+            since_up = now - self._last_scaled_up.get(name, -math.inf)
+            if target > current and since_up >= policy.scale_up_cooldown:
+                launched = self._launch(policy, min(target - current, policy.max_batch))
+                if launched:
+                    self._last_scaled[name] = self._last_scaled_up[name] = now
+            elif (
+                current > target
+                and (current - target > policy.hysteresis or target == policy.min_count)
+                and since_scaled >= policy.scale_down_cooldown
+            ):
+                deleted = self._retire(instances, busy, current - target)
+                if deleted:
+                    self._last_scaled[name] = now
+
+            decision = {
+                "depth": depth,
+                "current": current,
+                "target": target,
+                "launched": launched,
+                "deleted": deleted,
+            }
+            decisions[name] = decision
+            if (launched or deleted) and self.client.instrumentation.has_hooks(
+                AUTOSCALE
+            ):
+                self.client.instrumentation.emit(AUTOSCALE, group=name, **decision)
+        return decisions
+
+    def _launch(self, policy: ScalingPolicy, count: int) -> int:
+        """Launch a batch of instances in parallel and count the successes."""
+        group = policy.group
+        futures = [
+            self.client.futures.instances.create(
+                group.provider,
+                self._name_prefix(policy) + uuid.uuid4().hex[:SUFFIX_LENGTH],
+                group.region,
+                group.instance_type,
+                group.launch_config,
+                ssh_key_id=self.ssh_key_id,
+                priority=self.priority,
+            )
+            for _ in range(count)
+        ]
+        results = gather(futures, return_exceptions=True)
+        for error in (r for r in results if isinstance(r, BaseException)):
+            logger.warning("Autoscaler launch for %s failed: %s", group.name, error)
+        return sum(1 for r in results if not isinstance(r, BaseException))
+
+    def _retire(
+        self, instances: List[Dict[str, Any]], busy: Iterable[str], count: int
+    ) -> int:
+        """Delete up to ``count`` idle instances, still-launching ones first."""
+        idle = [i for i in instances if i["id"] not in busy]
+        idle.sort(key=lambda i: i.get("status") == "active")
+        futures = [
+            self.client.futures.instances.delete(instance["id"], self.priority)
+            for instance in idle[:count]
+        ]
+        results = gather(futures, return_exceptions=True)
+        for error in (r for r in results if isinstance(r, BaseException)):
+            logger.warning("Autoscaler delete failed: %s", error)
+        return sum(1 for r in results if not isinstance(r, BaseException))
+
+    def start(self) -> "Autoscaler":
+        """
+        Evaluate every ``interval`` seconds in a background thread.
+
+        Returns:
+            The autoscaler
+        """
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="shadeform-autoscaler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.step()
+            except Exception:
+                logger.exception("Autoscaler evaluation failed")
+            self._stopped.wait(self.interval)
+
+    def close(self) -> None:
+        """Stop background evaluation; instances are left running."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
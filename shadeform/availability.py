@@ -0,0 +1,240 @@
+"""Concurrent capacity scanning across providers and GPU types."""
+
+import itertools
+import json
+import math
+import time
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from .catalog import CatalogCache
+from .error import ShadeformError
+
+if TYPE_CHECKING:
+    from .client import ShadeformClient
+
+# (instance_type, provider, region)
+OfferKey = Tuple[str, str, str]
+OfferFilter = Callable[[Dict[str, Any]], bool]
+
+
+def _offers(instance_types: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Flatten catalog entries into one offer per available region."""
+    for entry in instance_types:
+        instance_type = entry.get("type") or entry.get("instance_type")
+        for slot in entry.get("availability") or ():
+            if not slot.get("available"):
+                continue
+            offer = {k: v for k, v in entry.items() if k != "availability"}
+            offer.update(
+                instance_type=instance_type,
+                provider=entry.get("provider"),
+                region=slot.get("region"),
+            )
+            yield offer
+
+
+def _price(offer: Dict[str, Any]) -> float:
+    price = offer.get("hourly_price")
+    return math.inf if price is None else float(price)
+
+
+class AvailabilityView(Mapping):
+    """
+    Available offers keyed by ``(instance_type, provider, region)``.
+
+    Iteration yields keys cheapest first; offers without a price go last.
+    """
+
+    def __init__(self, offers: Iterable[Dict[str, Any]], complete: bool) -> None:
+        """
+        Initialize the view.
+
+        Args:
+            offers: Offers with instance_type, provider, region and price
+            complete: Whether every query finished, rather than the scan
+                stopping early
+        """
+        ranked = sorted(offers, key=_price)
+        self._offers: Dict[OfferKey, Dict[str, Any]] = {}
+        for offer in ranked:
+            key = (offer["instance_type"], offer["provider"], offer["region"])
+            self._offers.setdefault(key, offer)
+        self.complete = complete
+
+    def __getitem__(self, key: OfferKey) -> Dict[str, Any]:
+        return self._offers[key]
+
+    def __iter__(self) -> Iterator[OfferKey]:
+        return iter(self._offers)
+
+    def __len__(self) -> int:
+        return len(self._offers)
+
+    def ranked(self) -> List[Dict[str, Any]]:
+        """
+        Return the offers cheapest first.
+
+        Returns:
+            Offer dicts in price order
+        """
+        return list(self._offers.values())
+
+    def cheapest(self, instance_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the cheapest offer, optionally for one instance type.
+
+        Args:
+            instance_type: Only consider offers of this type
+
+        Returns:
+            The cheapest matching offer
+
+        Raises:
+            KeyError: If no offer matches
+        """
+        for offer in self._offers.values():
+            if instance_type in (None, offer["instance_type"]):
+                return offer
+        raise KeyError(instance_type)
+
+    def candidates(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Return offers as launch candidates for ``create_first_available``.
+
+        Args:
+            limit: Maximum number of candidates
+
+        Returns:
+            Dicts with provider, region and instance_type, cheapest first
+        """
+        keys = itertools.islice(self._offers, limit)
+        return [{"provider": p, "region": r, "instance_type": t} for t, p, r in keys]
+
+
+class AvailabilityScanner:
+    """
+    Find where instance types can be launched right now.
+
+    A scan splits the catalog into one filtered ``list_types`` query per
+    provider and GPU type and runs them concurrently on ``client.futures``.
+    Each query's result is cached for ``ttl`` seconds, so repeated scans
+    before a burst of launches cost no requests. With ``enough``, the scan
+    returns as soon as that many matching offers were found and cancels the
+    queries that have not started.
+
+    Example:
+        scanner = AvailabilityScanner(client, ttl=30)
+        view = scanner.scan(providers=["aws", "lambdalabs"], gpu_types=["A100"],
+                            max_price=2.0, enough=3)
+        instance = client.instances.create_first_available(
+            view.candidates(3), "job", launch_config)
+    """
+
+    def __init__(self, client: "ShadeformClient", ttl: float = 30.0) -> None:
+        """
+        Initialize the scanner.
+
+        Args:
+            client: The Shadeform client instance
+            ttl: Seconds a query result is reused
+        """
+        self.client = client
+        self.cache = CatalogCache(ttl=ttl)
+
+    def scan(
+        self,
+        providers: Optional[Sequence[str]] = None,
+        gpu_types: Optional[Sequence[str]] = None,
+        where: Optional[OfferFilter] = None,
+        max_price: Optional[float] = None,
+        enough: Optional[int] = None,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+    ) -> AvailabilityView:
+        """
+        Query availability concurrently and rank the offers by price.
+
+        Args:
+            providers: Providers to query separately (default: all at once)
+            gpu_types: GPU types to query separately (default: all at once)
+            where: Optional predicate an offer must satisfy
+            max_price: Optional upper bound on the hourly price
+            enough: Stop once this many matching offers were found
+            timeout: Maximum seconds to wait for the queries
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+
+        Returns:
+            Matching offers keyed by (instance_type, provider, region)
+
+        Raises:
+            ShadeformError: If the timeout passes before any offer is found,
+                or a query fails
+        """
+        # None queries every provider or GPU type at once
+        provider_filters: Sequence[Optional[str]] = providers or [None]
+        gpu_type_filters: Sequence[Optional[str]] = gpu_types or [None]
+        queries = [
+            {"provider": provider, "gpu_type": gpu_type}
+            for provider in provider_filters
+            for gpu_type in gpu_type_filters
+        ]
+
+        def matches(offer: Dict[str, Any]) -> bool:
+            if max_price is not None and _price(offer) > max_price:
+                return False
+            return where is None or bool(where(offer))
+
+        pending: Set[Future] = {
+            self.client.futures.submit(self._query, query, priority)
+            for query in queries
+        }
+        deadline = None if timeout is None else time.monotonic() + timeout
+        found: List[Dict[str, Any]] = []
+        try:
+            while pending:
+                if enough is not None and len(found) >= enough:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    if not found:
+                        raise ShadeformError(
+                            f"Timed out after {timeout}s scanning availability"
+                        )
+                    break
+                done, pending = wait(pending, remaining, FIRST_COMPLETED)
+                for future in done:
+                    found.extend(o for o in _offers(future.result()) if matches(o))
+        finally:
+            for future in pending:
+                future.cancel()
+        return AvailabilityView(found, complete=not pending)
+
+    def _query(
+        self, query: Dict[str, Any], priority: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Fetch one filtered listing through the cache."""
+        return self.cache.get_or_load(
+            json.dumps(query, sort_keys=True),
+            lambda: self.client.instances.list_types(
+                priority=priority, available=True, **query
+            ),
+        )
+
+    def invalidate(self) -> None:
+        """Drop cached results so the next scan queries the API again."""
+        self.cache.invalidate()
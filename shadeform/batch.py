@@ -0,0 +1,345 @@
+"""Columnar validation and payload building for mass launches."""
+
+import json
+from json.encoder import encode_basestring_ascii
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .error import ShadeformBatchValidationError, ShadeformValidationError
+from .templating import RenderedConfig
+from .utils.helpers import validate_instance_type
+
+if TYPE_CHECKING:
+    from .catalog import CatalogIndex
+
+CREATE_ENDPOINT = "/instances/create"
+LAUNCH_TYPES = ("docker", "script")
+
+# Row, field, message
+RowError = Tuple[int, str, str]
+Column = Union[Any, Sequence[Any]]
+
+
+def _encode(value: Any) -> bytes:
+    """Encode a value the way ``idempotency_key`` canonicalizes payloads."""
+    if isinstance(value, str):
+        return encode_basestring_ascii(value).encode()
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _valid_config(config: Any) -> bool:
+    """Check a launch configuration's type."""
+    if isinstance(config, RenderedConfig):
+        # Checked when its template was compiled
+        return True
+    return isinstance(config, Mapping) and config.get("type") in LAUNCH_TYPES
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _column(value: Column, size: int, field: str) -> List[Any]:
+    """Broadcast a scalar to a column, or check a column's length."""
+    if isinstance(value, (str, bytes, Mapping)) or value is None:
+        return [value] * size
+    column = list(value)
+    if len(column) != size:
+        raise ShadeformValidationError(
+            f"Expected {size} values, got {len(column)}", field=field
+        )
+    return column
+
+
+class LaunchBatch:
+    """
+    A batch of instance launches given as columns.
+
+    Each argument is a column with one value per row, or a single value
+    shared by every row. The whole batch is validated in one pass that
+    checks each distinct value once, however many rows use it, and reports
+    every invalid row. ``bodies()`` then returns ready-to-send JSON bodies
+    assembled from fragments encoded once per distinct value, so identical
+    launch configurations are encoded once and shared.
+
+    Bodies are canonical JSON, so ``keys()`` gives the same idempotency keys
+    ``instances.create`` derives for the same requests.
+
+    Example:
+        batch = LaunchBatch(
+            names=[f"worker-{i}" for i in range(5000)],
+            instance_types="A100_80Gx1",
+            regions=regions,
+            providers="aws",
+            launch_configs=LaunchConfiguration.docker("pytorch/pytorch:latest"),
+        )
+        futures = client.instances.create_batch(batch)
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        instance_types: Column,
+        regions: Column,
+        providers: Column,
+        launch_configs: Column,
+        ssh_key_ids: Column = None,
+        volumes: Optional[Sequence[Optional[List[Dict[str, Any]]]]] = None,
+    ) -> None:
+        """
+        Initialize the batch.
+
+        Args:
+            names: Instance names, one per row
+            instance_types: Instance type column, or one type for all rows
+            regions: Region column, or one region for all rows
+            providers: Cloud provider column, or one provider for all rows
+            launch_configs: Launch configuration column, or one configuration
+                for all rows; a configuration may also be a rendered template
+                from ``CompiledTemplate.render_json``
+            ssh_key_ids: Optional SSH key ID column, or one ID for all rows
+            volumes: Optional column of volume configuration lists
+
+        Raises:
+            ShadeformValidationError: If a column's length differs from names
+        """
+        self.names = list(names)
+        size = len(self.names)
+        self.instance_types = _column(instance_types, size, "instance_types")
+        self.regions = _column(regions, size, "regions")
+        self.providers = _column(providers, size, "providers")
+        self.launch_configs = _column(launch_configs, size, "launch_configs")
+        self.ssh_key_ids = _column(ssh_key_ids, size, "ssh_key_ids")
+        self.volumes = [None] * size if volumes is None else list(volumes)
+        if len(self.volumes) != size:
+            raise ShadeformValidationError(
+                f"Expected {size} values, got {len(self.volumes)}", field="volumes"
+            )
+        self._bodies: Optional[List[bytes]] = None
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.names)
+
+    def validate(self, index: Optional["CatalogIndex"] = None) -> List[RowError]:
+        """
+        Validate every row.
+
+        Args:
+            index: Optional catalog index to check instance type, provider
+                and region combinations against
+
+        Returns:
+            (row, field, message) for every problem, in row order; empty if
+            the batch is valid
+        """
+        errors: List[RowError] = []
+
+        # Rows holding values that cannot be deduplicated are reported here
+        # and left out of the checks below
+        skipped: Set[int] = set()
+        for field, column in (
+            ("instance_type", self.instance_types),
+            ("provider", self.providers),
+            ("region", self.regions),
+            ("ssh_key_id", self.ssh_key_ids),
+        ):
+            hashable: Dict[int, bool] = {}
+            for row, value in enumerate(column):
+                ok = hashable.get(id(value))
+                if ok is None:
+                    ok = hashable[id(value)] = _hashable(value)
+                if not ok:
+                    errors.append((row, field, f"Invalid {field}: {value!r}"))
+                    skipped.add(row)
+        kept = [row for row in range(len(self.names)) if row not in skipped]
+
+        seen: Set[str] = set()
+        for row, name in enumerate(self.names):
+            if not isinstance(name, str) or not name:
+                errors.append((row, "name", "Name must be a non-empty string"))
+            elif name in seen:
+                errors.append((row, "name", f"Duplicate name: {name}"))
+            seen.add(name)
+
+        # Each distinct value is checked once
+        bad_types = {
+            t
+            for t in {self.instance_types[row] for row in kept}
+            if not isinstance(t, str) or not validate_instance_type(t)
+        }
+        bad_configs = {
+            id(c)
+            for c in {id(c): c for c in self.launch_configs}.values()
+            if not _valid_config(c)
+        }
+        combos: Dict[Tuple[Any, Any, Any], Optional[ShadeformValidationError]] = {}
+        for row in kept:
+            combo = (self.instance_types[row], self.providers[row], self.regions[row])
+            if combo in combos:
+                continue
+            problem = None
+            for field, value in (("provider", combo[1]), ("region", combo[2])):
+                if problem is None and not (isinstance(value, str) and value):
+                    problem = ShadeformValidationError(
+                        f"Invalid {field}: {value!r}", field=field
+                    )
+            if problem is None and index is not None and combo[0] not in bad_types:
+                try:
+                    index.check_instance(*combo)
+                except ShadeformValidationError as error:
+                    problem = error
+            combos[combo] = problem
+
+        for row in range(len(self.names)):
+            if row not in skipped:
+                instance_type = self.instance_types[row]
+                if instance_type in bad_types:
+                    errors.append(
+                        (
+                            row,
+                            "instance_type",
+                            f"Invalid instance type: {instance_type}",
+                        )
+                    )
+                combo = (instance_type, self.providers[row], self.regions[row])
+                problem = combos[combo]
+                if problem is not None:
+                    errors.append(
+                        (row, problem.field or "instance_type", problem.message)
+                    )
+            if id(self.launch_configs[row]) in bad_configs:
+                errors.append(
+                    (
+                        row,
+                        "launch_configuration",
+                        f"Launch configuration type must be one of {LAUNCH_TYPES}",
+                    )
+                )
+        errors.sort(key=lambda error: error[0])
+        return errors
+
+    def check(self, index: Optional["CatalogIndex"] = None) -> None:
+        """
+        Validate every row, raising if any is invalid.
+
+        Args:
+            index: Optional catalog index (see ``validate``)
+
+        Raises:
+            ShadeformBatchValidationError: Listing every invalid row
+        """
+        errors = self.validate(index)
+        if errors:
+            raise ShadeformBatchValidationError(errors)
+
+    def bodies(self) -> List[bytes]:
+        """
+        Return the JSON body of every row's create request.
+
+        Returns:
+            Encoded bodies, in row order
+        """
+        if self._bodies is None:
+            # Distinct value -> its encoded fragment
+            fragments: Dict[Any, bytes] = {}
+            configs: Dict[int, bytes] = {}
+            shared: Dict[bytes, bytes] = {}
+
+            def fragment(value: Any) -> bytes:
+                encoded = fragments.get(value)
+                if encoded is None:
+                    encoded = fragments[value] = _encode(value)
+                return encoded
+
+            def config(value: Any) -> bytes:
+                if isinstance(value, RenderedConfig):
+                    return value
+                encoded = configs.get(id(value))
+                if encoded is None:
+                    encoded = _encode(value)
+                    # Equal configurations share one encoded fragment
+                    encoded = configs[id(value)] = shared.setdefault(encoded, encoded)
+                return encoded
+
+            bodies = []
+            for row, name in enumerate(self.names):
+                parts = [
+                    b'{"instance_type":',
+                    fragment(self.instance_types[row]),
+                    b',"launch_configuration":',
+                    config(self.launch_configs[row]),
+                    b',"name":',
+                    _encode(name),
+                    b',"provider":',
+                    fragment(self.providers[row]),
+                    b',"region":',
+                    fragment(self.regions[row]),
+                ]
+                if self.ssh_key_ids[row]:
+                    parts += [b',"ssh_key_id":', fragment(self.ssh_key_ids[row])]
+                if self.volumes[row]:
+                    parts += [b',"volumes":', _encode(self.volumes[row])]
+                parts.append(b"}")
+                bodies.append(b"".join(parts))
+            self._bodies = bodies
+        return self._bodies
+
+    def keys(self) -> List[str]:
+        """
+        Return the idempotency key of every row's create request.
+
+        Returns:
+            Keys equal to those ``instances.create`` derives, in row order
+        """
+        import hashlib
+
+        prefix = b'["POST",' + _encode(CREATE_ENDPOINT) + b","
+        return [
+            hashlib.sha256(prefix + body + b"]").hexdigest()[:32]
+            for body in self.bodies()
+        ]
+
+    def payload(self, row: int) -> Dict[str, Any]:
+        """
+        Return one row's create payload as a dict.
+
+        The launch configuration is the object the batch was given, shared
+        with the other rows that use it, or decoded if it is a rendered
+        template.
+
+        Args:
+            row: Row number
+
+        Returns:
+            Payload as ``instances.create`` would build it
+        """
+        launch_config = self.launch_configs[row]
+        if isinstance(launch_config, RenderedConfig):
+            launch_config = json.loads(launch_config)
+        payload: Dict[str, Any] = {
+            "provider": self.providers[row],
+            "name": self.names[row],
+            "region": self.regions[row],
+            "instance_type": self.instance_types[row],
+            "launch_configuration": launch_config,
+        }
+        if self.ssh_key_ids[row]:
+            payload["ssh_key_id"] = self.ssh_key_ids[row]
+        if self.volumes[row]:
+            payload["volumes"] = self.volumes[row]
+        return payload
@@ -0,0 +1,301 @@
+"""Cache for slowly changing catalogs (instance types, volume types, ...)."""
+
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from .error import ShadeformValidationError
+
+INSTANCE_TYPES = "instance_types"
+VOLUME_TYPES = "volume_types"
+TEMPLATES_FEATURED = "templates_featured"
+
+# Catalog name -> (resource client attribute, list method)
+CATALOGS: Dict[str, Tuple[str, str]] = {
+    INSTANCE_TYPES: ("instances", "list_types"),
+    VOLUME_TYPES: ("volumes", "list_types"),
+    TEMPLATES_FEATURED: ("templates", "list_featured"),
+}
+
+Loader = Callable[[], List[Dict[str, Any]]]
+
+
+class CatalogIndex:
+    """
+    Hash-set index of the valid instance and volume types in the catalogs.
+
+    Built from ``instances.list_types()`` and ``volumes.list_types()``
+    entries, it answers whether an (instance type, provider, region) or
+    (provider, volume type) combination exists with set lookups, so create
+    calls can reject impossible requests without a round trip. Regions are
+    checked against every region an entry lists, available or not; entries
+    without availability data leave the region unchecked. A catalog that was
+    not given is not checked.
+    """
+
+    def __init__(
+        self,
+        instance_types: Optional[Iterable[Mapping[str, Any]]] = None,
+        volume_types: Optional[Iterable[Mapping[str, Any]]] = None,
+    ) -> None:
+        """
+        Build the index.
+
+        Args:
+            instance_types: Entries of ``instances.list_types()``
+            volume_types: Entries of ``volumes.list_types()``
+        """
+        self.instance_types: Optional[FrozenSet[str]] = None
+        self.offers: FrozenSet[Tuple[str, str]] = frozenset()
+        self.regions: FrozenSet[Tuple[str, str, str]] = frozenset()
+        # (instance type, provider) pairs whose regions are not listed
+        self.any_region: FrozenSet[Tuple[str, str]] = frozenset()
+        if instance_types is not None:
+            types, offers, regions, any_region = set(), set(), set(), set()
+            for entry in instance_types:
+                name = entry.get("type") or entry.get("instance_type")
+                provider = entry.get("provider")
+                if not name or not provider:
+                    continue
+                types.add(name)
+                offers.add((name, provider))
+                slots = entry.get("availability")
+                if not slots:
+                    any_region.add((name, provider))
+                for slot in slots or ():
+                    regions.add((name, provider, slot.get("region")))
+            self.instance_types = frozenset(types)
+            self.offers = frozenset(offers)
+            self.regions = frozenset(regions)
+            self.any_region = frozenset(any_region)
+
+        self.volume_types: Optional[FrozenSet[str]] = None
+        # (provider, volume type) -> (min size, max size) in GB
+        self.volume_sizes: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        if volume_types is not None:
+            names = set()
+            for entry in volume_types:
+                name = entry.get("name") or entry.get("volume_type")
+                if not name:
+                    continue
+                names.add(name)
+                provider = entry.get("provider")
+                if not provider:
+                    continue
+                self.volume_sizes[(provider, name)] = (
+                    entry.get("min_size_gb") or 1,
+                    entry.get("max_size_gb") or float("inf"),
+                )
+            self.volume_types = frozenset(names)
+
+    def check_instance(self, instance_type: str, provider: str, region: str) -> None:
+        """
+        Check that a provider offers an instance type in a region.
+
+        Args:
+            instance_type: Instance type (e.g., 'H100_80Gx8')
+            provider: Cloud provider
+            region: Region
+
+        Raises:
+            ShadeformValidationError: If the combination is not in the catalog
+        """
+        if self.instance_types is None:
+            return
+        if instance_type not in self.instance_types:
+            raise ShadeformValidationError(
+                f"Unknown instance type: {instance_type}", field="instance_type"
+            )
+        offer = (instance_type, provider)
+        if offer not in self.offers:
+            raise ShadeformValidationError(
+                f"{provider} does not offer {instance_type}", field="provider"
+            )
+        if offer not in self.any_region and (*offer, region) not in self.regions:
+            raise ShadeformValidationError(
+                f"{provider} does not offer {instance_type} in {region}",
+                field="region",
+            )
+
+    def check_volume(self, provider: str, volume_type: str, size_gb: int) -> None:
+        """
+        Check that a provider offers a volume type of the given size.
+
+        Args:
+            provider: Cloud provider
+            volume_type: Volume type (e.g., 'gp3')
+            size_gb: Size in gigabytes
+
+        Raises:
+            ShadeformValidationError: If the type is unknown, not offered by
+                the provider, or the size is out of its bounds
+        """
+        if self.volume_types is None:
+            return
+        if volume_type not in self.volume_types:
+            raise ShadeformValidationError(
+                f"Invalid volume type: {volume_type}", field="volume_type"
+            )
+        bounds = self.volume_sizes.get((provider, volume_type))
+        if bounds is None:
+            raise ShadeformValidationError(
+                f"{provider} does not offer volume type {volume_type}",
+                field="provider",
+            )
+        if not bounds[0] <= size_gb <= bounds[1]:
+            raise ShadeformValidationError(
+                f"Invalid volume size: {size_gb}GB is outside the bounds of "
+                f"{volume_type} on {provider}",
+                field="size_gb",
+            )
+
+
+class CatalogCache:
+    """
+    Time-bounded cache of catalog listings shared by the resource clients.
+
+    When a client has a catalog cache, ``instances.list_types()``,
+    ``volumes.list_types()`` and ``templates.list_featured()`` are answered
+    from it while the entry is younger than ``ttl``. Concurrent misses for
+    the same catalog share a single request.
+
+    Example:
+        client = ShadeformClient(api_key="...", catalog=CatalogCache(ttl=600))
+    """
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        """
+        Initialize the catalog cache.
+
+        Args:
+            ttl: Seconds a fetched catalog is served before it is refetched
+
+        Raises:
+            ValueError: If ttl is negative
+        """
+        if ttl < 0:
+            raise ValueError("ttl must be non-negative")
+        self.ttl = ttl
+        # Catalog name -> (fetched at, entries)
+        self._entries: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._loading: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        # Fetch times of the type catalogs the index was built from
+        self._index: Optional[Tuple[Tuple[Optional[float], ...], CatalogIndex]]
+        self._index = None
+
+    def get(self, name: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return a cached catalog if it is still fresh.
+
+        Args:
+            name: Catalog name
+
+        Returns:
+            Catalog entries, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def put(self, name: str, entries: List[Dict[str, Any]]) -> None:
+        """
+        Store a freshly fetched catalog.
+
+        Args:
+            name: Catalog name
+            entries: Catalog entries
+        """
+        with self._lock:
+            self._entries[name] = (time.monotonic(), entries)
+
+    def get_or_load(self, name: str, loader: Loader) -> List[Dict[str, Any]]:
+        """
+        Return a fresh catalog, fetching it at most once across threads.
+
+        Args:
+            name: Catalog name
+            loader: Zero-argument callable fetching the catalog
+
+        Returns:
+            Catalog entries
+        """
+        entries = self.get(name)
+        if entries is not None:
+            return entries
+        with self._lock:
+            loading = self._loading.setdefault(name, threading.Lock())
+        with loading:
+            # Another thread may have loaded it while we waited
+            entries = self.get(name)
+            if entries is None:
+                entries = loader()
+                self.put(name, entries)
+            return entries
+
+    def index(self) -> Optional[CatalogIndex]:
+        """
+        Return an index of the cached instance and volume type catalogs.
+
+        Only fresh catalogs are indexed and nothing is fetched; the index is
+        rebuilt when a catalog is refetched.
+
+        Returns:
+            The index, or None if neither type catalog is cached and fresh
+        """
+        now = time.monotonic()
+        with self._lock:
+            entries = [
+                self._entries.get(name) for name in (INSTANCE_TYPES, VOLUME_TYPES)
+            ]
+            fresh = [e if e and now - e[0] <= self.ttl else None for e in entries]
+            if fresh == [None, None]:
+                return None
+            key = tuple(e and e[0] for e in fresh)
+            if self._index is None or self._index[0] != key:
+                instance_types, volume_types = (e and e[1] for e in fresh)
+                self._index = (key, CatalogIndex(instance_types, volume_types))
+            return self._index[1]
+
+    def age(self, name: str) -> Optional[float]:
+        """
+        Return the age of a cached catalog in seconds.
+
+        Args:
+            name: Catalog name
+
+        Returns:
+            Seconds since the catalog was fetched, or None if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        return None if entry is None else time.monotonic() - entry[0]
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drop one cached catalog, or all of them.
+
+        Args:
+            name: Catalog name, or None to clear the cache
+        """
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the cache configuration without its entries."""
+        return (CatalogCache, (self.ttl,))
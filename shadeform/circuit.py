@@ -0,0 +1,256 @@
+"""Per-endpoint circuit breakers for Shadeform SDK."""
+
+import functools
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .error import ShadeformCircuitOpenError
+from .utils.helpers import endpoint_template
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+StateListener = Callable[[str, str, str], None]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single endpoint template.
+
+    Outcomes are kept in a rolling time window. Once at least
+    ``minimum_calls`` are in the window and either the failure rate or the
+    slow-call rate reaches its threshold, the breaker opens and calls fail
+    immediately. After ``open_duration`` seconds it becomes half-open and
+    admits up to ``half_open_calls`` probes; if they all succeed the breaker
+    closes, otherwise it opens again.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 1.0,
+        slow_call_duration: float = 10.0,
+        window: float = 30.0,
+        minimum_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_calls: int = 3,
+        on_state_change: Optional[StateListener] = None,
+    ) -> None:
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            endpoint: Endpoint template guarded by this breaker
+            failure_rate_threshold: Failure ratio (0-1) that opens the breaker
+            slow_call_rate_threshold: Slow-call ratio (0-1) that opens the breaker
+            slow_call_duration: Seconds after which a call counts as slow
+            window: Length of the rolling window in seconds
+            minimum_calls: Calls required in the window before tripping
+            open_duration: Seconds to stay open before probing
+            half_open_calls: Number of probe calls allowed while half-open
+            on_state_change: Callback (endpoint, old_state, new_state)
+        """
+        self.endpoint = endpoint
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.window = window
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.on_state_change = on_state_change
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        # (timestamp, failed, slow)
+        self._outcomes: Deque[Tuple[float, bool, bool]] = deque()
+        # Reentrant so state-change listeners may inspect the breaker
+        self._lock = threading.RLock()
+
+    @property
+    def state(self) -> str:
+        """Return the current breaker state."""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.open_duration:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        old, self._state = self._state, state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if self.on_state_change is not None and old != state:
+            self.on_state_change(self.endpoint, old, state)
+
+    def before_call(self) -> None:
+        """
+        Admit a call or fail fast.
+
+        Raises:
+            ShadeformCircuitOpenError: If the breaker is open, or half-open
+                with all probe slots taken
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes_in_flight < self.half_open_calls:
+                self._probes_in_flight += 1
+                return
+            retry_after = max(0.0, self._opened_at + self.open_duration - now)
+            raise ShadeformCircuitOpenError(
+                f"Circuit open for {self.endpoint}",
+                endpoint=self.endpoint,
+                retry_after=retry_after,
+            )
+
+    def after_call(self, failed: Optional[bool], duration: float) -> None:
+        """
+        Record the outcome of an admitted call.
+
+        Args:
+            failed: Whether the call failed, or None if it was never sent
+            duration: Call duration in seconds
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            slow = duration >= self.slow_call_duration
+
+            if state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed is None:
+                    return
+                if failed or slow:
+                    self._transition(OPEN)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_calls:
+                    self._transition(CLOSED)
+                return
+
+            if failed is None or state != CLOSED:
+                return
+            self._outcomes.append((now, failed, slow))
+            while self._outcomes and now - self._outcomes[0][0] > self.window:
+                self._outcomes.popleft()
+
+            calls = len(self._outcomes)
+            if calls < self.minimum_calls:
+                return
+            failures = sum(1 for _, f, _ in self._outcomes if f)
+            slow_calls = sum(1 for _, _, s in self._outcomes if s)
+            if (
+                failures / calls >= self.failure_rate_threshold
+                or slow_calls / calls >= self.slow_call_rate_threshold
+            ):
+                self._transition(OPEN)
+
+
+class CircuitBreakerPolicy:
+    """
+    Circuit breakers keyed by endpoint template.
+
+    Each endpoint template (e.g., '/instances/create' or
+    '/instances/{id}/info') gets its own breaker, so a degraded endpoint
+    fails fast without affecting healthy ones. A policy may be shared by
+    several clients; each one registers a state change listener.
+
+    Example:
+        client = ShadeformClient(
+            api_key="...",
+            circuit_breakers=CircuitBreakerPolicy(failure_rate_threshold=0.5),
+        )
+    """
+
+    def __init__(self, **breaker_options: float) -> None:
+        """
+        Initialize the policy.
+
+        Args:
+            **breaker_options: Options passed to every CircuitBreaker
+        """
+        self.breaker_options = breaker_options
+        self.on_state_change: Optional[StateListener] = None
+        self._listeners: List[StateListener] = []
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        """
+        Return the breaker guarding an endpoint.
+
+        Args:
+            endpoint: Endpoint path or template
+
+        Returns:
+            Circuit breaker for the endpoint template
+        """
+        template = endpoint_template(endpoint)
+        with self._lock:
+            breaker = self._breakers.get(template)
+            if breaker is None:
+                breaker = self._breakers[template] = CircuitBreaker(
+                    template,
+                    on_state_change=self._notify,
+                    **self.breaker_options,  # type: ignore[arg-type]
+                )
+            return breaker
+
+    def add_listener(self, listener: StateListener) -> StateListener:
+        """
+        Register a callback for breaker state changes.
+
+        Args:
+            listener: Callback (endpoint, old_state, new_state)
+
+        Returns:
+            The registered listener
+        """
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+        return listener
+
+    def remove_listener(self, listener: StateListener) -> None:
+        """
+        Unregister a previously registered callback.
+
+        Args:
+            listener: Listener to remove
+        """
+        with self._lock:
+            self._listeners = [h for h in self._listeners if h != listener]
+
+    def _notify(self, endpoint: str, old: str, new: str) -> None:
+        if self.on_state_change is not None:
+            self.on_state_change(endpoint, old, new)
+        for listener in self._listeners:
+            listener(endpoint, old, new)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the breaker options; every breaker starts closed."""
+        return (functools.partial(CircuitBreakerPolicy, **self.breaker_options), ())
+
+    def states(self) -> Dict[str, str]:
+        """
+        Return the state of every known breaker.
+
+        Returns:
+            Mapping of endpoint template to breaker state
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.endpoint: breaker.state for breaker in breakers}
@@ -1,18 +1,96 @@
 """Main client class for Shadeform SDK."""
 
+import importlib
 import os
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+import weakref
+from contextlib import ExitStack
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    cast,
+)
+
+from .error import (
+    ShadeformAPIError,
+    ShadeformAuthError,
+    ShadeformError,
+    ShadeformValidationError,
+)
+from .instrumentation import CIRCUIT_STATE_CHANGE, REQUEST, Instrumentation
+
+# requests, the resource clients and the optional policies are imported
+# lazily to keep `import shadeform` and client construction cheap
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    import requests
+    from requests.adapters import HTTPAdapter
+    from requests.models import Response
+
+    from .catalog import CatalogCache
+    from .circuit import CircuitBreakerPolicy
+    from .concurrency import AdaptiveConcurrencyLimiter
+    from .endpoints import EndpointSelector
+    from .futures import FuturesClient
+    from .hedging import HedgePolicy
+    from .journal import OperationJournal
+    from .ratelimit import RateLimiter
+    from .resources.instances import InstanceClient
+    from .resources.sshkeys import SSHKeyClient
+    from .resources.templates import TemplateClient
+    from .resources.volumes import VolumeClient
+    from .scheduler import PriorityScheduler
+    from .snapshot import ListSnapshots
+    from .validation import SchemaValidator
 
-import requests
-from requests.models import Response
+DEFAULT_BASE_URL = "https://api.shadeform.ai/v1"
 
-from .error import ShadeformAPIError, ShadeformAuthError, ShadeformError
-from .resources.instances import InstanceClient
-from .resources.sshkeys import SSHKeyClient
-from .resources.templates import TemplateClient
-from .resources.volumes import VolumeClient
+# Default size of the connection pool shared by all threads
+DEFAULT_MAX_CONNECTIONS = 10
 
-DEFAULT_BASE_URL = "https://api.shadeform.ai/v1"
+# Status codes signalling that the server is shedding load
+OVERLOAD_STATUS_CODES = (429, 503)
+
+# Header carrying the idempotency key of a create call
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+# Default number of retries for create calls, which are idempotent
+DEFAULT_MUTATION_RETRIES = 2
+
+
+class _LazyResource:
+    """Descriptor that builds a resource client on first attribute access."""
+
+    def __init__(self, module: str, class_name: str) -> None:
+        self.module = module
+        self.class_name = class_name
+        self.name = ""
+
+    def __set_name__(self, owner: Type[Any], name: str) -> None:
+        self.name = name
+
+    def __get__(self, client: Any, owner: Type[Any]) -> Any:
+        if client is None:
+            return self
+        with client._resource_lock:
+            resource = client.__dict__.get(self.name)
+            if resource is None:
+                module = importlib.import_module(self.module, __package__)
+                resource = getattr(module, self.class_name)(client)
+                # Cached in the instance dict, which takes precedence over
+                # this non-data descriptor on later lookups
+                client.__dict__[self.name] = resource
+        return resource
 
 
 class ShadeformClient:
@@ -21,41 +99,180 @@ class ShadeformClient:
 
     This class provides access to all API resources and handles authentication
     and request management.
+
+    A client may be shared between threads. Each thread gets its own
+    ``requests.Session`` (headers, cookies), while all sessions draw
+    connections from a single bounded pool of ``max_connections`` per host.
+
+    Resource clients are created on first access, and the HTTP session is
+    only set up when the first request is made.
     """
 
+    instances: "InstanceClient" = _LazyResource(  # type: ignore[assignment]
+        ".resources.instances", "InstanceClient"
+    )
+    ssh_keys: "SSHKeyClient" = _LazyResource(  # type: ignore[assignment]
+        ".resources.sshkeys", "SSHKeyClient"
+    )
+    volumes: "VolumeClient" = _LazyResource(  # type: ignore[assignment]
+        ".resources.volumes", "VolumeClient"
+    )
+    templates: "TemplateClient" = _LazyResource(  # type: ignore[assignment]
+        ".resources.templates", "TemplateClient"
+    )
+
     def __init__(
         self,
         api_key: Optional[str] = None,
-        base_url: Optional[str] = None,
+        base_url: Union[str, Sequence[str], "EndpointSelector", None] = None,
+        hedging: Optional["HedgePolicy"] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
+        concurrency: Optional["AdaptiveConcurrencyLimiter"] = None,
+        circuit_breakers: Optional["CircuitBreakerPolicy"] = None,
+        scheduler: Optional["PriorityScheduler"] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        catalog: Optional["CatalogCache"] = None,
+        journal: Union[str, "OperationJournal", None] = None,
+        mutation_retries: int = DEFAULT_MUTATION_RETRIES,
+        snapshots: Optional["ListSnapshots"] = None,
+        lazy_responses: bool = False,
+        validation: Union[str, "SchemaValidator", None] = None,
     ) -> None:
         """
         Initialize the Shadeform client.
 
         Args:
             api_key: API key for authentication
-            base_url: Base URL for API requests
+            base_url: Base URL for API requests, or several base URLs (a
+                list or an ``EndpointSelector``) to route each request to the
+                fastest healthy one
+            hedging: Optional hedging policy applied to GET requests
+            rate_limiter: Optional client-side rate limiter
+            concurrency: Optional adaptive limit on in-flight requests
+            circuit_breakers: Optional per-endpoint circuit breakers
+            scheduler: Optional priority-aware dispatch queue
+            max_connections: Maximum pooled connections per host shared by
+                all threads; further requests wait for a free connection
+            catalog: Optional cache for instance types, volume types and
+                featured templates
+            journal: Optional ``OperationJournal`` (or its path) recording
+                every mutating resource call for crash-safe resumption
+            mutation_retries: How often a create call is retried after a
+                transport error, 429 or 5xx; safe because the retry carries
+                the same idempotency key
+            snapshots: Optional list snapshots answering ``get_info`` for
+                instances and volumes from a recent ``list_all``
+            lazy_responses: Decode GET responses lazily, as read-only
+                mappings and sequences whose fields are decoded on access
+            validation: Optional ``SchemaValidator`` (or its mode: 'strict',
+                'sampled' or 'off') checking request payloads and responses
 
         Raises:
             ShadeformAuthError: If API key is not provided
         """
         self.api_key = api_key or os.getenv("SHADEFORM_API_KEY")
+        self.endpoints: Optional["EndpointSelector"] = None
+        if base_url is not None and not isinstance(base_url, str):
+            if not isinstance(base_url, Sequence):
+                self.endpoints = base_url
+                base_url = base_url.urls[0]
+            elif len(base_url) > 1:
+                from .endpoints import EndpointSelector
+
+                self.endpoints = EndpointSelector(base_url)
+                base_url = self.endpoints.urls[0]
+            else:
+                base_url = base_url[0] if base_url else None
         self.base_url = base_url or os.getenv("SHADEFORM_BASE_URL", DEFAULT_BASE_URL)
 
         if not self.api_key:
             raise ShadeformAuthError("API key is required")
 
-        self.session = requests.Session()
-        self._setup_session()
-
-        # Initialize resource clients
-        self.instances = InstanceClient(self)
-        self.ssh_keys = SSHKeyClient(self)
-        self.volumes = VolumeClient(self)
-        self.templates = TemplateClient(self)
+        self.hedging = hedging
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.circuit_breakers = circuit_breakers
+        self.scheduler = scheduler
+        if scheduler is not None and concurrency is not None:
+            # Queue by priority in the scheduler, not FIFO in the limiter
+            scheduler.limiter = concurrency
+        self.catalog = catalog
+        if isinstance(journal, str):
+            from .journal import OperationJournal
+
+            journal = OperationJournal(journal)
+        self.journal = journal
+        self.mutation_retries = mutation_retries
+        self.snapshots = snapshots
+        self.lazy_responses = lazy_responses
+        if isinstance(validation, str):
+            from .validation import SchemaValidator
+
+            validation = SchemaValidator(validation)
+        self.validation = validation
+        # Idempotency key -> future of the create call in flight
+        self._inflight: Dict[str, "Future[Any]"] = {}
+        self._inflight_lock = threading.Lock()
+        self.instrumentation = Instrumentation()
+        if circuit_breakers is not None:
+            circuit_breakers.add_listener(self._on_circuit_state_change)
+
+        self.max_connections = max_connections
+        self._futures: Optional["FuturesClient"] = None
+        self._resource_lock = threading.Lock()
+        self._reset_transport()
+        _live_clients.add(self)
+
+    def _reset_transport(self) -> None:
+        """
+        Drop the connection pool and sessions so they are rebuilt lazily.
 
-    def _setup_session(self) -> None:
-        """Configure the requests session with appropriate headers."""
-        self.session.headers.update(
+        Inherited connections are abandoned rather than closed, since their
+        sockets (and TLS state) are still owned by the parent process.
+        """
+        self._pid = os.getpid()
+        self._adapter: Optional["HTTPAdapter"] = None
+        self._adapter_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _get_adapter(self) -> "HTTPAdapter":
+        """Return the connection pool shared by all threads."""
+        from requests.adapters import HTTPAdapter
+
+        with self._adapter_lock:
+            if self._adapter is None:
+                self._adapter = HTTPAdapter(
+                    pool_connections=self.max_connections,
+                    pool_maxsize=self.max_connections,
+                    pool_block=True,
+                )
+            return self._adapter
+
+    @property
+    def session(self) -> "requests.Session":
+        """Return the session owned by the calling thread."""
+        if self._pid != os.getpid():
+            # Fallback for platforms without os.register_at_fork
+            self._reset_transport()
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._create_session()
+        return session
+
+    def _create_session(self) -> "requests.Session":
+        """Create a session that uses the shared connection pool."""
+        import requests
+
+        adapter = self._get_adapter()
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self._setup_session(session)
+        return session
+
+    def _setup_session(self, session: "requests.Session") -> None:
+        """Configure a requests session with appropriate headers."""
+        session.headers.update(
             {
                 "Content-Type": "application/json",
                 "Accept": "application/json",
@@ -74,23 +291,46 @@ class ShadeformClient:
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
-            **kwargs: Additional request parameters
+            **kwargs: Additional request parameters, plus an optional
+                ``priority`` class ('interactive', 'normal' or 'bulk')
 
         Returns:
             API response data
 
         Raises:
             ShadeformAPIError: For API-related errors
+            ShadeformRateLimitError: If the client-side rate limit is exhausted
+            ShadeformCircuitOpenError: If the endpoint's circuit breaker is open
             ShadeformError: For other errors
         """
-        base = DEFAULT_BASE_URL if self.base_url is None else self.base_url
-        url = f"{base.rstrip('/')}/{endpoint.lstrip('/')}"
+        import requests
 
+        priority = kwargs.pop("priority", None)
+        if priority is not None and self.scheduler is not None:
+            self.scheduler.validate(priority)
+
+        breaker = None
+        if self.circuit_breakers is not None:
+            breaker = self.circuit_breakers.get(endpoint)
+            breaker.before_call()
+
+        # None until the request reaches the server, then whether it failed
+        failed: Optional[bool] = None
+        status_code: Optional[int] = None
+        start = time.monotonic()
         try:
-            response = self.session.request(method, url, **kwargs)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(method)
+
+            failed = True
+            response = self._deliver(method, endpoint, priority, **kwargs)
+            status_code = response.status_code
+            failed = status_code >= 500
             response.raise_for_status()
 
-            return self._process_response(response)
+            return self._process_response(
+                response, lazy=self.lazy_responses and method.upper() == "GET"
+            )
 
         except requests.exceptions.HTTPError as error:
             error_data = {}
@@ -102,7 +342,9 @@ class ShadeformClient:
             message = error_data.get("message", str(error))
             raise ShadeformAPIError(
                 message,
-                status_code=error.response.status_code if error.response else None,
+                status_code=(
+                    error.response.status_code if error.response is not None else None
+                ),
                 error_data=error_data,
             )
 
@@ -112,14 +354,290 @@ class ShadeformClient:
         except ValueError as error:
             raise ShadeformError(f"Invalid JSON response: {str(error)}")
 
+        finally:
+            elapsed = time.monotonic() - start
+            if breaker is not None:
+                breaker.after_call(failed, elapsed)
+            if self.instrumentation.has_hooks(REQUEST):
+                self.instrumentation.emit(
+                    REQUEST,
+                    method=method,
+                    endpoint=endpoint,
+                    status_code=status_code,
+                    failed=bool(failed),
+                    duration=elapsed,
+                )
+
+    @property
+    def futures(self) -> "FuturesClient":
+        """
+        Return the non-blocking facade for this client.
+
+        Resource methods called through it return ``concurrent.futures.Future``
+        objects, e.g. ``client.futures.instances.get_info(instance_id)``. The
+        thread pool is sized to ``max_connections``.
+        """
+        from .futures import FuturesClient
+
+        with self._resource_lock:
+            if self._futures is None:
+                self._futures = FuturesClient(self, max_workers=self.max_connections)
+            return self._futures
+
+    def warmup(
+        self, connections: Optional[int] = None, preload: Iterable[str] = ()
+    ) -> "Future[Dict[str, Any]]":
+        """
+        Open pooled connections and prefetch catalogs in the background.
+
+        The connections stay in the shared pool, so the first requests skip
+        DNS resolution and the TCP/TLS handshakes. Preloaded catalogs are
+        fetched concurrently into ``catalog`` (a ``CatalogCache`` is created
+        if the client has none) once the connections are up.
+
+        Args:
+            connections: Number of connections to open (default and maximum:
+                ``max_connections``)
+            preload: Catalogs to prefetch: 'instance_types', 'volume_types'
+                and/or 'templates_featured'
+
+        Returns:
+            Future resolving to a summary with the number of connections
+            opened and the catalogs preloaded
+
+        Raises:
+            ShadeformValidationError: If a catalog name is unknown
+
+        Example:
+            client.warmup(connections=8, preload=["instance_types"])
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        from .catalog import CATALOGS, CatalogCache
+
+        names = list(preload)
+        unknown = [name for name in names if name not in CATALOGS]
+        if unknown:
+            raise ShadeformValidationError(
+                f"Unknown catalog {unknown[0]!r}, expected one of "
+                f"{', '.join(sorted(CATALOGS))}",
+                field="preload",
+            )
+        if names:
+            with self._resource_lock:
+                if self.catalog is None:
+                    self.catalog = CatalogCache()
+
+        count = self.max_connections if connections is None else connections
+        executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="shadeform-warmup"
+        )
+        future = executor.submit(
+            self._warmup, max(0, min(count, self.max_connections)), names
+        )
+        executor.shutdown(wait=False)
+        return future
+
+    def _warmup(self, connections: int, names: List[str]) -> Dict[str, Any]:
+        """Open connections, then fetch catalogs through the futures pool."""
+        from .catalog import CATALOGS
+        from .futures import gather
+
+        opened = self._open_connections(connections) if connections else 0
+
+        def load(name: str) -> None:
+            resource, method = CATALOGS[name]
+            getattr(getattr(self, resource), method)()
+
+        gather(
+            [self.futures.submit_named(f"warmup.{name}", load, name) for name in names]
+        )
+        return {"connections": opened, "preloaded": names}
+
+    def _open_connections(self, count: int) -> int:
+        """
+        Connect up to ``count`` idle connections in the shared pool.
+
+        Args:
+            count: Number of connections to hold open
+
+        Returns:
+            Number of new connections established
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        import requests
+        import urllib3
+        from urllib3.exceptions import EmptyPoolError
+        from urllib3.exceptions import HTTPError as Urllib3Error
+
+        base = self._base()
+        session = self.session
+        settings = session.merge_environment_settings(base, {}, None, None, None)
+        adapter = self._get_adapter()
+        if hasattr(adapter, "get_connection_with_tls_context"):
+            pool = adapter.get_connection_with_tls_context(
+                requests.Request("GET", base).prepare(),
+                settings["verify"],
+                settings["proxies"],
+                settings["cert"],
+            )
+        else:
+            pool = adapter.get_connection(base, settings["proxies"])
+
+        # Checking connections out of the pool has no public API; the
+        # private methods are stable across urllib3 1.x and 2.x
+        get_conn: Optional[Callable[..., Any]] = None
+        put_conn: Optional[Callable[[Any], Any]] = None
+        if urllib3.__version__.split(".")[0] in ("1", "2"):
+            get_conn = getattr(pool, "_get_conn", None)
+            put_conn = getattr(pool, "_put_conn", None)
+
+        try:
+            if get_conn is None or put_conn is None:
+                # Fall back to opening them with concurrent requests
+                before = getattr(pool, "num_connections", 0)
+                with ThreadPoolExecutor(max_workers=count) as executor:
+                    list(executor.map(lambda _: session.head(base), range(count)))
+                return max(0, int(getattr(pool, "num_connections", 0)) - before)
+
+            # Check the connections out together so each one is distinct, and
+            # skip those other threads are using right now
+            checked_out = []
+            try:
+                for _ in range(count):
+                    checked_out.append(get_conn(timeout=0))
+            except EmptyPoolError:
+                pass
+            if not checked_out:
+                return 0
+            release = put_conn
+
+            def connect(conn: Any) -> int:
+                try:
+                    if conn.sock is not None:
+                        return 0
+                    conn.connect()
+                    return 1
+                finally:
+                    release(conn)
+
+            with ThreadPoolExecutor(max_workers=len(checked_out)) as executor:
+                return sum(executor.map(connect, checked_out))
+        except (OSError, Urllib3Error, requests.exceptions.RequestException) as error:
+            raise ShadeformError(f"Warmup failed: {str(error)}")
+
+    def _on_circuit_state_change(self, endpoint: str, old: str, new: str) -> None:
+        """Forward circuit breaker transitions to instrumentation hooks."""
+        self.instrumentation.emit(
+            CIRCUIT_STATE_CHANGE, endpoint=endpoint, old_state=old, new_state=new
+        )
+
+    def _base(self) -> str:
+        """Return the base URL the next request should use."""
+        if self.endpoints is not None:
+            selected = self.endpoints.select()
+            if selected is not None:
+                return selected
+        return DEFAULT_BASE_URL if self.base_url is None else self.base_url
+
+    def _deliver(
+        self, method: str, endpoint: str, priority: Optional[str] = None, **kwargs: Any
+    ) -> "Response":
+        """
+        Send a request to the selected base URL, failing over between URLs.
+
+        A request moves to the next base URL when the connection cannot be
+        established. GET requests and calls with an idempotency key also
+        move on when an established connection breaks, since they are safe
+        to repeat.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            priority: Priority class used by the scheduler
+            **kwargs: Additional request parameters
+
+        Returns:
+            Raw response from the API
+        """
+        path = endpoint.lstrip("/")
+        if self.endpoints is None:
+            return self._send(
+                method, f"{self._base().rstrip('/')}/{path}", priority, **kwargs
+            )
+
+        import requests
+
+        tried: List[str] = []
+        while True:
+            base = self.endpoints.select(exclude=tried)
+            assert base is not None
+            try:
+                response = self._send(method, f"{base}/{path}", priority, **kwargs)
+            except requests.exceptions.ConnectionError as error:
+                self.endpoints.record_request(base, failed=True)
+                self.endpoints.mark_down(base, error)
+                tried.append(base)
+                retryable = (
+                    method == "GET"
+                    or IDEMPOTENCY_HEADER in (kwargs.get("headers") or {})
+                    or _is_connect_failure(error)
+                )
+                if not retryable or len(tried) == len(self.endpoints.urls):
+                    raise
+                continue
+            self.endpoints.record_request(base, failed=False)
+            return response
+
+    def _send(
+        self, method: str, url: str, priority: Optional[str] = None, **kwargs: Any
+    ) -> "Response":
+        """
+        Send a request through the configured flow-control policies.
+
+        Args:
+            method: HTTP method
+            url: Fully qualified request URL
+            priority: Priority class used by the scheduler
+            **kwargs: Additional request parameters
+
+        Returns:
+            Raw response from the API
+        """
+        import requests
+
+        from .scheduler import NORMAL
+
+        with ExitStack() as stack:
+            if self.scheduler is not None:
+                stack.enter_context(self.scheduler.slot(priority or NORMAL))
+            slot = None
+            if self.concurrency is not None:
+                slot = stack.enter_context(self.concurrency.acquire())
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                if slot is not None:
+                    slot.drop()
+                raise
+            if slot is not None and response.status_code in OVERLOAD_STATUS_CODES:
+                slot.drop()
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.observe(method, response.status_code, response.headers)
+        return response
+
     def _process_response(
-        self, response: Response
+        self, response: "Response", lazy: bool = False
     ) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
         """
         Process the API response.
 
         Args:
             response: Response from the API
+            lazy: Wrap the body in lazily decoded objects instead of
+                decoding it in full
 
         Returns:
             Processed response data
@@ -136,10 +654,17 @@ class ShadeformClient:
             return {}
 
         try:
-            data = response.json()
-            if not isinstance(data, (dict, list)):
+            if lazy:
+                from .lazy import LazyArray, LazyObject, loads
+
+                data = loads(response.content)
+                valid = isinstance(data, (LazyObject, LazyArray))
+            else:
+                data = response.json()
+                valid = isinstance(data, (dict, list))
+            if not valid:
                 raise ShadeformError(f"Invalid response type: {type(data).__name__}")
-            return data
+            return cast(Union[Dict[str, Any], List[Dict[str, Any]]], data)
         except ValueError as e:
             raise ShadeformError(f"Invalid JSON response: {str(e)}")
 
@@ -153,6 +678,85 @@ class ShadeformClient:
         except ImportError:
             return "unknown"
 
+    def close(self) -> None:
+        """
+        Shut down the futures thread pool, stop endpoint probing and close
+        all pooled connections.
+        """
+        if self._futures is not None:
+            self._futures.shutdown(wait=True)
+        if self.endpoints is not None:
+            self.endpoints.close()
+        if self.circuit_breakers is not None:
+            self.circuit_breakers.remove_listener(self._on_circuit_state_change)
+        with self._adapter_lock:
+            adapter, self._adapter = self._adapter, None
+        if adapter is not None:
+            adapter.close()
+        self._local = threading.local()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Return the client configuration for pickling.
+
+        Only configuration is pickled; connections, sessions and
+        instrumentation hooks are rebuilt or left empty in the new process.
+        """
+        return {
+            "api_key": self.api_key,
+            "base_url": self.endpoints if self.endpoints is not None else self.base_url,
+            "hedging": self.hedging,
+            "rate_limiter": self.rate_limiter,
+            "concurrency": self.concurrency,
+            "circuit_breakers": self.circuit_breakers,
+            "scheduler": self.scheduler,
+            "max_connections": self.max_connections,
+            "catalog": self.catalog,
+            "journal": self.journal,
+            "mutation_retries": self.mutation_retries,
+            "snapshots": self.snapshots,
+            "lazy_responses": self.lazy_responses,
+            "validation": self.validation,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Rebuild the client from pickled configuration."""
+        self.__init__(**state)  # type: ignore[misc]
+
+    def __enter__(self) -> "ShadeformClient":
+        """Return the client for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the client when leaving the context."""
+        self.close()
+
     def __repr__(self) -> str:
         """Return string representation of the client."""
+        if self.endpoints is not None:
+            return f"ShadeformClient(base_url={self.endpoints.urls})"
         return f"ShadeformClient(base_url={self.base_url})"
+
+
+def _is_connect_failure(error: Exception) -> bool:
+    """Return whether a connection error happened before the request was sent."""
+    import requests
+    from urllib3.exceptions import NewConnectionError
+
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+# Clients whose connection pools must be reset in forked children
+_live_clients: "weakref.WeakSet[ShadeformClient]" = weakref.WeakSet()
+
+
+def _reset_clients_after_fork() -> None:
+    for client in list(_live_clients):
+        client._reset_transport()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_clients_after_fork)
@@ -0,0 +1,204 @@
+"""Adaptive (AIMD) concurrency limiting for Shadeform SDK."""
+
+import threading
+import time
+from collections import deque
+from types import TracebackType
+from typing import Any, Deque, Dict, Optional, Tuple, Type
+
+from .error import ShadeformError
+
+
+class ConcurrencySlot:
+    """A single in-flight request admitted by an adaptive limiter."""
+
+    def __init__(self, limiter: "AdaptiveConcurrencyLimiter") -> None:
+        """
+        Initialize the slot.
+
+        Args:
+            limiter: Limiter that admitted the request
+        """
+        self.limiter = limiter
+        self.started = time.monotonic()
+        self.dropped = False
+
+    def drop(self) -> None:
+        """Mark the request as rejected by an overloaded server."""
+        self.dropped = True
+
+    def __enter__(self) -> "ConcurrencySlot":
+        """Return the slot."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Release the slot and feed its outcome back to the limiter."""
+        self.limiter.release(time.monotonic() - self.started, dropped=self.dropped)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limit in-flight requests with additive-increase/multiplicative-decrease.
+
+    The limit grows by roughly one slot per window of successful requests
+    while latency stays within ``latency_tolerance`` times the best recent
+    latency. It is cut by ``backoff`` when a request is dropped (429, 503,
+    timeout or connection failure) or when latency inflates beyond the
+    tolerance. Requests over the limit wait in a queue.
+
+    Example:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=128)
+        client = ShadeformClient(api_key="...", concurrency=limiter)
+        print(limiter.metrics())
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        window: int = 100,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the adaptive limiter.
+
+        Args:
+            initial_limit: Starting number of concurrent requests
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            backoff: Multiplicative decrease factor applied on congestion
+            latency_tolerance: Allowed ratio of latency to the baseline
+            window: Number of recent latencies used for the baseline
+            timeout: Maximum time a request may wait in the queue
+
+        Raises:
+            ValueError: If the limits or factors are inconsistent
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.timeout = timeout
+        self.window = window
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._queued = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Return the current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests currently in flight."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return self._queued
+
+    def acquire(self, timeout: Optional[float] = None) -> ConcurrencySlot:
+        """
+        Wait for an in-flight slot.
+
+        Args:
+            timeout: Maximum time to wait (defaults to the limiter timeout)
+
+        Returns:
+            Slot to be used as a context manager around the request
+
+        Raises:
+            ShadeformError: If no slot became available in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._condition:
+            self._queued += 1
+            try:
+                admitted = self._condition.wait_for(
+                    lambda: self._in_flight < int(self._limit), timeout=timeout
+                )
+            finally:
+                self._queued -= 1
+            if not admitted:
+                raise ShadeformError(
+                    f"Timed out waiting for a concurrency slot (limit {self.limit})"
+                )
+            self._in_flight += 1
+        return ConcurrencySlot(self)
+
+    def release(self, latency: float, dropped: bool = False) -> None:
+        """
+        Release a slot and adjust the limit from the request outcome.
+
+        Args:
+            latency: Observed request latency in seconds
+            dropped: Whether the server rejected the request due to overload
+        """
+        with self._condition:
+            self._in_flight -= 1
+            baseline = min(self._latencies) if self._latencies else latency
+            self._latencies.append(latency)
+
+            congested = dropped or latency > baseline * self.latency_tolerance
+            now = time.monotonic()
+            if congested:
+                # Decrease at most once per round trip so one burst of
+                # failures does not collapse the limit to the minimum
+                if now - self._last_decrease >= baseline:
+                    self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                    self._last_decrease = now
+            else:
+                self._limit = min(
+                    float(self.max_limit), self._limit + 1.0 / self._limit
+                )
+            self._condition.notify_all()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the limiter configuration, starting from the initial limit."""
+        return (
+            AdaptiveConcurrencyLimiter,
+            (
+                self.initial_limit,
+                self.min_limit,
+                self.max_limit,
+                self.backoff,
+                self.latency_tolerance,
+                self.window,
+                self.timeout,
+            ),
+        )
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Return the current limiter metrics.
+
+        Returns:
+            Dictionary with limit, in_flight, queue_depth and baseline latency
+        """
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queue_depth": self._queued,
+                "baseline_latency": min(self._latencies) if self._latencies else 0.0,
+            }
@@ -0,0 +1,247 @@
+"""Latency-based selection between several API base URLs for Shadeform SDK."""
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+
+class _Endpoint:
+    """Measured state of a single base URL."""
+
+    def __init__(self) -> None:
+        self.ewma: Optional[float] = None
+        self.last_latency: Optional[float] = None
+        self.healthy = True
+        self.probes = 0
+        self.requests = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+
+class EndpointSelector:
+    """
+    Route requests to the fastest healthy of several API base URLs.
+
+    A background thread probes every base URL each ``probe_interval``
+    seconds and keeps an exponentially weighted moving average (EWMA) of the
+    round-trip latency. Requests go to the healthy endpoint with the lowest
+    EWMA. An endpoint is marked down when a probe or a request cannot
+    connect (or a probe gets a 5xx), and comes back after a successful probe.
+
+    Example:
+        client = ShadeformClient(
+            api_key="...",
+            base_url=["https://us.proxy.example/v1", "https://eu.proxy.example/v1"],
+        )
+        print(client.endpoints.stats())
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        probe_interval: float = 10.0,
+        probe_timeout: float = 2.0,
+        alpha: float = 0.3,
+        probe_path: str = "",
+    ) -> None:
+        """
+        Initialize the selector.
+
+        Args:
+            urls: Base URLs in order of preference for ties
+            probe_interval: Seconds between probe rounds
+            probe_timeout: Timeout for a single probe
+            alpha: EWMA smoothing factor; higher reacts faster
+            probe_path: Path appended to each base URL when probing; any
+                response below 500 counts as healthy
+
+        Raises:
+            ValueError: If no URLs are given or alpha is out of range
+        """
+        self.urls = [url.rstrip("/") for url in urls]
+        if not self.urls:
+            raise ValueError("At least one base URL is required")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.alpha = alpha
+        self.probe_path = probe_path
+
+        self._endpoints: Dict[str, _Endpoint] = {url: _Endpoint() for url in self.urls}
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._session: Optional["requests.Session"] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid = os.getpid()
+
+    def select(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        """
+        Return the base URL the next request should use.
+
+        Starts background probing on first use.
+
+        Args:
+            exclude: Base URLs already tried for this request
+
+        Returns:
+            Fastest healthy base URL, the fastest of the remaining ones if
+            none is healthy, or None if every URL is excluded
+        """
+        self._ensure_prober()
+        skipped = set(exclude)
+        with self._lock:
+            candidates = [
+                (index, url)
+                for index, url in enumerate(self.urls)
+                if url not in skipped
+            ]
+            if not candidates:
+                return None
+            healthy = [c for c in candidates if self._endpoints[c[1]].healthy]
+
+            def key(candidate: Tuple[int, str]) -> Tuple[float, int]:
+                ewma = self._endpoints[candidate[1]].ewma
+                return (float("inf") if ewma is None else ewma, candidate[0])
+
+            return min(healthy or candidates, key=key)[1]
+
+    def observe(self, url: str, latency: float) -> None:
+        """
+        Record a successful probe of an endpoint.
+
+        Args:
+            url: Base URL
+            latency: Round-trip time in seconds
+        """
+        with self._lock:
+            endpoint = self._endpoints[url]
+            endpoint.probes += 1
+            endpoint.last_latency = latency
+            if endpoint.ewma is None:
+                endpoint.ewma = latency
+            else:
+                endpoint.ewma += self.alpha * (latency - endpoint.ewma)
+            endpoint.healthy = True
+
+    def mark_down(self, url: str, error: Any) -> None:
+        """
+        Mark an endpoint unhealthy until its next successful probe.
+
+        Args:
+            url: Base URL
+            error: Error or description of the failure
+        """
+        with self._lock:
+            endpoint = self._endpoints[url]
+            endpoint.healthy = False
+            endpoint.last_error = str(error)
+
+    def record_request(self, url: str, failed: bool) -> None:
+        """
+        Count a request routed to an endpoint.
+
+        Args:
+            url: Base URL
+            failed: Whether the request could not be delivered
+        """
+        with self._lock:
+            endpoint = self._endpoints[url]
+            endpoint.requests += 1
+            if failed:
+                endpoint.failures += 1
+
+    def probe(self) -> None:
+        """Probe every endpoint once and update its latency and health."""
+        import requests
+
+        with self._probe_lock:
+            if self._session is None:
+                self._session = requests.Session()
+            for url in self.urls:
+                start = time.monotonic()
+                try:
+                    response = self._session.get(
+                        url + self.probe_path, timeout=self.probe_timeout
+                    )
+                except requests.exceptions.RequestException as error:
+                    self.mark_down(url, error)
+                    continue
+                if response.status_code >= 500:
+                    self.mark_down(url, f"Probe returned {response.status_code}")
+                else:
+                    self.observe(url, time.monotonic() - start)
+
+    def _ensure_prober(self) -> None:
+        if self._thread is not None and self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._stopped.is_set():
+                return
+            if self._thread is None or self._thread_pid != os.getpid():
+                # Threads do not survive a fork, so start a new prober
+                self._thread_pid = os.getpid()
+                self._session = None
+                self._probe_lock = threading.Lock()
+                self._thread = threading.Thread(
+                    target=self._run, name="shadeform-probe", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.probe()
+            self._stopped.wait(self.probe_interval)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return per-endpoint latency and health.
+
+        Returns:
+            Mapping of base URL to ewma_latency, last_latency, healthy,
+            probes, requests, failures and last_error
+        """
+        with self._lock:
+            return {
+                url: {
+                    "ewma_latency": endpoint.ewma,
+                    "last_latency": endpoint.last_latency,
+                    "healthy": endpoint.healthy,
+                    "probes": endpoint.probes,
+                    "requests": endpoint.requests,
+                    "failures": endpoint.failures,
+                    "last_error": endpoint.last_error,
+                }
+                for url, endpoint in self._endpoints.items()
+            }
+
+    def close(self) -> None:
+        """Stop background probing."""
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.probe_timeout * len(self.urls) + 1)
+        with self._probe_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the selector configuration without measurements."""
+        return (
+            EndpointSelector,
+            (
+                self.urls,
+                self.probe_interval,
+                self.probe_timeout,
+                self.alpha,
+                self.probe_path,
+            ),
+        )
@@ -1,6 +1,6 @@
 """Exception classes for Shadeform SDK."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class ShadeformError(Exception):
@@ -84,6 +84,31 @@ class ShadeformValidationError(ShadeformError):
         return f"Validation error: {self.message}"
 
 
+class ShadeformBatchValidationError(ShadeformValidationError):
+    """Exception raised when rows of a batch fail validation."""
+
+    def __init__(self, errors: List[Tuple[int, str, str]]) -> None:
+        """
+        Initialize batch validation error.
+
+        Args:
+            errors: (row, field, message) for every problem found
+        """
+        self.errors = errors
+        self.rows = sorted({row for row, _, _ in errors})
+        super().__init__(f"{len(self.rows)} invalid rows")
+
+    def __str__(self) -> str:
+        """Return string representation of the batch validation error."""
+        if not self.errors:
+            return f"Validation error: {self.message}"
+        row, field, message = self.errors[0]
+        return (
+            f"Validation error: {self.message}; "
+            f"first: row {row}, {field}: {message}"
+        )
+
+
 class ShadeformResourceError(ShadeformError):
     """Exception raised for resource-related errors."""
 
@@ -127,3 +152,77 @@ class ShadeformConfigurationError(ShadeformError):
     def __str__(self) -> str:
         """Return string representation of the configuration error."""
         return f"{self.config_type} configuration error: {self.message}"
+
+
+class ShadeformRateLimitError(ShadeformError):
+    """Exception raised when a client-side rate limit is exhausted."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        """
+        Initialize rate limit error.
+
+        Args:
+            message: Error message
+            retry_after: Seconds until a request may be retried
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        """Return string representation of the rate limit error."""
+        if self.retry_after is not None:
+            return f"{self.message} (retry after {self.retry_after:.2f}s)"
+        return self.message
+
+
+class ShadeformCircuitOpenError(ShadeformError):
+    """Exception raised when a circuit breaker rejects a request."""
+
+    def __init__(
+        self, message: str, endpoint: str, retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Initialize circuit open error.
+
+        Args:
+            message: Error message
+            endpoint: Endpoint template whose circuit is open
+            retry_after: Seconds until the circuit admits probe requests
+        """
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class ShadeformWorkflowError(ShadeformError):
+    """Exception raised when a workflow step fails."""
+
+    def __init__(
+        self,
+        message: str,
+        step: str,
+        cause: BaseException,
+        compensation_errors: Optional[Dict[str, BaseException]] = None,
+    ) -> None:
+        """
+        Initialize workflow error.
+
+        Args:
+            message: Error message
+            step: Name of the step that failed
+            cause: Exception raised by the step
+            compensation_errors: Exceptions raised while undoing completed
+                steps, by step name
+        """
+        super().__init__(message)
+        self.step = step
+        self.cause = cause
+        self.compensation_errors = compensation_errors or {}
+
+    def __str__(self) -> str:
+        """Return string representation of the workflow error."""
+        base = f"Step {self.step} failed: {self.message}"
+        if self.compensation_errors:
+            failed = ", ".join(sorted(self.compensation_errors))
+            base = f"{base} (cleanup failed for: {failed})"
+        return base
@@ -0,0 +1,674 @@
+"""Declarative fleet reconciliation (plan/apply) for Shadeform SDK."""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .error import ShadeformError, ShadeformValidationError
+from .scheduler import BULK
+from .utils.helpers import VolumeConfiguration
+
+if TYPE_CHECKING:
+    from .client import ShadeformClient
+
+INSTANCE = "instance"
+VOLUME = "volume"
+SSH_KEY = "ssh_key"
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+# Instances in these states are already going away and are not counted
+TERMINAL_STATUSES = ("deleting", "deleted", "terminated")
+
+
+# An existing resource id, or the action that will create the resource
+Reference = Union[str, "Action"]
+
+
+class InstanceGroup:
+    """Desired number of identical instances of one type in one region."""
+
+    def __init__(
+        self,
+        provider: str,
+        instance_type: str,
+        region: str,
+        count: int,
+        launch_config: Dict[str, Any],
+        name: Optional[str] = None,
+        ssh_key: Optional[str] = None,
+        volumes: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Initialize the instance group.
+
+        Args:
+            provider: Cloud provider
+            instance_type: Type of GPU instance
+            region: Region to deploy into
+            count: Number of instances wanted
+            launch_config: Launch configuration for new instances
+            name: Group name used in instance names
+                (default: '<instance_type>-<region>')
+            ssh_key: Name of an SSH key from the spec, or of one already in
+                the account
+            volumes: Mapping of volume name to mount path for new instances
+
+        Raises:
+            ValueError: If count is negative
+        """
+        if count < 0:
+            raise ValueError("count must be non-negative")
+        self.provider = provider
+        self.instance_type = instance_type
+        self.region = region
+        self.count = count
+        self.launch_config = launch_config
+        self.name = name or f"{instance_type}-{region}"
+        self.ssh_key = ssh_key
+        self.volumes = dict(volumes or {})
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        """Return the (provider, instance_type, region) matching key."""
+        return (self.provider, self.instance_type, self.region)
+
+
+class VolumeSpec:
+    """Desired volume."""
+
+    def __init__(
+        self, provider: str, name: str, size_gb: int, volume_type: str
+    ) -> None:
+        """
+        Initialize the volume spec.
+
+        Args:
+            provider: Cloud provider
+            name: Volume name (without the fleet prefix)
+            size_gb: Size in gigabytes
+            volume_type: Type of volume (e.g., 'gp3')
+        """
+        self.provider = provider
+        self.name = name
+        self.size_gb = size_gb
+        self.volume_type = volume_type
+
+
+class SSHKeySpec:
+    """Desired SSH key."""
+
+    def __init__(self, name: str, public_key: str) -> None:
+        """
+        Initialize the SSH key spec.
+
+        Args:
+            name: Key name (without the fleet prefix)
+            public_key: Public key content
+        """
+        self.name = name
+        self.public_key = public_key
+
+
+class FleetSpec:
+    """
+    Desired state of a fleet.
+
+    Every resource the fleet manages is named ``<prefix>-<name>``; resources
+    without the prefix are never touched. Prefixes cannot contain ``-``, so
+    no fleet's names start with another fleet's prefix.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        instances: Iterable[InstanceGroup] = (),
+        volumes: Iterable[VolumeSpec] = (),
+        ssh_keys: Iterable[SSHKeySpec] = (),
+    ) -> None:
+        """
+        Initialize the fleet spec.
+
+        Args:
+            prefix: Name prefix marking resources owned by this fleet,
+                without ``-``
+            instances: Desired instance groups
+            volumes: Desired volumes
+            ssh_keys: Desired SSH keys
+
+        Raises:
+            ShadeformValidationError: If the prefix is empty or contains
+                ``-``, or names or group keys are duplicated
+        """
+        if not prefix:
+            raise ShadeformValidationError("Fleet prefix is required", field="prefix")
+        if "-" in prefix:
+            # Fleet 'ml' would otherwise own everything of fleet 'ml-staging'
+            raise ShadeformValidationError(
+                f"Fleet prefix must not contain '-': {prefix!r}", field="prefix"
+            )
+        self.prefix = prefix
+        self.instances = list(instances)
+        self.volumes = list(volumes)
+        self.ssh_keys = list(ssh_keys)
+
+        for field, names in (
+            ("instances", [g.key for g in self.instances]),
+            ("instances", [g.name for g in self.instances]),
+            ("volumes", [v.name for v in self.volumes]),
+            ("ssh_keys", [k.name for k in self.ssh_keys]),
+        ):
+            if len(set(names)) != len(names):
+                raise ShadeformValidationError(
+                    f"Duplicate entries in fleet {field}", field=field
+                )
+
+    def full_name(self, name: str) -> str:
+        """Return the name of a managed resource including the prefix."""
+        return f"{self.prefix}-{name}"
+
+
+class Action:
+    """A single API call in a plan."""
+
+    def __init__(
+        self,
+        operation: str,
+        resource: str,
+        name: str,
+        resource_id: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Initialize the action.
+
+        Args:
+            operation: 'create', 'update' or 'delete'
+            resource: 'instance', 'volume' or 'ssh_key'
+            name: Full resource name
+            resource_id: ID of the existing resource (update and delete)
+            params: Arguments for the call
+        """
+        self.operation = operation
+        self.resource = resource
+        self.name = name
+        self.resource_id = resource_id
+        self.params = params or {}
+        self.depends_on: List["Action"] = []
+        self.result: Optional[Dict[str, Any]] = None
+
+    def __repr__(self) -> str:
+        """Return string representation of the action."""
+        target = f" {self.resource_id}" if self.resource_id else ""
+        return f"Action({self.operation} {self.resource} {self.name}{target})"
+
+
+class Plan:
+    """Ordered set of actions converging current state to a spec."""
+
+    def __init__(self, actions: List[Action], drift: List[str]) -> None:
+        """
+        Initialize the plan.
+
+        Args:
+            actions: Actions to run, with dependencies between them
+            drift: Differences the plan cannot fix through the API
+        """
+        self.actions = actions
+        self.drift = drift
+
+    def __len__(self) -> int:
+        """Return the number of actions."""
+        return len(self.actions)
+
+    def __iter__(self) -> Iterator[Action]:
+        """Iterate over the actions."""
+        return iter(self.actions)
+
+    @property
+    def is_empty(self) -> bool:
+        """Return whether the fleet already matches the spec."""
+        return not self.actions
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Count actions by operation and resource.
+
+        Returns:
+            Dictionary keyed by '<operation>_<resource>' (e.g. 'create_instance')
+        """
+        counts: Dict[str, int] = {}
+        for action in self.actions:
+            key = f"{action.operation}_{action.resource}"
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+
+class ApplyResult:
+    """Outcome of applying a plan."""
+
+    def __init__(self) -> None:
+        """Initialize an empty result."""
+        self.succeeded: List[Action] = []
+        self.failed: List[Tuple[Action, BaseException]] = []
+        self.skipped: List[Action] = []
+
+    @property
+    def ok(self) -> bool:
+        """Return whether every action succeeded."""
+        return not self.failed and not self.skipped
+
+    def raise_for_errors(self) -> None:
+        """
+        Raise if any action failed.
+
+        Raises:
+            ShadeformError: Summarizing the first failure
+        """
+        if self.failed:
+            action, error = self.failed[0]
+            raise ShadeformError(
+                f"{len(self.failed)} fleet actions failed and "
+                f"{len(self.skipped)} were skipped; first: {action!r}: {error}"
+            )
+
+
+class FleetReconciler:
+    """
+    Converge the account towards a declarative fleet spec.
+
+    ``plan`` reads instances, volumes and SSH keys with one concurrent
+    ``list_all`` pass and computes the fewest calls needed: existing
+    instances are kept (and renamed into free slots when their names are
+    off) before anything is created or deleted. ``apply`` runs each action
+    as soon as its dependencies finish, so volumes and keys are created
+    before the instances that use them, and instances are deleted before
+    the volumes they may hold.
+
+    Example:
+        spec = FleetSpec("training", instances=[
+            InstanceGroup("aws", "A100_80Gx1", "us-west-2", 16, launch_config),
+        ])
+        reconciler = FleetReconciler(client)
+        plan = reconciler.plan(spec)
+        print(plan.summary())
+        reconciler.apply(plan).raise_for_errors()
+    """
+
+    def __init__(
+        self,
+        client: "ShadeformClient",
+        parallelism: int = 16,
+        priority: Optional[str] = BULK,
+    ) -> None:
+        """
+        Initialize the reconciler.
+
+        Args:
+            client: The Shadeform client instance
+            parallelism: Maximum number of concurrent API calls
+            priority: Scheduling priority for reads and writes
+        """
+        self.client = client
+        self.parallelism = parallelism
+        self.priority = priority
+
+    def read(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch current instances, volumes and SSH keys concurrently.
+
+        Returns:
+            Dictionary with 'instances', 'volumes' and 'ssh_keys' lists
+        """
+        calls = {
+            "instances": self.client.instances.list_all,
+            "volumes": self.client.volumes.list_all,
+            "ssh_keys": self.client.ssh_keys.list_all,
+        }
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = {
+                name: executor.submit(call, priority=self.priority)
+                for name, call in calls.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    def plan(
+        self,
+        spec: FleetSpec,
+        state: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    ) -> Plan:
+        """
+        Compute the actions converging current state to the spec.
+
+        Args:
+            spec: Desired fleet state
+            state: Current state as returned by ``read`` (fetched if omitted)
+
+        Returns:
+            Plan with dependency-ordered actions
+
+        Raises:
+            ShadeformValidationError: If an instance group references an
+                unknown SSH key or volume
+        """
+        state = self.read() if state is None else state
+        managed = spec.full_name("")
+        actions: List[Action] = []
+        drift: List[str] = []
+
+        keys: Dict[str, Reference] = {}
+        volumes: Dict[str, Reference] = {}
+
+        # Keys the spec does not manage, which groups may refer to by name
+        account_keys: Dict[str, Reference] = {}
+        for record in state.get("ssh_keys", []):
+            account_keys.setdefault(str(record.get("name", "")), str(record["id"]))
+        current_keys = _index_by_name(state.get("ssh_keys", []), managed)
+        for key_spec in spec.ssh_keys:
+            name = spec.full_name(key_spec.name)
+            existing = current_keys.pop(name, [])
+            match = next(
+                (k for k in existing if k.get("public_key") == key_spec.public_key),
+                None,
+            )
+            if match is not None:
+                existing.remove(match)
+                keys[name] = match["id"]
+            else:
+                create = Action(
+                    CREATE,
+                    SSH_KEY,
+                    name,
+                    params={"name": name, "public_key": key_spec.public_key},
+                )
+                actions.append(create)
+                keys[name] = create
+            # Leftover keys with this name hold an outdated public key
+            actions.extend(Action(DELETE, SSH_KEY, name, k["id"]) for k in existing)
+        for name, leftovers in current_keys.items():
+            actions.extend(Action(DELETE, SSH_KEY, name, k["id"]) for k in leftovers)
+
+        volume_deletes: List[Action] = []
+        current_volumes = _index_by_name(state.get("volumes", []), managed)
+        for volume_spec in spec.volumes:
+            name = spec.full_name(volume_spec.name)
+            existing = current_volumes.pop(name, [])
+            if existing:
+                volume = existing[0]
+                volumes[name] = volume["id"]
+                for field in ("size_gb", "volume_type"):
+                    want = getattr(volume_spec, field)
+                    have = volume.get(field, want)
+                    if have != want:
+                        drift.append(
+                            f"volume {name}: {field} is {have}, spec says {want}"
+                        )
+                existing = existing[1:]
+            else:
+                create = Action(
+                    CREATE,
+                    VOLUME,
+                    name,
+                    params={
+                        "provider": volume_spec.provider,
+                        "name": name,
+                        "size_gb": volume_spec.size_gb,
+                        "volume_type": volume_spec.volume_type,
+                    },
+                )
+                actions.append(create)
+                volumes[name] = create
+            volume_deletes.extend(
+                Action(DELETE, VOLUME, name, v["id"]) for v in existing
+            )
+        for name, leftovers in current_volumes.items():
+            volume_deletes.extend(
+                Action(DELETE, VOLUME, name, v["id"]) for v in leftovers
+            )
+
+        instance_deletes: List[Action] = []
+        by_key: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        for instance in state.get("instances", []):
+            if not str(instance.get("name", "")).startswith(managed):
+                continue
+            if instance.get("status") in TERMINAL_STATUSES:
+                continue
+            key = (
+                instance.get("provider", ""),
+                instance.get("instance_type", ""),
+                instance.get("region", ""),
+            )
+            by_key.setdefault(key, []).append(instance)
+
+        for group in spec.instances:
+            key_ref = None
+            if group.ssh_key is not None:
+                key_ref = _resolve(
+                    keys, spec, group.ssh_key, "ssh_key", fallback=account_keys
+                )
+            volume_refs = [
+                (_resolve(volumes, spec, name, "volumes"), path)
+                for name, path in group.volumes.items()
+            ]
+            depends_on = [
+                ref
+                for ref in [key_ref, *(ref for ref, _ in volume_refs)]
+                if isinstance(ref, Action)
+            ]
+            slots = [spec.full_name(f"{group.name}-{i}") for i in range(group.count)]
+            wanted = set(slots)
+            filled: Set[str] = set()
+            spare: List[Dict[str, Any]] = []
+            for instance in by_key.pop(group.key, []):
+                instance_name = instance.get("name")
+                if instance_name in wanted and instance_name not in filled:
+                    filled.add(instance_name)
+                else:
+                    spare.append(instance)
+
+            for slot in slots:
+                if slot in filled:
+                    continue
+                if spare:
+                    instance = spare.pop(0)
+                    actions.append(
+                        Action(UPDATE, INSTANCE, slot, instance["id"], {"name": slot})
+                    )
+                    continue
+                create = Action(
+                    CREATE,
+                    INSTANCE,
+                    slot,
+                    params={
+                        "provider": group.provider,
+                        "name": slot,
+                        "region": group.region,
+                        "instance_type": group.instance_type,
+                        "launch_config": group.launch_config,
+                    },
+                )
+                create.params["ssh_key"] = key_ref
+                create.params["volumes"] = volume_refs
+                create.depends_on = depends_on
+                actions.append(create)
+            instance_deletes.extend(
+                Action(DELETE, INSTANCE, i.get("name", ""), i["id"]) for i in spare
+            )
+        for leftovers in by_key.values():
+            instance_deletes.extend(
+                Action(DELETE, INSTANCE, i.get("name", ""), i["id"]) for i in leftovers
+            )
+
+        # Volumes may still be attached to instances that are going away
+        for delete in volume_deletes:
+            delete.depends_on = list(instance_deletes)
+        actions.extend(instance_deletes)
+        actions.extend(volume_deletes)
+        return Plan(actions, drift)
+
+    def apply(self, plan: Plan) -> ApplyResult:
+        """
+        Run a plan with bounded parallelism in dependency order.
+
+        Actions whose dependencies failed are skipped; independent actions
+        still run.
+
+        Args:
+            plan: Plan returned by ``plan``
+
+        Returns:
+            Outcome of every action
+        """
+        result = ApplyResult()
+        waiting: Dict[Action, Set[Action]] = {}
+        dependents: Dict[Action, List[Action]] = {}
+        for action in plan:
+            waiting[action] = set(action.depends_on)
+            for dependency in action.depends_on:
+                dependents.setdefault(dependency, []).append(action)
+
+        ready = [action for action, deps in waiting.items() if not deps]
+        skipped: Set[Action] = set()
+        running: Dict[Future, Action] = {}
+        with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            while ready or running:
+                while ready:
+                    action = ready.pop()
+                    running[executor.submit(self._run, action)] = action
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    action = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        result.failed.append((action, error))
+                        skipped.update(_descendants(action, dependents))
+                        continue
+                    result.succeeded.append(action)
+                    for dependent in dependents.get(action, []):
+                        waiting[dependent].discard(action)
+                        if not waiting[dependent] and dependent not in skipped:
+                            ready.append(dependent)
+        result.skipped = [action for action in plan if action in skipped]
+        return result
+
+    def reconcile(self, spec: FleetSpec) -> ApplyResult:
+        """
+        Plan and apply in one step.
+
+        Args:
+            spec: Desired fleet state
+
+        Returns:
+            Outcome of every action
+        """
+        return self.apply(self.plan(spec))
+
+    def _run(self, action: Action) -> Dict[str, Any]:
+        client = self.client
+        params = action.params
+        priority = self.priority
+        if action.resource == INSTANCE:
+            if action.operation == CREATE:
+                key_ref = params["ssh_key"]
+                attachments = [
+                    VolumeConfiguration.create_attachment(_ref_id(ref), path)
+                    for ref, path in params["volumes"]
+                ]
+                result = client.instances.create(
+                    params["provider"],
+                    params["name"],
+                    params["region"],
+                    params["instance_type"],
+                    params["launch_config"],
+                    ssh_key_id=None if key_ref is None else _ref_id(key_ref),
+                    volumes=attachments or None,
+                    priority=priority,
+                )
+            elif action.operation == UPDATE:
+                result = client.instances.update(
+                    action.resource_id or "", params, priority=priority
+                )
+            else:
+                result = client.instances.delete(action.resource_id or "", priority)
+        elif action.resource == VOLUME:
+            if action.operation == CREATE:
+                result = client.volumes.create(
+                    params["provider"],
+                    params["name"],
+                    params["size_gb"],
+                    params["volume_type"],
+                    priority=priority,
+                )
+            else:
+                result = client.volumes.delete(action.resource_id or "", priority)
+        else:
+            if action.operation == CREATE:
+                result = client.ssh_keys.add(
+                    params["name"], params["public_key"], priority=priority
+                )
+            else:
+                result = client.ssh_keys.delete(action.resource_id or "", priority)
+        action.result = result
+        return result
+
+
+def _index_by_name(
+    records: List[Dict[str, Any]], prefix: str
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Group managed records by name."""
+    index: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        name = str(record.get("name", ""))
+        if name.startswith(prefix):
+            index.setdefault(name, []).append(record)
+    return index
+
+
+def _resolve(
+    refs: Dict[str, Reference],
+    spec: FleetSpec,
+    name: str,
+    field: str,
+    fallback: Optional[Dict[str, Reference]] = None,
+) -> Reference:
+    """Look up a resource an instance group refers to by name."""
+    ref = refs.get(spec.full_name(name))
+    if ref is None and fallback is not None:
+        ref = fallback.get(name)
+    if ref is None:
+        raise ShadeformValidationError(
+            f"Instance group refers to unknown {field} entry {name!r}", field=field
+        )
+    return ref
+
+
+def _ref_id(ref: Reference) -> str:
+    """Return the id of an existing or newly created resource."""
+    if isinstance(ref, Action):
+        assert ref.result is not None
+        return str(ref.result["id"])
+    return ref
+
+
+def _descendants(action: Action, dependents: Dict[Action, List[Action]]) -> Set[Action]:
+    """Return every action that transitively depends on an action."""
+    found: Set[Action] = set()
+    stack = list(dependents.get(action, []))
+    while stack:
+        dependent = stack.pop()
+        if dependent not in found:
+            found.add(dependent)
+            stack.extend(dependents.get(dependent, []))
+    return found
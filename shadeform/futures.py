@@ -0,0 +1,244 @@
+"""Non-blocking, concurrent.futures based API for Shadeform SDK."""
+
+import concurrent.futures
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Optional
+
+from .error import ShadeformError
+
+if TYPE_CHECKING:
+    from .client import ShadeformClient
+    from .resources.base import BaseResource
+
+# Event emitted when a submitted call finishes
+FUTURE_COMPLETED = "future_completed"
+
+
+class _ResourceFutures:
+    """Proxy exposing a resource client's methods as Future-returning calls."""
+
+    def __init__(self, futures: "FuturesClient", resource_name: str) -> None:
+        self._futures = futures
+        self._resource_name = resource_name
+
+    def __getattr__(self, name: str) -> Callable[..., Future]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        resource: "BaseResource" = getattr(self._futures.client, self._resource_name)
+        method = getattr(resource, name)
+        if not callable(method):
+            raise AttributeError(name)
+        label = f"{type(resource).__name__}.{name}"
+
+        def submit(*args: Any, **kwargs: Any) -> Future:
+            return self._futures.submit_named(label, method, *args, **kwargs)
+
+        submit.__name__ = name
+        submit.__doc__ = method.__doc__
+        return submit
+
+
+class FuturesClient:
+    """
+    Submit SDK calls to a bounded, client-owned thread pool.
+
+    Every resource method is available through a proxy that returns a
+    ``concurrent.futures.Future`` instead of blocking. Calls still go through
+    ``ShadeformClient.request``, so rate limits, concurrency limits, priority
+    scheduling and instrumentation all apply. Once ``max_pending`` calls are
+    queued, further submissions block until one finishes.
+
+    Example:
+        futures = [client.futures.instances.get_info(i) for i in instance_ids]
+        infos = gather(futures, timeout=30)
+    """
+
+    def __init__(
+        self,
+        client: "ShadeformClient",
+        max_workers: int = 16,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the futures facade.
+
+        Args:
+            client: The Shadeform client instance
+            max_workers: Number of worker threads
+            max_pending: Maximum submitted but unfinished calls
+                (default: four per worker)
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * 4
+        self._pending = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid = os.getpid()
+        self._lock = threading.Lock()
+
+        self.instances = _ResourceFutures(self, "instances")
+        self.ssh_keys = _ResourceFutures(self, "ssh_keys")
+        self.volumes = _ResourceFutures(self, "volumes")
+        self.templates = _ResourceFutures(self, "templates")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor_pid = os.getpid()
+                self._pending = threading.BoundedSemaphore(self.max_pending)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="shadeform"
+                )
+            return self._executor
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Submit any callable to the client's thread pool.
+
+        Args:
+            fn: Callable to run, typically a resource method
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Future resolving to the callable's result
+        """
+        return self.submit_named(
+            getattr(fn, "__qualname__", repr(fn)), fn, *args, **kwargs
+        )
+
+    def submit_named(
+        self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Future:
+        """
+        Submit a callable, reporting it under a given name.
+
+        Args:
+            name: Name used in instrumentation events
+            fn: Callable to run
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Future resolving to the callable's result
+        """
+        executor = self._get_executor()
+        pending = self._pending
+        pending.acquire()
+        submitted = time.monotonic()
+
+        def run() -> Any:
+            started = time.monotonic()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                instrumentation = self.client.instrumentation
+                if instrumentation.has_hooks(FUTURE_COMPLETED):
+                    instrumentation.emit(
+                        FUTURE_COMPLETED,
+                        name=name,
+                        queued=started - submitted,
+                        duration=time.monotonic() - started,
+                        failed=failed,
+                    )
+
+        try:
+            future = executor.submit(run)
+        except BaseException:
+            pending.release()
+            raise
+        # Also fires for cancelled futures that never ran
+        future.add_done_callback(lambda _: pending.release())
+        return future
+
+    def map(self, fn: Callable[..., Any], *iterables: Iterable[Any]) -> List[Future]:
+        """
+        Submit a callable once per set of arguments.
+
+        Args:
+            fn: Callable to run
+            *iterables: Argument iterables, as for the builtin map
+
+        Returns:
+            List of futures in argument order
+        """
+        return [self.submit(fn, *args) for args in zip(*iterables)]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down the thread pool.
+
+        Args:
+            wait: Whether to wait for running calls to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def as_completed(
+    futures: Iterable[Future], timeout: Optional[float] = None
+) -> Iterator[Future]:
+    """
+    Yield futures as they complete.
+
+    Args:
+        futures: Futures to wait on
+        timeout: Overall deadline in seconds
+
+    Raises:
+        ShadeformError: If the deadline passes before all futures complete
+    """
+    try:
+        yield from concurrent.futures.as_completed(futures, timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        raise ShadeformError(f"Timed out after {timeout}s waiting for results")
+
+
+def gather(
+    futures: Iterable[Future],
+    timeout: Optional[float] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Wait for futures and return their results in order.
+
+    Futures that have not started when the deadline passes are cancelled.
+
+    Args:
+        futures: Futures to wait on
+        timeout: Overall deadline in seconds
+        return_exceptions: Return exceptions in place of results instead of
+            raising the first one
+
+    Returns:
+        Results in the same order as the futures
+
+    Raises:
+        ShadeformError: If the deadline passes before all futures complete
+        Exception: The first failure, unless return_exceptions is set
+    """
+    futures = list(futures)
+    _, not_done = concurrent.futures.wait(futures, timeout=timeout)
+    if not_done:
+        for future in not_done:
+            future.cancel()
+        raise ShadeformError(
+            f"Timed out after {timeout}s with {len(not_done)} of "
+            f"{len(futures)} results pending"
+        )
+
+    results: List[Any] = []
+    for future in futures:
+        error = future.exception()
+        if error is not None and not return_exceptions:
+            raise error
+        results.append(error if error is not None else future.result())
+    return results
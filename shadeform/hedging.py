@@ -0,0 +1,240 @@
+"""Request hedging for idempotent requests in Shadeform SDK."""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies for a single endpoint."""
+
+    def __init__(self, window: int = 200) -> None:
+        """
+        Initialize the latency tracker.
+
+        Args:
+            window: Number of most recent samples to keep
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        """
+        Record a latency sample.
+
+        Args:
+            latency: Observed latency in seconds
+        """
+        with self._lock:
+            self._samples.append(latency)
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Compute a latency percentile over the current window.
+
+        Args:
+            percentile: Percentile to compute (0-100)
+
+        Returns:
+            Latency in seconds, or None if no samples have been recorded
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100.0))
+        return samples[index]
+
+
+class HedgePolicy:
+    """
+    Opt-in hedging policy for idempotent (GET) requests.
+
+    If a request has not completed after the configured latency percentile
+    for its endpoint, a second identical request is sent and whichever
+    answers first is used. The number of hedges is capped by a budget
+    expressed as a fraction of all requests.
+
+    Example:
+        client = ShadeformClient(api_key="...", hedging=HedgePolicy(percentile=95))
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.1,
+        min_delay: float = 0.005,
+        min_samples: int = 20,
+        window: int = 200,
+        max_workers: int = 16,
+    ) -> None:
+        """
+        Initialize the hedging policy.
+
+        Args:
+            percentile: Latency percentile after which a hedge is sent
+            budget: Maximum fraction of requests that may be hedged
+            min_delay: Lower bound on the hedge delay in seconds
+            min_samples: Samples required before an endpoint is hedged
+            window: Number of latency samples kept per endpoint
+            max_workers: Size of the thread pool running hedged requests
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if budget < 0:
+            raise ValueError("budget must be non-negative")
+
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.max_workers = max_workers
+
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid = os.getpid()
+        # Hedge credit accrues by `budget` per request, one credit per hedge
+        self._credit = 0.0
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def _tracker(self, endpoint: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._trackers.get(endpoint)
+            if tracker is None:
+                tracker = self._trackers[endpoint] = LatencyTracker(self.window)
+            return tracker
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                # Worker threads do not survive a fork, so start a new pool
+                self._executor_pid = os.getpid()
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="shadeform-hedge"
+                )
+            return self._executor
+
+    def _take_credit(self) -> bool:
+        with self._lock:
+            if self._credit >= 1.0:
+                self._credit -= 1.0
+                self.hedges += 1
+                return True
+            return False
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """
+        Return the delay after which a request to an endpoint is hedged.
+
+        Args:
+            endpoint: Endpoint template
+
+        Returns:
+            Delay in seconds, or None while too few samples are available
+        """
+        tracker = self._tracker(endpoint)
+        if len(tracker) < self.min_samples:
+            return None
+        delay = tracker.percentile(self.percentile)
+        return None if delay is None else max(delay, self.min_delay)
+
+    def _timed(self, tracker: LatencyTracker, fn: Callable[[], T]) -> T:
+        start = time.monotonic()
+        result = fn()
+        tracker.record(time.monotonic() - start)
+        return result
+
+    def run(self, endpoint: str, fn: Callable[[], T]) -> T:
+        """
+        Run a request, hedging it if it exceeds the endpoint's latency target.
+
+        The losing request cannot be interrupted once it is on the wire; its
+        result is discarded and it is cancelled if it has not started yet.
+
+        Args:
+            endpoint: Endpoint template used to track latency
+            fn: Zero-argument callable performing the request
+
+        Returns:
+            Result of whichever request completed first
+        """
+        tracker = self._tracker(endpoint)
+        with self._lock:
+            self.requests += 1
+            self._credit = min(self._credit + self.budget, max(1.0, self.budget * 10))
+
+        delay = self.hedge_delay(endpoint)
+        if delay is None:
+            return self._timed(tracker, fn)
+
+        executor = self._get_executor()
+        primary: "Future[T]" = executor.submit(self._timed, tracker, fn)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_credit():
+            return primary.result()
+
+        hedge: "Future[T]" = executor.submit(self._timed, tracker, fn)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        assert error is not None
+        raise error
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return hedging counters.
+
+        Returns:
+            Dictionary with requests, hedges, hedge_wins and hedge_rate
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+            }
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the policy configuration without its latency history."""
+        return (
+            HedgePolicy,
+            (
+                self.percentile,
+                self.budget,
+                self.min_delay,
+                self.min_samples,
+                self.window,
+                self.max_workers,
+            ),
+        )
+
+    def close(self) -> None:
+        """Shut down the hedging thread pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,81 @@
+"""Instrumentation hooks for Shadeform SDK."""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[..., None]
+
+# Events emitted by the SDK
+REQUEST = "request"
+CIRCUIT_STATE_CHANGE = "circuit_state_change"
+AUTOSCALE = "autoscale"
+
+
+class Instrumentation:
+    """
+    Registry of callbacks notified about SDK events.
+
+    Hooks are called synchronously with keyword arguments describing the
+    event. Exceptions raised by hooks are logged and never propagate into
+    the request that triggered them.
+
+    Example:
+        client.instrumentation.on("request", lambda **event: print(event))
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty hook registry."""
+        self._hooks: Dict[str, List[Hook]] = {}
+        self._lock = threading.Lock()
+
+    def on(self, event: str, hook: Hook) -> Hook:
+        """
+        Register a hook for an event.
+
+        Args:
+            event: Event name (e.g., 'request', 'circuit_state_change')
+            hook: Callable receiving the event data as keyword arguments
+
+        Returns:
+            The registered hook
+        """
+        with self._lock:
+            self._hooks[event] = self._hooks.get(event, []) + [hook]
+        return hook
+
+    def off(self, event: str, hook: Hook) -> None:
+        """
+        Unregister a previously registered hook.
+
+        Args:
+            event: Event name
+            hook: Hook to remove
+        """
+        with self._lock:
+            self._hooks[event] = [h for h in self._hooks.get(event, []) if h != hook]
+
+    def has_hooks(self, event: str) -> bool:
+        """
+        Return whether any hook is registered for an event.
+
+        Args:
+            event: Event name
+        """
+        return bool(self._hooks.get(event))
+
+    def emit(self, event: str, **data: Any) -> None:
+        """
+        Notify all hooks registered for an event.
+
+        Args:
+            event: Event name
+            **data: Event data passed to each hook
+        """
+        for hook in self._hooks.get(event, ()):
+            try:
+                hook(event=event, **data)
+            except Exception:  # noqa: BLE001 - hooks must not break requests
+                logger.exception("Instrumentation hook for %r failed", event)
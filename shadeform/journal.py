@@ -0,0 +1,353 @@
+"""Append-only, fsync'd JSON-lines journal for crash-safe operations."""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+from .utils.helpers import idempotency_key
+
+
+class Journal:
+    """
+    Durable log of operation records.
+
+    Each record is one JSON object per line. ``append`` flushes and fsyncs
+    before returning, so a record that was appended survives a crash of the
+    process (or host). Writers in several processes may share a file; each
+    append holds an advisory file lock.
+
+    Example:
+        journal = Journal("/var/lib/myapp/shadeform.journal")
+        client.instances.create_first_available(candidates, ..., journal=journal)
+    """
+
+    def __init__(self, path: str, fsync: bool = True) -> None:
+        """
+        Initialize the journal.
+
+        Args:
+            path: Journal file, created on first append
+            fsync: Whether to fsync after every append
+        """
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Durably append a record.
+
+        Args:
+            record: JSON-serializable record
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+        with self._lock:
+            fd = self._open_locked()
+            try:
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b"\n":
+                    # Terminate a record torn by an earlier crash
+                    line = b"\n" + line
+                os.write(fd, line)
+                if self.fsync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _open_locked(self) -> int:
+        """Open the current journal file for appending under an exclusive lock."""
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+            if fcntl is None:  # pragma: no cover - Windows
+                return fd  # type: ignore[unreachable]
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                # A concurrent rewrite may have replaced the file meanwhile
+                if os.fstat(fd).st_ino == os.stat(self.path).st_ino:
+                    return fd
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read all records in order.
+
+        A torn final line left by a crash mid-write is skipped.
+
+        Returns:
+            Iterator over the records
+        """
+        try:
+            handle = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def rewrite(self, keep: Callable[[Dict[str, Any]], bool]) -> None:
+        """
+        Atomically drop records that are no longer needed.
+
+        Args:
+            keep: Predicate selecting the records to keep
+        """
+        self.rewrite_all(lambda records: [r for r in records if keep(r)])
+
+    def rewrite_all(
+        self, select: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+    ) -> None:
+        """
+        Atomically replace the records with a selection of them.
+
+        The file stays locked from reading to replacing, so records appended
+        by other processes are seen and none are lost.
+
+        Args:
+            select: Callable given every record, returning those to keep
+        """
+        with self._lock:
+            fd = self._open_locked()
+            try:
+                kept = select(list(self.records()))
+                temp = f"{self.path}.{os.getpid()}.tmp"
+                with open(temp, "w") as handle:
+                    for record in kept:
+                        handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    handle.flush()
+                    if self.fsync:
+                        os.fsync(handle.fileno())
+                os.replace(temp, self.path)
+            finally:
+                # Closing releases the lock on the replaced file
+                os.close(fd)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the journal by its path."""
+        return (Journal, (self.path, self.fsync))
+
+
+# Operation journal record states
+INTENT = "intent"
+DONE = "done"
+FAILED = "failed"
+
+
+class OperationJournal:
+    """
+    Write-ahead log of the mutating calls made by the resource clients.
+
+    Before a create, update, delete or other mutating request is sent, its
+    intent is journaled under an idempotency key derived from the method,
+    endpoint and payload; the outcome is journaled when the response
+    arrives. A process restarted with the same journal therefore resumes a
+    bulk operation in O(pending) work: calls that already succeeded are
+    answered from the journal without a request, and only calls whose
+    outcome was lost in the crash need checking against the API.
+
+    Use one journal per bulk run: within it, identical creates are treated
+    as the same operation, while other mutating calls are keyed by how many
+    identical calls came before them, so repeating ``restart(id)`` sends it
+    again but a restarted run replaying the same calls resumes.
+
+    Example:
+        client = ShadeformClient(api_key="...", journal="launch-800.journal")
+    """
+
+    def __init__(self, journal: Union[str, Journal]) -> None:
+        """
+        Initialize the operation journal, replaying any existing records.
+
+        Args:
+            journal: ``Journal`` or path of the journal file
+        """
+        self.journal = Journal(journal) if isinstance(journal, str) else journal
+        self._lock = threading.Lock()
+        # Idempotency key -> latest record
+        self._records: Dict[str, Dict[str, Any]] = {}
+        for record in self.journal.records():
+            if "key" in record:
+                self._records[record["key"]] = record
+        # Calls in flight when an earlier process stopped
+        self.recovered = {k for k, r in self._records.items() if r["state"] == INTENT}
+        # Content key -> identical calls made so far by this process
+        self._occurrences: Dict[str, int] = {}
+        # Collection -> name -> records, listed once while recovering
+        self._listings: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._listing_lock = threading.Lock()
+
+    @staticmethod
+    def key(method: str, endpoint: str, payload: Any = None) -> str:
+        """
+        Derive the idempotency key of a call.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            payload: JSON payload, if any
+
+        Returns:
+            Hex digest identifying the operation
+        """
+        return idempotency_key(method, endpoint, payload)
+
+    def next_key(self, method: str, endpoint: str, payload: Any = None) -> str:
+        """
+        Derive the idempotency key of the next occurrence of a call.
+
+        The first occurrence gets the call's ``key``; each identical call
+        after it gets a key of its own.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            payload: JSON payload, if any
+
+        Returns:
+            Hex digest identifying this occurrence of the operation
+        """
+        key = idempotency_key(method, endpoint, payload)
+        with self._lock:
+            count = self._occurrences[key] = self._occurrences.get(key, 0) + 1
+        if count == 1:
+            return key
+        return idempotency_key(method, endpoint, {"call": count, "payload": payload})
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the latest record of an operation.
+
+        Args:
+            key: Idempotency key
+
+        Returns:
+            Record with ``state`` (intent, done or failed), or None
+        """
+        with self._lock:
+            return self._records.get(key)
+
+    def by_name(
+        self, collection: str, list_all: Callable[[], List[Dict[str, Any]]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Return the resources of a collection by name, listing it only once.
+
+        Resources made by interrupted calls exist before this process
+        starts, so one listing answers every recovered call.
+
+        Args:
+            collection: Collection the listing belongs to
+            list_all: Zero-argument callable listing the collection
+
+        Returns:
+            Listed resources keyed by name
+        """
+        with self._listing_lock:
+            index = self._listings.get(collection)
+            if index is None:
+                index = self._listings[collection] = {}
+                for record in list_all():
+                    index.setdefault(str(record.get("name")), []).append(record)
+            return index
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.journal.append(record)
+            self._records[record["key"]] = record
+            if record["state"] != INTENT:
+                self.recovered.discard(record["key"])
+                if not self.recovered:
+                    self._listings.clear()
+
+    def begin(self, key: str, method: str, endpoint: str, payload: Any = None) -> None:
+        """
+        Durably record the intent to make a call.
+
+        Args:
+            key: Idempotency key
+            method: HTTP method
+            endpoint: API endpoint path
+            payload: JSON payload, if any
+        """
+        self._write(
+            {
+                "key": key,
+                "state": INTENT,
+                "method": method,
+                "endpoint": endpoint,
+                "payload": payload,
+            }
+        )
+
+    def complete(self, key: str, result: Any) -> None:
+        """
+        Durably record that a call succeeded.
+
+        Args:
+            key: Idempotency key
+            result: Parsed response of the call
+        """
+        self._write({"key": key, "state": DONE, "result": result})
+
+    def fail(self, key: str, error: BaseException) -> None:
+        """
+        Durably record that a call failed.
+
+        Failed calls are sent again when repeated.
+
+        Args:
+            key: Idempotency key
+            error: The error raised by the call
+        """
+        self._write(
+            {
+                "key": key,
+                "state": FAILED,
+                "error": str(error),
+                "status_code": getattr(error, "status_code", None),
+            }
+        )
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """
+        Return the intents of calls whose outcome is unknown.
+
+        Returns:
+            Intent records of calls that have not completed or failed
+        """
+        with self._lock:
+            return [r for r in self._records.values() if r["state"] == INTENT]
+
+    def compact(self) -> None:
+        """
+        Rewrite the journal keeping only the latest record per operation.
+
+        The latest records are taken from the file, so records of other
+        processes sharing it are kept too.
+        """
+
+        def latest(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            by_key: Dict[str, Dict[str, Any]] = {}
+            for record in records:
+                if "key" in record:
+                    # Re-insert so the order follows the latest writes
+                    by_key.pop(record["key"], None)
+                    by_key[record["key"]] = record
+            return list(by_key.values())
+
+        with self._lock:
+            self.journal.rewrite_all(latest)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the operation journal by its file."""
+        return (OperationJournal, (self.journal,))
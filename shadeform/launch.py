@@ -0,0 +1,323 @@
+"""Launch racing across capacity candidates for Shadeform SDK."""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .error import ShadeformError
+from .journal import Journal
+from .workflow import FAILED_STATUSES
+
+if TYPE_CHECKING:
+    from .resources.instances import InstanceClient
+
+logger = logging.getLogger(__name__)
+
+# Marker in the names of instances launched by a race, before the winner
+# is renamed
+RACE_TAG = "-race-"
+
+# Journal record operation for launch races
+RACE = "race"
+
+# Races running in this process, which recovery must leave alone
+_active_races: Set[str] = set()
+_active_lock = threading.Lock()
+
+
+def rank_candidates(
+    candidates: Sequence[Mapping[str, str]], instance_types: List[Dict[str, Any]]
+) -> List[Dict[str, str]]:
+    """
+    Order launch candidates by hourly price.
+
+    Candidates the catalog reports as unavailable in their region go last,
+    as do candidates without a known price; ties keep the given order.
+
+    Args:
+        candidates: Dicts with provider, region and instance_type
+        instance_types: Catalog from ``instances.list_types()``
+
+    Returns:
+        Candidates, cheapest first
+    """
+    prices: Dict[Tuple[Any, Any], float] = {}
+    unavailable: Set[Tuple[Any, Any, Any]] = set()
+    for entry in instance_types:
+        key = (entry.get("type") or entry.get("instance_type"), entry.get("provider"))
+        if entry.get("hourly_price") is not None:
+            prices[key] = float(entry["hourly_price"])
+        for slot in entry.get("availability") or ():
+            if slot.get("available") is False:
+                unavailable.add((*key, slot.get("region")))
+
+    def rank(item: Tuple[int, Mapping[str, str]]) -> Tuple[bool, bool, float, int]:
+        index, candidate = item
+        type_key = (candidate["instance_type"], candidate["provider"])
+        price = prices.get(type_key)
+        return (
+            (*type_key, candidate["region"]) in unavailable,
+            price is None,
+            price or 0.0,
+            index,
+        )
+
+    return [dict(c) for _, c in sorted(enumerate(candidates), key=rank)]
+
+
+def _as_journal(journal: Union[str, Journal, None]) -> Optional[Journal]:
+    return Journal(journal) if isinstance(journal, str) else journal
+
+
+def create_first_available(
+    instances: "InstanceClient",
+    candidates: Sequence[Mapping[str, str]],
+    name: str,
+    launch_config: Dict[str, Any],
+    hedge: int = 2,
+    ssh_key_id: Optional[str] = None,
+    volumes: Optional[List[Dict[str, Any]]] = None,
+    timeout: float = 900.0,
+    poll_interval: float = 5.0,
+    journal: Union[str, Journal, None] = None,
+    priority: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Launch on the first candidate that becomes active.
+
+    See ``InstanceClient.create_first_available``.
+    """
+    if hedge < 1:
+        raise ValueError("hedge must be at least 1")
+    if not candidates:
+        raise ValueError("At least one candidate is required")
+    log = _as_journal(journal)
+    if log is not None:
+        recover_launches(instances, log)
+
+    ranked: Deque[Dict[str, str]] = deque(
+        rank_candidates(candidates, instances.list_types(priority=priority))
+    )
+    token = uuid.uuid4().hex[:12]
+    with _active_lock:
+        _active_races.add(token)
+    if log is not None:
+        log.append(
+            {
+                "op": RACE,
+                "race": token,
+                "event": "start",
+                "name": name,
+                "pid": os.getpid(),
+                "host": socket.gethostname(),
+            }
+        )
+
+    created: List[str] = []
+    created_lock = threading.Lock()
+    finished = threading.Event()
+    deadline = time.monotonic() + timeout
+
+    def attempt(candidate: Dict[str, str], index: int) -> Optional[Dict[str, Any]]:
+        instance = instances.create(
+            candidate["provider"],
+            f"{name}{RACE_TAG}{token}-{index}",
+            candidate["region"],
+            candidate["instance_type"],
+            launch_config,
+            ssh_key_id=ssh_key_id,
+            volumes=volumes,
+            priority=priority,
+        )
+        instance_id = str(instance["id"])
+        with created_lock:
+            created.append(instance_id)
+        if log is not None:
+            log.append(
+                {"op": RACE, "race": token, "event": "created", "id": instance_id}
+            )
+        while not finished.is_set():
+            info = instances.get_info(instance_id, priority=priority)
+            status = info.get("status")
+            if status == "active":
+                return info
+            if status in FAILED_STATUSES:
+                raise ShadeformError(
+                    f"Instance {instance_id} entered status {status!r}"
+                )
+            finished.wait(min(poll_interval, max(0.0, deadline - time.monotonic())))
+        return None
+
+    winner: Optional[Dict[str, Any]] = None
+    errors: List[str] = []
+    try:
+        with ThreadPoolExecutor(
+            max_workers=hedge, thread_name_prefix="shadeform-race"
+        ) as executor:
+            running: Set[Future] = set()
+            index = 0
+            while (ranked or running) and winner is None:
+                while ranked and len(running) < hedge:
+                    running.add(executor.submit(attempt, ranked.popleft(), index))
+                    index += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    errors.append(f"timed out after {timeout}s")
+                    break
+                done, running = wait(
+                    running, timeout=remaining, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    error = future.exception()
+                    if error is not None:
+                        errors.append(str(error))
+                    elif winner is None and future.result() is not None:
+                        winner = future.result()
+            finished.set()
+
+        if winner is not None and log is not None:
+            log.append(
+                {"op": RACE, "race": token, "event": "won", "id": str(winner["id"])}
+            )
+        clean = _delete_all(
+            instances,
+            [i for i in created if winner is None or i != str(winner["id"])],
+            log,
+            token,
+        )
+        if winner is None:
+            if log is not None and clean:
+                log.append({"op": RACE, "race": token, "event": "closed"})
+            raise ShadeformError(
+                f"No candidate became active ({len(errors)} failed): "
+                + "; ".join(errors)
+            )
+
+        instances.update(str(winner["id"]), {"name": name}, priority=priority)
+        winner = dict(winner, name=name)
+        if log is not None and clean:
+            log.append({"op": RACE, "race": token, "event": "closed"})
+        return winner
+    finally:
+        finished.set()
+        with _active_lock:
+            _active_races.discard(token)
+
+
+def _delete_all(
+    instances: "InstanceClient",
+    instance_ids: List[str],
+    journal: Optional[Journal],
+    token: str,
+) -> bool:
+    """Delete race losers, returning whether every delete succeeded."""
+    clean = True
+    for instance_id in instance_ids:
+        try:
+            instances.delete(instance_id)
+        except ShadeformError as error:
+            if getattr(error, "status_code", None) != 404:
+                logger.warning("Failed to delete race loser %s: %s", instance_id, error)
+                clean = False
+                continue
+        if journal is not None:
+            journal.append(
+                {"op": RACE, "race": token, "event": "deleted", "id": instance_id}
+            )
+    return clean
+
+
+def _abandoned(start: Dict[str, Any]) -> bool:
+    """Return whether the process that started a race is gone."""
+    if start.get("host") != socket.gethostname():
+        return False
+    pid = start.get("pid")
+    if not isinstance(pid, int):
+        return False
+    if pid == os.getpid():
+        with _active_lock:
+            return start["race"] not in _active_races
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except (OSError, TypeError, ValueError):
+        return False
+    return False
+
+
+def recover_launches(
+    instances: "InstanceClient", journal: Union[str, Journal]
+) -> List[str]:
+    """
+    Delete instances left behind by races whose process died.
+
+    See ``InstanceClient.recover_launches``.
+    """
+    log = Journal(journal) if isinstance(journal, str) else journal
+    races: Dict[str, Dict[str, Any]] = {}
+    for record in log.records():
+        if record.get("op") != RACE:
+            continue
+        race = races.setdefault(
+            record["race"], {"start": None, "created": set(), "won": set()}
+        )
+        event = record.get("event")
+        if event == "start":
+            race["start"] = record
+        elif event == "created":
+            race["created"].add(record["id"])
+        elif event == "deleted":
+            race["created"].discard(record["id"])
+        elif event == "won":
+            race["won"].add(record["id"])
+        elif event == "closed":
+            races.pop(record["race"])
+
+    pending = {
+        token: race
+        for token, race in races.items()
+        if race["start"] is not None and _abandoned(race["start"])
+    }
+    if not pending:
+        return []
+
+    deleted: List[str] = []
+    listed = instances.list_all()
+    for token, race in pending.items():
+        tag = f"{RACE_TAG}{token}-"
+        orphans = [
+            str(i["id"])
+            for i in listed
+            if (tag in str(i.get("name", "")) or str(i["id"]) in race["created"])
+            and str(i["id"]) not in race["won"]
+        ]
+        if _delete_all(instances, orphans, log, token):
+            log.append({"op": RACE, "race": token, "event": "closed"})
+        deleted.extend(orphans)
+
+    closed = {
+        r["race"]
+        for r in log.records()
+        if r.get("op") == RACE and r.get("event") == "closed"
+    }
+    log.rewrite(lambda r: r.get("op") != RACE or r.get("race") not in closed)
+    return deleted
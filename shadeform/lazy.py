@@ -0,0 +1,316 @@
+"""Lazily decoded JSON response objects for Shadeform SDK."""
+
+import json
+import json.scanner
+import re
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import msgspec as _msgspec
+
+    msgspec: Any = _msgspec
+except ImportError:  # pragma: no cover - exercised when msgspec is missing
+    msgspec = None
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# The C scanner behind json.loads, used to decode or step over one value
+_scan_once = json.scanner.make_scanner(json.JSONDecoder())  # type: ignore[arg-type]
+
+
+def _skip_ws(text: str, index: int) -> int:
+    return _WHITESPACE.match(text, index).end()  # type: ignore[union-attr]
+
+
+def _scan(text: str, index: int) -> Tuple[Any, int]:
+    """Decode the JSON value at ``index``; return it and its end offset."""
+    try:
+        return _scan_once(text, index)
+    except StopIteration as exc:
+        raise ValueError(f"Malformed JSON at offset {exc.value}") from None
+
+
+def _first(text: str, start: int, close: str) -> int:
+    """Return the offset of the first member or element, or -1 if empty."""
+    index = _skip_ws(text, start + 1)
+    return -1 if text[index : index + 1] == close else index
+
+
+def _separator(text: str, index: int, close: str) -> int:
+    """
+    Step past the comma after a member or element.
+
+    Returns the offset of the next one, or -1 at the closing bracket.
+    """
+    index = _skip_ws(text, index)
+    char = text[index : index + 1]
+    if char == close:
+        return -1
+    if char != ",":
+        raise ValueError(f"Malformed JSON at offset {index}")
+    return _skip_ws(text, index + 1)
+
+
+def _decode(buffer: Any, entry: Any) -> Any:
+    """
+    Decode an indexed value, keeping objects and arrays lazy.
+
+    ``entry`` is a ``msgspec.Raw`` when msgspec is installed, else the
+    value's offset in the decoded text.
+    """
+    if msgspec is not None:
+        first = bytes(memoryview(entry)[:1])
+        if first == b"{":
+            return LazyObject(entry)
+        if first == b"[":
+            return LazyArray(entry)
+        return msgspec.json.decode(entry)
+    first = buffer[entry]
+    if first == "{":
+        return LazyObject(buffer, entry)
+    if first == "[":
+        return LazyArray(buffer, entry)
+    return _scan(buffer, entry)[0]
+
+
+class _LazyValue:
+    """Shared storage of a lazily decoded JSON container."""
+
+    __slots__ = ("_buffer", "_start", "_end")
+
+    def __init__(self, buffer: Any, start: int = 0, end: Optional[int] = None) -> None:
+        self._buffer = buffer
+        self._start = start
+        if end is None and msgspec is not None:
+            end = len(buffer)
+        # Found when first needed otherwise
+        self._end = end
+
+    @property
+    def raw(self) -> bytes:
+        """Return the encoded JSON of this value."""
+        if msgspec is not None:
+            return bytes(memoryview(self._buffer)[self._start : self._end])
+        if self._end is None:
+            self._end = _scan(self._buffer, self._start)[1]
+        text: str = self._buffer[self._start : self._end]
+        return text.encode()
+
+    def materialize(self) -> Any:
+        """
+        Decode the value fully into plain dicts and lists.
+
+        Returns:
+            The decoded value
+        """
+        if msgspec is not None:
+            return msgspec.json.decode(
+                memoryview(self._buffer)[self._start : self._end]
+            )
+        return _scan(self._buffer, self._start)[0]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the encoded JSON."""
+        return (loads, (self.raw,))
+
+
+class LazyObject(_LazyValue, Mapping):
+    """
+    A JSON object decoded on access.
+
+    Members are located on demand, only as far into the object as the key
+    being read, and a value is decoded when it is read and then cached.
+    Nested objects and arrays are lazy views over the same buffer. The
+    object is read-only; use ``dict(obj)`` or ``materialize()`` for a
+    mutable copy.
+    """
+
+    __slots__ = ("_fields", "_values", "_cursor", "_pending")
+
+    def __init__(self, buffer: Any, start: int = 0, end: Optional[int] = None) -> None:
+        """
+        Initialize the object over an encoded JSON object.
+
+        Args:
+            buffer: Encoded JSON holding the object
+            start: Offset of the opening brace
+            end: Offset just past the closing brace (default: found when needed)
+        """
+        super().__init__(buffer, start, end)
+        self._fields: Dict[str, Any] = {}
+        self._values: Dict[str, Any] = {}
+        # Offset of the next member to index, -1 once all are indexed
+        self._cursor: Optional[int] = None
+        # Value of the last indexed member, stepped over only when needed
+        self._pending: Optional[int] = None
+
+    def _locate(self, key: Optional[str] = None) -> Dict[str, Any]:
+        """Index members until ``key`` is found, or all of them."""
+        fields = self._fields
+        if self._cursor == -1 or (key is not None and key in fields):
+            return fields
+        if msgspec is not None:
+            view = memoryview(self._buffer)[self._start : self._end]
+            fields.update(msgspec.json.decode(view, type=Dict[str, msgspec.Raw]))
+            self._cursor = -1
+            return fields
+        text, cursor = self._buffer, self._cursor
+        if cursor is None:
+            cursor = _first(text, self._start, "}")
+        while cursor != -1:
+            if self._pending is not None:
+                cursor = _separator(text, _scan(text, self._pending)[1], "}")
+                self._pending = None
+                if cursor == -1:
+                    break
+            if text[cursor : cursor + 1] != '"':
+                raise ValueError(f"Malformed JSON at offset {cursor}")
+            name, index = _scan(text, cursor)
+            index = _skip_ws(text, index)
+            if text[index : index + 1] != ":":
+                raise ValueError(f"Malformed JSON at offset {index}")
+            fields[name] = self._pending = _skip_ws(text, index + 1)
+            if name == key:
+                break
+        self._cursor = cursor
+        return fields
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            entry = self._locate(key)[key]
+            value = self._values[key] = _decode(self._buffer, entry)
+            return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key in self._locate(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._locate())
+
+    def __len__(self) -> int:
+        return len(self._locate())
+
+    def __repr__(self) -> str:
+        return f"LazyObject({self.materialize()!r})"
+
+
+class LazyArray(_LazyValue, Sequence):
+    """
+    A JSON array whose elements are decoded on access.
+
+    Elements are not cached, so iterating over a large listing keeps only
+    the element in use decoded; hold on to the elements you need. Each
+    element is decoded whole, by msgspec when installed and by the standard
+    library's C scanner otherwise, since wrapping every record of a listing
+    in a lazy view costs more than decoding it.
+    """
+
+    __slots__ = ("_entries", "_cursor")
+
+    def __init__(self, buffer: Any, start: int = 0, end: Optional[int] = None) -> None:
+        """
+        Initialize the array over an encoded JSON array.
+
+        Args:
+            buffer: Encoded JSON holding the array
+            start: Offset of the opening bracket
+            end: Offset just past the closing bracket (default: found when needed)
+        """
+        super().__init__(buffer, start, end)
+        self._entries: Any = None
+        # Offset of the next element to index, -1 once all are indexed
+        self._cursor = -1
+
+    def _index(self) -> Any:
+        if self._entries is None:
+            if msgspec is not None:
+                view = memoryview(self._buffer)[self._start : self._end]
+                self._entries = msgspec.json.decode(view, type=List[msgspec.Raw])
+            else:
+                self._entries = array("q")
+                self._cursor = _first(self._buffer, self._start, "]")
+        return self._entries
+
+    def _advance(self) -> Any:
+        """Index the next element and return it decoded."""
+        text, start = self._buffer, self._cursor
+        value, end = _scan(text, start)
+        self._entries.append(start)
+        self._cursor = _separator(text, end, "]")
+        return value
+
+    def _all(self) -> Any:
+        entries = self._index()
+        while self._cursor != -1:
+            self._advance()
+        return entries
+
+    def _element(self, entry: Any) -> Any:
+        if msgspec is not None:
+            return msgspec.json.decode(entry)
+        return _scan(self._buffer, entry)[0]
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._element(e) for e in self._all()[index]]
+        entries = self._all() if index < 0 else self._index()
+        while index >= len(entries) and self._cursor != -1:
+            value = self._advance()
+            if index == len(entries) - 1:
+                return value
+        return self._element(entries[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        entries = self._index()
+        position = 0
+        while position < len(entries) or self._cursor != -1:
+            if position < len(entries):
+                yield self._element(entries[position])
+            else:
+                yield self._advance()
+            position += 1
+
+    def __len__(self) -> int:
+        return len(self._all())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, LazyArray)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyArray({self.materialize()!r})"
+
+
+def loads(data: Union[bytes, bytearray, memoryview]) -> Any:
+    """
+    Wrap an encoded JSON document in lazy objects.
+
+    With msgspec installed the objects are views over ``data`` itself;
+    otherwise over its decoded text, with values stepped over and decoded
+    by the standard library's C scanner.
+
+    Args:
+        data: Encoded JSON
+
+    Returns:
+        ``LazyObject`` or ``LazyArray`` for containers, or the decoded
+        scalar
+
+    Raises:
+        ValueError: If the document is empty or malformed
+    """
+    start = 0
+    while start < len(data) and data[start] in b" \t\n\r":
+        start += 1
+    if start == len(data):
+        raise ValueError("Empty JSON document")
+    if data[start] not in b"{[":
+        return json.loads(bytes(data))
+    container = LazyObject if data[start] == 0x7B else LazyArray  # {
+    if msgspec is not None:
+        return container(data, start)
+    return container(str(data, "utf-8"), start)
@@ -0,0 +1,450 @@
+"""Warm standby instance pool with lease/release for Shadeform SDK."""
+
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .error import ShadeformError
+from .fleet import InstanceGroup
+from .scheduler import BULK
+from .utils.helpers import is_json_object
+from .workflow import FAILED_STATUSES
+
+if TYPE_CHECKING:
+    from .client import ShadeformClient
+
+logger = logging.getLogger(__name__)
+
+LAUNCHING = "launching"
+READY = "ready"
+LEASED = "leased"
+
+# Length of the random suffix ending every pool instance name
+SUFFIX_LENGTH = 8
+
+HealthCheck = Callable[[Dict[str, Any]], bool]
+
+
+class _Member:
+    """Pool bookkeeping for one instance."""
+
+    def __init__(self, group: InstanceGroup, info: Dict[str, Any]) -> None:
+        self.group = group
+        self.info = info
+        self.state = LAUNCHING
+        self.known_since = time.monotonic()
+        self.idle_since = 0.0
+
+    @property
+    def id(self) -> str:
+        return str(self.info["id"])
+
+
+class InstancePool:
+    """
+    Keep active instances on standby so jobs can lease one immediately.
+
+    For every instance group, the pool keeps ``count`` active, idle
+    instances, topping up in the background as instances are leased. State
+    is synced with a single ``instances.list_all()`` call per round rather
+    than polling instances one by one, and ``lease()`` is served from that
+    local state. Idle instances beyond the standby count are deleted once
+    they have been idle for ``idle_ttl`` seconds.
+
+    Only instances named ``<prefix>-<group name>-...`` belong to the pool,
+    so a restarted process adopts the instances its predecessor launched.
+
+    Example:
+        pool = InstancePool(client, [
+            InstanceGroup("aws", "A100_80Gx1", "us-west-2", 2, launch_config),
+        ]).start()
+        instance = pool.lease(timeout=600)
+        try:
+            run_job(instance["ip"])
+        finally:
+            pool.release(instance)
+    """
+
+    def __init__(
+        self,
+        client: "ShadeformClient",
+        groups: Iterable[InstanceGroup],
+        prefix: str = "standby",
+        ssh_key_id: Optional[str] = None,
+        idle_ttl: float = 600.0,
+        sync_interval: float = 10.0,
+        health_check: Optional[HealthCheck] = None,
+        priority: Optional[str] = BULK,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            client: The Shadeform client instance
+            groups: Instance groups; ``count`` is the number kept on standby
+            prefix: Name prefix marking instances owned by the pool
+            ssh_key_id: Optional SSH key ID for launched instances
+            idle_ttl: Seconds an instance beyond the standby count may stay
+                idle before it is deleted
+            sync_interval: Seconds between background syncs
+            health_check: Optional callable given an instance's info; an
+                instance failing it is deleted instead of being leased
+            priority: Scheduling priority for launches and deletes
+        """
+        self.client = client
+        self.groups = list(groups)
+        self.prefix = prefix
+        self.ssh_key_id = ssh_key_id
+        self.idle_ttl = idle_ttl
+        self.sync_interval = sync_interval
+        self.health_check = health_check
+        self.priority = priority
+
+        self._members: Dict[str, _Member] = {}
+        self._creating: Dict[str, int] = {group.name: 0 for group in self.groups}
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _name_prefix(self, group: InstanceGroup) -> str:
+        return f"{self.prefix}-{group.name}-"
+
+    def _group_for(self, name: str) -> Optional[InstanceGroup]:
+        # Compare whole names, so group 'gpu' never adopts 'gpu-east' instances
+        head, _, suffix = name.rpartition("-")
+        if len(suffix) != SUFFIX_LENGTH:
+            return None
+        for group in self.groups:
+            if head + "-" == self._name_prefix(group):
+                return group
+        return None
+
+    def start(self) -> "InstancePool":
+        """
+        Start syncing and topping up in the background.
+
+        Returns:
+            The pool
+        """
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="shadeform-pool", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Instance pool sync failed")
+            self._wake.wait(self.sync_interval)
+            self._wake.clear()
+
+    def sync(self) -> None:
+        """Reconcile the pool with one ``list_all`` call and top it up."""
+        started = time.monotonic()
+        listed = self.client.instances.list_all()
+        now = time.monotonic()
+        to_check: List[_Member] = []
+        to_delete: List[str] = []
+
+        with self._condition:
+            seen = set()
+            for info in listed:
+                group = self._group_for(str(info.get("name", "")))
+                if group is None:
+                    continue
+                instance_id = str(info["id"])
+                seen.add(instance_id)
+                member = self._members.get(instance_id)
+                if member is None:
+                    # Launched by an earlier process with the same prefix
+                    member = self._members[instance_id] = _Member(group, info)
+                member.info = info
+                status = info.get("status")
+                if status in FAILED_STATUSES:
+                    if member.state != LEASED:
+                        del self._members[instance_id]
+                        to_delete.append(instance_id)
+                elif member.state == LAUNCHING and status == "active":
+                    to_check.append(member)
+
+            for instance_id, member in list(self._members.items()):
+                # Keep instances created after the listing was requested
+                if instance_id not in seen and member.known_since < started:
+                    del self._members[instance_id]
+
+        for member in to_check:
+            healthy = self._is_healthy(member.info)
+            with self._condition:
+                if self._members.get(member.id) is not member:
+                    continue
+                if healthy:
+                    member.state = READY
+                    member.idle_since = now
+                    self._condition.notify_all()
+                else:
+                    del self._members[member.id]
+                    to_delete.append(member.id)
+
+        with self._condition:
+            to_delete.extend(self._expire_idle(now))
+            launches = self._deficits()
+        for instance_id in to_delete:
+            self._delete(instance_id)
+        for group, missing in launches:
+            for _ in range(missing):
+                self.client.futures.submit(self._launch, group)
+
+    def _expire_idle(self, now: float) -> List[str]:
+        """Remove idle instances beyond the standby count past their TTL."""
+        expired = []
+        for group in self.groups:
+            ready = sorted(
+                (
+                    m
+                    for m in self._members.values()
+                    if m.group is group and m.state == READY
+                ),
+                key=lambda m: m.idle_since,
+                reverse=True,
+            )
+            for member in ready[group.count :]:
+                if now - member.idle_since >= self.idle_ttl:
+                    del self._members[member.id]
+                    expired.append(member.id)
+        return expired
+
+    def _deficits(self) -> List[Tuple[InstanceGroup, int]]:
+        """Reserve launches for groups below their standby count."""
+        launches = []
+        for group in self.groups:
+            standby = sum(
+                1
+                for m in self._members.values()
+                if m.group is group and m.state in (READY, LAUNCHING)
+            )
+            missing = group.count - standby - self._creating[group.name]
+            if missing > 0:
+                self._creating[group.name] += missing
+                launches.append((group, missing))
+        return launches
+
+    def _launch(self, group: InstanceGroup) -> None:
+        try:
+            created = self.client.instances.create(
+                group.provider,
+                self._name_prefix(group) + uuid.uuid4().hex[:SUFFIX_LENGTH],
+                group.region,
+                group.instance_type,
+                group.launch_config,
+                ssh_key_id=self.ssh_key_id,
+                priority=self.priority,
+            )
+            with self._condition:
+                self._members[str(created["id"])] = _Member(group, dict(created))
+        except Exception:
+            logger.exception("Failed to launch standby %s instance", group.name)
+        finally:
+            with self._condition:
+                self._creating[group.name] -= 1
+                self._condition.notify_all()
+
+    def _delete(self, instance_id: str) -> None:
+        try:
+            self.client.instances.delete(instance_id, self.priority)
+        except Exception:
+            logger.exception("Failed to delete pooled instance %s", instance_id)
+
+    def _is_healthy(self, info: Dict[str, Any]) -> bool:
+        if self.health_check is None:
+            return True
+        try:
+            return bool(self.health_check(info))
+        except Exception:
+            logger.exception("Health check for instance %s raised", info.get("id"))
+            return False
+
+    def lease(
+        self,
+        instance_type: Optional[str] = None,
+        region: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Take an active instance from the pool.
+
+        Args:
+            instance_type: Only lease instances of this type
+            region: Only lease instances in this region
+            timeout: Maximum time to wait for a standby instance (default:
+                wait indefinitely)
+
+        Returns:
+            Instance details from the latest sync
+
+        Raises:
+            ShadeformError: If no instance became available in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                member = self._take(instance_type, region)
+                while member is None:
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        raise ShadeformError(
+                            f"No standby instance available after {timeout}s"
+                        )
+                    self._wake.set()
+                    self._condition.wait(remaining)
+                    member = self._take(instance_type, region)
+            # Top up right away rather than at the next interval
+            self._wake.set()
+            if self.health_check is None or self._is_healthy(member.info):
+                return dict(member.info)
+            with self._condition:
+                self._members.pop(member.id, None)
+            self._delete(member.id)
+
+    def _take(
+        self, instance_type: Optional[str], region: Optional[str]
+    ) -> Optional[_Member]:
+        candidates = [
+            m
+            for m in self._members.values()
+            if m.state == READY
+            and instance_type in (None, m.group.instance_type)
+            and region in (None, m.group.region)
+        ]
+        if not candidates:
+            return None
+        member = min(candidates, key=lambda m: m.idle_since)
+        member.state = LEASED
+        return member
+
+    def release(self, instance: Any, recycle: bool = False) -> None:
+        """
+        Return a leased instance to the pool.
+
+        Args:
+            instance: Instance details returned by ``lease``, or its ID
+            recycle: Delete the instance instead of reusing it
+        """
+        instance_id = str(instance["id"] if is_json_object(instance) else instance)
+        with self._condition:
+            member = self._members.get(instance_id)
+            if member is None or member.state != LEASED:
+                return
+            if recycle:
+                del self._members[instance_id]
+            else:
+                member.state = READY
+                member.idle_since = time.monotonic()
+                self._condition.notify_all()
+        if recycle:
+            self._delete(instance_id)
+            self._wake.set()
+
+    @contextmanager
+    def leased(self, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Lease an instance for the duration of a block.
+
+        The instance is recycled if the block raises.
+
+        Args:
+            **kwargs: Arguments for ``lease``
+        """
+        instance = self.lease(**kwargs)
+        try:
+            yield instance
+        except BaseException:
+            self.release(instance, recycle=True)
+            raise
+        self.release(instance)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every group has its full standby count.
+
+        Args:
+            timeout: Maximum time to wait
+
+        Returns:
+            Whether the pool filled up in time
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: all(s[READY] >= g.count for g, s in self._counts()),
+                timeout=timeout,
+            )
+
+    def _counts(self) -> List[Tuple[InstanceGroup, Dict[str, int]]]:
+        counts = []
+        for group in self.groups:
+            states = {LAUNCHING: 0, READY: 0, LEASED: 0}
+            for member in self._members.values():
+                if member.group is group:
+                    states[member.state] += 1
+            counts.append((group, states))
+        return counts
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return instance counts per group.
+
+        Returns:
+            Mapping of group name to launching, ready and leased counts
+        """
+        with self._condition:
+            return {group.name: states for group, states in self._counts()}
+
+    def close(self, drain: bool = True) -> None:
+        """
+        Stop background syncing.
+
+        Args:
+            drain: Delete instances that are not currently leased
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if drain:
+            with self._condition:
+                # Launches still in flight would otherwise outlive the pool
+                self._condition.wait_for(lambda: not any(self._creating.values()))
+                idle = [i for i, m in self._members.items() if m.state != LEASED]
+                for instance_id in idle:
+                    del self._members[instance_id]
+            for instance_id in idle:
+                self._delete(instance_id)
+
+    def __enter__(self) -> "InstancePool":
+        """Start the pool for use as a context manager."""
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop the pool and delete its idle instances."""
+        self.close()
@@ -0,0 +1,264 @@
+"""Client-side token-bucket rate limiting for Shadeform SDK."""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from .error import ShadeformRateLimitError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+READ = "read"
+MUTATION = "mutation"
+
+
+def bucket_for_method(method: str) -> str:
+    """
+    Return the rate limit bucket used for an HTTP method.
+
+    Args:
+        method: HTTP method (GET, POST, etc.)
+
+    Returns:
+        'read' for safe methods, 'mutation' otherwise
+    """
+    return READ if method.upper() in ("GET", "HEAD", "OPTIONS") else MUTATION
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with separate read and mutation budgets.
+
+    When a ``path`` is given the bucket state lives in that file and is
+    guarded by an advisory file lock, so every process on the host sharing
+    the same path (and API key) draws from one budget. Without a path the
+    state is kept in memory and shared by the threads of one process.
+
+    Example:
+        limiter = RateLimiter(read_rate=20, mutation_rate=5,
+                              path="/tmp/shadeform-ratelimit.json")
+        client = ShadeformClient(api_key="...", rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        read_rate: float = 10.0,
+        mutation_rate: float = 2.0,
+        burst: Optional[float] = None,
+        path: Optional[str] = None,
+        blocking: bool = True,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the rate limiter.
+
+        Args:
+            read_rate: Sustained read (GET) requests per second
+            mutation_rate: Sustained mutating requests per second
+            burst: Bucket capacity in requests (default: one second of rate)
+            path: Optional state file shared across processes
+            blocking: Wait for a token instead of failing fast
+            timeout: Maximum time to wait for a token when blocking
+
+        Raises:
+            ValueError: If a rate is not positive
+        """
+        if read_rate <= 0 or mutation_rate <= 0:
+            raise ValueError("Rates must be positive")
+
+        self.rates = {READ: float(read_rate), MUTATION: float(mutation_rate)}
+        self.burst = burst
+        self.path = path
+        self.blocking = blocking
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Dict[str, float]] = {}
+
+    def _capacity(self, bucket: str) -> float:
+        return self.burst if self.burst is not None else max(1.0, self.rates[bucket])
+
+    def _fresh(self, bucket: str, now: float) -> Dict[str, float]:
+        return {
+            "tokens": self._capacity(bucket),
+            "rate": self.rates[bucket],
+            "stamp": now,
+            "blocked_until": 0.0,
+            "reset_at": 0.0,
+        }
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict[str, Dict[str, float]]]:
+        """Lock and yield the bucket state, persisting any changes."""
+        with self._lock:
+            if self.path is None:
+                yield self._memory
+                return
+
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = b""
+                while True:
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        break
+                    raw += chunk
+                try:
+                    state = json.loads(raw) if raw else {}
+                except ValueError:
+                    state = {}
+                yield state
+                data = json.dumps(state).encode()
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    def _refill(
+        self, bucket: str, state: Dict[str, Dict[str, float]], now: float
+    ) -> Dict[str, float]:
+        entry = state.get(bucket)
+        if entry is None:
+            entry = state[bucket] = self._fresh(bucket, now)
+        reset_at = entry.get("reset_at", 0.0)
+        if reset_at and now >= reset_at:
+            # The server's window has reset: its quota is whole again
+            entry.update(self._fresh(bucket, now))
+            return entry
+        elapsed = max(0.0, now - entry["stamp"])
+        entry["tokens"] = min(
+            self._capacity(bucket), entry["tokens"] + elapsed * entry["rate"]
+        )
+        entry["stamp"] = now
+        return entry
+
+    def try_acquire(self, method: str) -> float:
+        """
+        Try to take a token without waiting.
+
+        Args:
+            method: HTTP method of the request
+
+        Returns:
+            0.0 if a token was taken, otherwise seconds until one is available
+        """
+        bucket = bucket_for_method(method)
+        with self._state() as state:
+            now = time.time()
+            entry = self._refill(bucket, state, now)
+            if entry["blocked_until"] > now:
+                return entry["blocked_until"] - now
+            if entry["tokens"] >= 1.0:
+                entry["tokens"] -= 1.0
+                return 0.0
+            return (1.0 - entry["tokens"]) / entry["rate"]
+
+    def acquire(self, method: str) -> None:
+        """
+        Take a token for a request, waiting if configured to block.
+
+        Args:
+            method: HTTP method of the request
+
+        Raises:
+            ShadeformRateLimitError: If no token is available in time
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            wait = self.try_acquire(method)
+            if wait <= 0:
+                return
+            if not self.blocking or (
+                deadline is not None and time.monotonic() + wait > deadline
+            ):
+                raise ShadeformRateLimitError(
+                    f"Client-side {bucket_for_method(method)} rate limit exhausted",
+                    retry_after=wait,
+                )
+            time.sleep(wait)
+
+    def observe(
+        self, method: str, status_code: Optional[int], headers: Mapping[str, Any]
+    ) -> None:
+        """
+        Adjust the bucket from a server response.
+
+        ``Retry-After`` on a 429 pauses the bucket for every process sharing
+        it. ``X-RateLimit-Remaining`` and ``X-RateLimit-Reset`` (seconds until
+        the window resets) spread the remaining quota over the window, never
+        exceeding the configured rate; the configured rate and a full bucket
+        are restored once the window has reset.
+
+        Args:
+            method: HTTP method of the request
+            status_code: HTTP status code of the response
+            headers: Response headers
+        """
+        retry_after = _header_float(headers, "Retry-After")
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        reset = _header_float(headers, "X-RateLimit-Reset")
+        if status_code != 429 and remaining is None:
+            return
+
+        bucket = bucket_for_method(method)
+        with self._state() as state:
+            now = time.time()
+            entry = self._refill(bucket, state, now)
+            if status_code == 429:
+                entry["tokens"] = 0.0
+                entry["blocked_until"] = now + (retry_after or 1.0)
+            if reset is not None and reset > now / 2:
+                # Epoch timestamp rather than seconds until reset
+                reset = max(0.0, reset - now)
+            if remaining is not None:
+                entry["tokens"] = min(entry["tokens"], remaining)
+                if reset:
+                    entry["rate"] = min(
+                        self.rates[bucket], max(remaining / reset, 0.01)
+                    )
+                    entry["reset_at"] = now + reset
+                else:
+                    entry["rate"] = self.rates[bucket]
+                    entry["reset_at"] = 0.0
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        Pickle the limiter configuration.
+
+        File-backed state stays shared with the new process; in-memory state
+        starts from a full bucket.
+        """
+        return (
+            RateLimiter,
+            (
+                self.rates[READ],
+                self.rates[MUTATION],
+                self.burst,
+                self.path,
+                self.blocking,
+                self.timeout,
+            ),
+        )
+
+    def reset(self) -> None:
+        """Reset all buckets to full capacity."""
+        with self._state() as state:
+            state.clear()
+
+
+def _header_float(headers: Mapping[str, Any], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -1,10 +1,23 @@
 """Resource clients for Shadeform SDK."""
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .base import BaseResource
-from .instances import InstanceClient
-from .sshkeys import SSHKeyClient
-from .templates import TemplateClient
-from .volumes import VolumeClient
+
+if TYPE_CHECKING:
+    from .instances import InstanceClient
+    from .sshkeys import SSHKeyClient
+    from .templates import TemplateClient
+    from .volumes import VolumeClient
+
+# Resource modules are imported on first use
+_LAZY_CLIENTS = {
+    "InstanceClient": ".instances",
+    "SSHKeyClient": ".sshkeys",
+    "TemplateClient": ".templates",
+    "VolumeClient": ".volumes",
+}
 
 __all__ = [
     "BaseResource",
@@ -13,3 +26,11 @@ __all__ = [
     "TemplateClient",
     "VolumeClient",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import resource client modules on first attribute access."""
+    if name in _LAZY_CLIENTS:
+        module = importlib.import_module(_LAZY_CLIENTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,40 @@
 """Base resource class for Shadeform SDK."""
 
-from typing import TYPE_CHECKING, Any, Dict, List, TypeVar, Union
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    cast,
+)
 
-from ..error import ShadeformError
+from ..client import IDEMPOTENCY_HEADER
+from ..error import ShadeformAPIError, ShadeformError
+from ..utils.helpers import endpoint_template, is_json_array, is_json_object
+from ..utils.helpers import idempotency_key as idempotency_key_for
 
 if TYPE_CHECKING:
+    from ..catalog import CatalogIndex
     from ..client import ShadeformClient
+    from ..journal import OperationJournal
 
 T = TypeVar("T", bound="BaseResource")
 
+# Final endpoint segments of calls that create a named resource
+CREATE_ACTIONS = ("create", "add", "save")
+
+# Status codes after which an idempotent create is retried
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Seconds before the first retry of a create, doubling per retry
+RETRY_BACKOFF = 0.2
+
 
 class BaseResource:
     """Base class for all resource clients."""
@@ -23,7 +49,13 @@ class BaseResource:
         self.client = client
 
     def _make_request(
-        self, method: str, endpoint: str, expect_list: bool = False, **kwargs: Any
+        self,
+        method: str,
+        endpoint: str,
+        expect_list: bool = False,
+        priority: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
     ) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
         """
         Helper method to make requests to the API.
@@ -32,41 +64,229 @@ class BaseResource:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
             expect_list: Whether to expect a list response
+            priority: Optional scheduling priority class
+            payload: Payload of a body sent pre-encoded as ``data``, for the
+                journal (default: the ``json`` parameter)
             **kwargs: Additional request parameters
 
         Returns:
             API response data
 
         Raises:
+            ShadeformValidationError: If schema validation is enabled and the
+                payload does not match its schema
             ShadeformError: If response type doesn't match expected type
         """
-        response = self.client.request(method, endpoint, **kwargs)
+        if priority is not None:
+            kwargs["priority"] = priority
+
+        validation = self.client.validation
+        if validation is not None:
+            validation.check_request(method, endpoint, kwargs.get("json"))
+
+        journal = self.client.journal
+        if journal is not None and method != "GET":
+            if payload is None:
+                payload = kwargs.get("json")
+            return self._journaled(
+                journal, method, endpoint, expect_list, payload, kwargs
+            )
+        return self._send_request(method, endpoint, expect_list, kwargs)
+
+    def _journaled(
+        self,
+        journal: "OperationJournal",
+        method: str,
+        endpoint: str,
+        expect_list: bool,
+        payload: Any,
+        kwargs: Dict[str, Any],
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
+        """
+        Make a mutating request through the client's operation journal.
+
+        A call that already succeeded is answered from the journal. A create
+        whose outcome was lost when an earlier process stopped is looked up
+        by name before it is sent again.
+        """
+        from ..journal import DONE
+
+        key = (kwargs.get("headers") or {}).get(IDEMPOTENCY_HEADER)
+        if key is None:
+            # Only creates are the same operation whenever their content is
+            if endpoint.rsplit("/", 1)[-1] in CREATE_ACTIONS:
+                key = journal.key(method, endpoint, payload)
+            else:
+                key = journal.next_key(method, endpoint, payload)
+        record = journal.lookup(key)
+        if record is not None and record["state"] == DONE:
+            return cast(
+                Union[Dict[str, Any], List[Dict[str, Any]], None], record["result"]
+            )
+        if key in journal.recovered:
+            existing = self._find_created(journal, endpoint, payload)
+            if existing is not None:
+                journal.complete(key, existing)
+                return existing
+
+        journal.begin(key, method, endpoint, payload)
+        try:
+            result = self._send_request(method, endpoint, expect_list, kwargs)
+        except ShadeformError as error:
+            journal.fail(key, error)
+            raise
+        journal.complete(key, result)
+        return result
+
+    def _find_created(
+        self, journal: "OperationJournal", endpoint: str, payload: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Find the resource an interrupted create call made, by its name."""
+        collection, _, action = endpoint.rpartition("/")
+        if action not in CREATE_ACTIONS:
+            return None
+        name = payload.get("name") if isinstance(payload, dict) else None
+        list_all = getattr(self, "list_all", None)
+        if name is None or list_all is None:
+            return None
+        matches = journal.by_name(collection, list_all).get(str(name), [])
+        return matches[0] if len(matches) == 1 else None
+
+    def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        expect_list: bool,
+        kwargs: Dict[str, Any],
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
+        """Send a request and check the shape of its response."""
+        hedging = self.client.hedging
+        if method == "GET" and hedging is not None:
+            response = hedging.run(
+                endpoint_template(endpoint),
+                lambda: self.client.request(method, endpoint, **kwargs),
+            )
+        else:
+            response = self.client.request(method, endpoint, **kwargs)
+
+        validation = self.client.validation
+        if validation is not None:
+            validation.check_response(method, endpoint, response)
 
         if response is None:
             return {} if not expect_list else []
 
         # Handle various response formats
         if expect_list:
-            if isinstance(response, list):
-                return response
-            elif isinstance(response, dict):
+            if is_json_array(response):
+                return cast(List[Dict[str, Any]], response)
+            elif is_json_object(response):
                 # Try to find a list in the dict values
                 for value in response.values():
-                    if isinstance(value, list):
-                        return value
+                    if is_json_array(value):
+                        return cast(List[Dict[str, Any]], value)
                 return []  # Return empty list if no list found
             else:
                 raise ShadeformError(
                     f"Unexpected response type: {type(response).__name__}"
                 )
         else:
-            if isinstance(response, dict):
-                return response
+            if is_json_object(response):
+                return cast(Dict[str, Any], response)
             else:
                 raise ShadeformError(
                     f"Expected dict response, got {type(response).__name__}"
                 )
 
+    def _cached_list(
+        self, catalog: str, loader: Callable[[], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Serve a catalog listing from the client's catalog cache, if any.
+
+        Args:
+            catalog: Catalog name
+            loader: Zero-argument callable fetching the listing
+
+        Returns:
+            Catalog entries (a new list the caller may modify)
+        """
+        cache = self.client.catalog
+        if cache is None:
+            return loader()
+        return list(cache.get_or_load(catalog, loader))
+
+    def _catalog_index(self) -> Optional["CatalogIndex"]:
+        """Return the index of the client's cached type catalogs, if any."""
+        cache = self.client.catalog
+        return None if cache is None else cache.index()
+
+    @staticmethod
+    def _records(response: Any, collection: str) -> List[Dict[str, Any]]:
+        """Return the records of a bare or {"<collection>": [...]} listing."""
+        if is_json_object(response):
+            response = response.get(collection, [])
+        return cast(List[Dict[str, Any]], response) if is_json_array(response) else []
+
+    def _list_snapshot(
+        self, collection: str, endpoint: str, priority: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        List a collection and index the response in the client's snapshots.
+
+        Args:
+            collection: Collection name, also the key of a wrapped response
+            endpoint: API endpoint path
+            priority: Optional scheduling priority class
+
+        Returns:
+            Records of the collection
+        """
+        taken_at = time.monotonic()
+        # Support both direct list responses and {"<collection>": [...]} format
+        response = self._make_request(
+            "GET", endpoint, expect_list=True, priority=priority
+        )
+        records = self._records(response, collection)
+        snapshots = self.client.snapshots
+        if snapshots is not None:
+            snapshots.put(collection, records, taken_at=taken_at)
+        return records
+
+    def _get_info(
+        self,
+        collection: str,
+        resource_id: str,
+        fields: Optional[Sequence[str]],
+        priority: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Get a resource from a fresh list snapshot, or from its info endpoint.
+
+        Args:
+            collection: Collection name
+            resource_id: ID of the resource
+            fields: Fields the snapshot record must have
+            priority: Optional scheduling priority class
+
+        Returns:
+            Resource details
+        """
+        snapshots = self.client.snapshots
+        if snapshots is not None:
+            record: Optional[Dict[str, Any]] = snapshots.get(
+                collection, resource_id, fields
+            )
+            if record is not None:
+                return record
+        return self._get_dict(f"/{collection}/{resource_id}/info", priority=priority)
+
+    def _changing(self, collection: str, resource_id: str) -> None:
+        """Drop a resource from the snapshots before a call changes it."""
+        snapshots = self.client.snapshots
+        if snapshots is not None:
+            snapshots.discard(collection, resource_id)
+
     def _get_dict(self, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
         """
         Make a GET request that returns a dictionary.
@@ -84,9 +304,9 @@ class BaseResource:
         result = self._make_request("GET", endpoint, expect_list=False, **kwargs)
         if result is None:
             return {}
-        if not isinstance(result, dict):
+        if not is_json_object(result):
             raise ShadeformError(f"Expected dict response, got {type(result).__name__}")
-        return result
+        return cast(Dict[str, Any], result)
 
     def _get_list(self, endpoint: str, **kwargs: Any) -> List[Dict[str, Any]]:
         """
@@ -105,9 +325,9 @@ class BaseResource:
         result = self._make_request("GET", endpoint, expect_list=True, **kwargs)
         if result is None:
             return []
-        if not isinstance(result, list):
+        if not is_json_array(result):
             raise ShadeformError(f"Expected list response, got {type(result).__name__}")
-        return result
+        return cast(List[Dict[str, Any]], result)
 
     def _post_dict(self, endpoint: str, **kwargs: Any) -> Dict[str, Any]:
         """
@@ -126,9 +346,94 @@ class BaseResource:
         result = self._make_request("POST", endpoint, expect_list=False, **kwargs)
         if result is None:
             return {"success": True}  # Return a default success response if None
-        if not isinstance(result, dict):
+        if not is_json_object(result):
             raise ShadeformError(f"Expected dict response, got {type(result).__name__}")
-        return result
+        return cast(Dict[str, Any], result)
+
+    def _post_idempotent(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        priority: Optional[str] = None,
+        body: Optional[bytes] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make a create call that is safe to retry.
+
+        The call carries an idempotency key header, derived from the
+        payload unless one is given, and is retried after transport errors,
+        429s and 5xxs. Concurrent calls with the same key share one request.
+
+        Args:
+            endpoint: API endpoint path
+            payload: JSON payload
+            idempotency_key: Optional caller-supplied idempotency key
+            priority: Optional scheduling priority class
+            body: Optional pre-encoded JSON of the payload, sent as is
+
+        Returns:
+            API response data as dictionary
+
+        Raises:
+            ShadeformError: If the call still fails after its retries
+        """
+        from concurrent.futures import Future
+
+        key = idempotency_key or idempotency_key_for("POST", endpoint, payload)
+        client = self.client
+        with client._inflight_lock:
+            inflight = client._inflight.get(key)
+            if inflight is None:
+                inflight = client._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return dict(inflight.result())
+
+        try:
+            result = self._retry_create(endpoint, payload, key, priority, body)
+        except BaseException as error:
+            inflight.set_exception(error)
+            raise
+        else:
+            inflight.set_result(result)
+            return result
+        finally:
+            with client._inflight_lock:
+                client._inflight.pop(key, None)
+
+    def _retry_create(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        key: str,
+        priority: Optional[str],
+        body: Optional[bytes] = None,
+    ) -> Dict[str, Any]:
+        """Send a create call, retrying failures the key makes safe to repeat."""
+        content: Dict[str, Any] = {"json": payload}
+        if body is not None:
+            content = {"data": body, "payload": payload}
+        attempt = 0
+        while True:
+            try:
+                return self._post_dict(
+                    endpoint,
+                    headers={IDEMPOTENCY_HEADER: key},
+                    priority=priority,
+                    **content,
+                )
+            except ShadeformError as error:
+                retryable = type(error) is ShadeformError or (
+                    isinstance(error, ShadeformAPIError)
+                    and error.status_code in RETRY_STATUS_CODES
+                )
+                if not retryable or attempt >= self.client.mutation_retries:
+                    raise
+            time.sleep(RETRY_BACKOFF * 2**attempt)
+            attempt += 1
 
     def _post_none(self, endpoint: str, **kwargs: Any) -> None:
         """
@@ -1,11 +1,18 @@
 """Instance management resource for Shadeform SDK."""
 
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Union
 
-from ..error import ShadeformValidationError
+from ..catalog import INSTANCE_TYPES
+from ..error import ShadeformBatchValidationError, ShadeformValidationError
 from ..utils.helpers import validate_instance_type
 from .base import BaseResource
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from ..batch import LaunchBatch
+    from ..journal import Journal
+
 
 class InstanceClient(BaseResource):
     """Client for managing Shadeform instances."""
@@ -19,6 +26,8 @@ class InstanceClient(BaseResource):
         launch_config: Dict[str, Any],
         ssh_key_id: Optional[str] = None,
         volumes: Optional[List[Dict[str, Any]]] = None,
+        priority: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Create a new instance.
@@ -31,18 +40,28 @@ class InstanceClient(BaseResource):
             launch_config: Launch configuration (docker or script)
             ssh_key_id: Optional SSH key ID
             volumes: Optional list of volume configurations
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+            idempotency_key: Optional key identifying this operation; by
+                default it is derived from the request, so repeating an
+                identical call returns the original result
 
         Returns:
             Created instance details including id, status, public_ip, ssh_port
             and creation timestamp
 
         Raises:
-            ShadeformValidationError: If instance type is invalid
+            ShadeformValidationError: If instance type is invalid, or the
+                cached catalog shows the provider does not offer it in the
+                region
         """
         if not validate_instance_type(instance_type):
             raise ShadeformValidationError(
                 f"Invalid instance type: {instance_type}", field="instance_type"
             )
+        index = self._catalog_index()
+        if index is not None:
+            index.check_instance(instance_type, provider, region)
 
         payload: Dict[str, Any] = {
             "provider": provider,
@@ -61,80 +80,266 @@ class InstanceClient(BaseResource):
                 dict(vol) if hasattr(vol, "__dict__") else vol for vol in volumes
             ]
 
-        return self._post_dict("/instances/create", json=payload)
+        return self._post_idempotent(
+            "/instances/create", payload, idempotency_key, priority
+        )
 
-    def get_info(self, instance_id: str) -> Dict[str, Any]:
+    def get_info(
+        self,
+        instance_id: str,
+        priority: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
         """
         Get information about a specific instance.
 
         Args:
             instance_id: ID of the instance
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+            fields: Fields needed from a list snapshot for it to answer
+                the call (default: the snapshots' ``fields``); only used when
+                the client has ``snapshots``
 
         Returns:
             Instance details including id, name, status, instance_type,
             hourly_price, and uptime
         """
-        return self._get_dict(f"/instances/{instance_id}/info")
+        return self._get_info("instances", instance_id, fields, priority)
 
-    def list_all(self) -> List[Dict[str, Any]]:
+    def list_all(self, priority: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List all instances.
 
+        Args:
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+
         Returns:
             List of instances with basic information (id, name, status,
             instance_type)
         """
-        # Support both direct list responses and {"instances": [...]} format
-        response = self._make_request("GET", "/instances", expect_list=True)
-        if isinstance(response, dict):
-            instances = response.get("instances", [])
-            return instances if isinstance(instances, list) else []
-        return response if isinstance(response, list) else []
+        return self._list_snapshot("instances", "/instances", priority)
 
-    def update(self, instance_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+    def update(
+        self, instance_id: str, updates: Dict[str, Any], priority: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Update an instance.
 
         Args:
             instance_id: ID of the instance
             updates: Update parameters (e.g., {"name": "new-name"})
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
 
         Returns:
             Success confirmation
         """
-        return self._post_dict(f"/instances/{instance_id}/update", json=updates)
+        self._changing("instances", instance_id)
+        return self._post_dict(
+            f"/instances/{instance_id}/update", json=updates, priority=priority
+        )
 
-    def delete(self, instance_id: str) -> Dict[str, Any]:
+    def delete(
+        self, instance_id: str, priority: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Delete an instance.
 
         Args:
             instance_id: ID of the instance
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
 
         Returns:
             Success confirmation with deletion message
         """
-        return self._post_dict(f"/instances/{instance_id}/delete")
+        self._changing("instances", instance_id)
+        return self._post_dict(f"/instances/{instance_id}/delete", priority=priority)
 
-    def restart(self, instance_id: str) -> Dict[str, Any]:
+    def restart(
+        self, instance_id: str, priority: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Restart an instance.
 
         Args:
             instance_id: ID of the instance
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
 
         Returns:
             Success confirmation with new status
         """
-        return self._post_dict(f"/instances/{instance_id}/restart")
+        self._changing("instances", instance_id)
+        return self._post_dict(f"/instances/{instance_id}/restart", priority=priority)
 
-    def list_types(self) -> List[Dict[str, Any]]:
+    def list_types(
+        self,
+        priority: Optional[str] = None,
+        provider: Optional[str] = None,
+        gpu_type: Optional[str] = None,
+        available: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
         """
         List available instance types.
 
+        Filtered listings are always fetched from the API; only the full
+        catalog is served from the client's catalog cache.
+
+        Args:
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+            provider: Only list types offered by this cloud provider
+            gpu_type: Only list types with this GPU (e.g., 'A100')
+            available: Only list types available (or unavailable) somewhere
+
         Returns:
             List of instance types with specifications (type, provider,
             memory_gb, vCPUs, hourly_price)
         """
-        result = self._get_list("/instances/types")
-        return result if isinstance(result, list) else []
+        params = {
+            key: value
+            for key, value in (
+                ("cloud", provider),
+                ("gpu_type", gpu_type),
+                ("available", None if available is None else str(available).lower()),
+            )
+            if value is not None
+        }
+
+        def load() -> List[Dict[str, Any]]:
+            kwargs: Dict[str, Any] = {"params": params} if params else {}
+            return self._get_list("/instances/types", priority=priority, **kwargs)
+
+        if params:
+            return load()
+        return self._cached_list(INSTANCE_TYPES, load)
+
+    def create_batch(
+        self, batch: "LaunchBatch", priority: Optional[str] = "bulk"
+    ) -> List["Future[Dict[str, Any]]"]:
+        """
+        Validate a batch of launches and submit them concurrently.
+
+        Every row is validated first, against the cached catalogs when the
+        client has them and against the request schema when the client has
+        a validator, and nothing is sent if any row is invalid. Each row
+        is then created on the client's thread pool from its pre-encoded
+        body, with the idempotency key ``create`` would derive, so resending
+        a batch after a partial failure does not launch duplicates.
+
+        Args:
+            batch: Launches to create
+            priority: Scheduling priority class (default: 'bulk')
+
+        Returns:
+            One future per row, in row order, resolving to the created
+            instance's details
+
+        Raises:
+            ShadeformBatchValidationError: Listing every invalid row
+        """
+        batch.check(self._catalog_index())
+        payloads = [batch.payload(row) for row in range(len(batch))]
+        validation = self.client.validation
+        if validation is not None:
+            # Bodies are sent pre-encoded, past the per-request check
+            errors = []
+            for row, payload in enumerate(payloads):
+                try:
+                    validation.check_request("POST", "/instances/create", payload)
+                except ShadeformValidationError as error:
+                    errors.append((row, error.field or "payload", error.message))
+            if errors:
+                raise ShadeformBatchValidationError(errors)
+        return [
+            self.client.futures.submit(
+                self._post_idempotent,
+                "/instances/create",
+                payload,
+                key,
+                priority,
+                body,
+            )
+            for payload, body, key in zip(payloads, batch.bodies(), batch.keys())
+        ]
+
+    def create_first_available(
+        self,
+        candidates: Sequence[Mapping[str, str]],
+        name: str,
+        launch_config: Dict[str, Any],
+        hedge: int = 2,
+        ssh_key_id: Optional[str] = None,
+        volumes: Optional[List[Dict[str, Any]]] = None,
+        timeout: float = 900.0,
+        poll_interval: float = 5.0,
+        journal: Union[str, "Journal", None] = None,
+        priority: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Launch on whichever candidate placement becomes active first.
+
+        Candidates are tried cheapest first by the instance type catalog,
+        with up to ``hedge`` launches racing at once; a launch that fails or
+        is rejected for lack of capacity is replaced by the next candidate.
+        The first instance to become active wins and is renamed to ``name``;
+        every other launch is deleted. With a ``journal``, each launch is
+        recorded durably before it is polled, so instances orphaned by a
+        crash are deleted on the next call or by ``recover_launches``.
+
+        Args:
+            candidates: Dicts with provider, region and instance_type
+            name: Name for the winning instance
+            launch_config: Launch configuration for every attempt
+            hedge: Maximum number of launches in flight at once
+            ssh_key_id: Optional SSH key ID
+            volumes: Optional list of volume configurations
+            timeout: Maximum seconds to wait for an active instance
+            poll_interval: Seconds between status polls of each launch
+            journal: Optional ``Journal`` or path recording the race
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+
+        Returns:
+            Details of the active instance
+
+        Raises:
+            ValueError: If no candidates are given or hedge is below 1
+            ShadeformError: If no candidate became active in time
+        """
+        from ..launch import create_first_available
+
+        return create_first_available(
+            self,
+            candidates,
+            name,
+            launch_config,
+            hedge=hedge,
+            ssh_key_id=ssh_key_id,
+            volumes=volumes,
+            timeout=timeout,
+            poll_interval=poll_interval,
+            journal=journal,
+            priority=priority,
+        )
+
+    def recover_launches(self, journal: Union[str, "Journal"]) -> List[str]:
+        """
+        Delete instances left behind by launch races whose process died.
+
+        Races started by processes on this host that are no longer running
+        are cleaned up with a single ``list_all`` call, and their records
+        are compacted out of the journal.
+
+        Args:
+            journal: ``Journal`` or path passed to ``create_first_available``
+
+        Returns:
+            IDs of the deleted instances
+        """
+        from ..launch import recover_launches
+
+        return recover_launches(self, journal)
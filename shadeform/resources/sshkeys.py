@@ -10,7 +10,12 @@ class SSHKeyClient(BaseResource):
     """Client for managing Shadeform SSH keys."""
 
     def add(
-        self, name: str, public_key: str, description: Optional[str] = None
+        self,
+        name: str,
+        public_key: str,
+        description: Optional[str] = None,
+        priority: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Add a new SSH key.
@@ -19,6 +24,11 @@ class SSHKeyClient(BaseResource):
             name: Key name
             public_key: Public key content
             description: Optional key description
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+            idempotency_key: Optional key identifying this operation; by
+                default it is derived from the request, so repeating an
+                identical call returns the original result
 
         Returns:
             Created SSH key details including id, name, and fingerprint
@@ -35,55 +45,66 @@ class SSHKeyClient(BaseResource):
         if description:
             payload["description"] = description
 
-        return self._post_dict("/sshkeys/add", json=payload)
+        return self._post_idempotent("/sshkeys/add", payload, idempotency_key, priority)
 
-    def get_info(self, key_id: str) -> Dict[str, Any]:
+    def get_info(self, key_id: str, priority: Optional[str] = None) -> Dict[str, Any]:
         """
         Get information about a specific SSH key.
 
         Args:
             key_id: ID of the SSH key
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
 
         Returns:
             SSH key details including id, name, creation timestamp,
             and default status
         """
-        return self._get_dict(f"/sshkeys/{key_id}/info")
+        return self._get_dict(f"/sshkeys/{key_id}/info", priority=priority)
 
-    def set_default(self, key_id: str) -> Dict[str, Any]:
+    def set_default(
+        self, key_id: str, priority: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Set an SSH key as the default key.
 
         Args:
             key_id: ID of the SSH key
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
 
         Returns:
             Success confirmation with new default key ID
         """
-        return self._post_dict(f"/sshkeys/{key_id}/setdefault")
+        return self._post_dict(f"/sshkeys/{key_id}/setdefault", priority=priority)
 
-    def delete(self, key_id: str) -> Dict[str, Any]:
+    def delete(self, key_id: str, priority: Optional[str] = None) -> Dict[str, Any]:
         """
         Delete an SSH key.
 
         Args:
             key_id: ID of the SSH key
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
 
         Returns:
             Success confirmation
         """
-        return self._post_dict(f"/sshkeys/{key_id}/delete")
+        return self._post_dict(f"/sshkeys/{key_id}/delete", priority=priority)
 
-    def list_all(self) -> List[Dict[str, Any]]:
+    def list_all(self, priority: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List all SSH keys.
 
+        Args:
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+
         Returns:
             List of SSH keys with basic information (id, name, is_default)
         """
         # Support both direct list responses and {"ssh_keys": [...]} format
-        response = self._make_request("GET", "/sshkeys", expect_list=True)
-        if isinstance(response, dict):
-            ssh_keys = response.get("ssh_keys", [])
-            return ssh_keys if isinstance(ssh_keys, list) else []
-        return response if isinstance(response, list) else []
+        response = self._make_request(
+            "GET", "/sshkeys", expect_list=True, priority=priority
+        )
+        return self._records(response, "ssh_keys")
@@ -1,56 +1,119 @@
 """Template management resource for Shadeform SDK."""
 
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from ..catalog import TEMPLATES_FEATURED
+from ..templating import CompiledTemplate, TemplateCache
 from .base import BaseResource
 
+if TYPE_CHECKING:
+    from ..client import ShadeformClient
+
 
 class TemplateClient(BaseResource):
     """Client for managing Shadeform templates."""
 
-    def list_all(self) -> List[Dict[str, Any]]:
+    def __init__(self, client: "ShadeformClient") -> None:
+        """
+        Initialize the template client.
+
+        Args:
+            client: The Shadeform client instance
+        """
+        super().__init__(client)
+        self.compiled = TemplateCache(self)
+
+    def list_all(self, priority: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List all templates.
 
+        Args:
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+
         Returns:
             List of templates with basic information (id, name, framework)
         """
         # Support both direct list responses and {"templates": [...]} format
-        response = self._make_request("GET", "/templates", expect_list=True)
-        if isinstance(response, dict):
-            templates = response.get("templates", [])
-            return templates if isinstance(templates, list) else []
-        return response if isinstance(response, list) else []
+        response = self._make_request(
+            "GET", "/templates", expect_list=True, priority=priority
+        )
+        return self._records(response, "templates")
 
-    def get_info(self, template_id: str) -> Dict[str, Any]:
+    def get_info(
+        self, template_id: str, priority: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Get information about a specific template.
 
         Args:
             template_id: ID of the template
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
 
         Returns:
             Template details including id, name, and configuration
         """
-        return self._get_dict(f"/templates/{template_id}/info")
+        return self._get_dict(f"/templates/{template_id}/info", priority=priority)
 
-    def list_featured(self) -> List[Dict[str, Any]]:
+    def list_featured(self, priority: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List featured templates.
 
+        Args:
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+
         Returns:
             List of featured templates with basic information
             (id, name, description)
         """
-        # Support both direct list responses and {"featured": [...]} format
-        response = self._make_request("GET", "/templates/featured", expect_list=True)
-        if isinstance(response, dict):
-            featured = response.get("featured", [])
-            return featured if isinstance(featured, list) else []
-        return response if isinstance(response, list) else []
+
+        def load() -> List[Dict[str, Any]]:
+            # Support both direct list responses and {"featured": [...]} format
+            response = self._make_request(
+                "GET", "/templates/featured", expect_list=True, priority=priority
+            )
+            return self._records(response, "featured")
+
+        return self._cached_list(TEMPLATES_FEATURED, load)
+
+    def compile(
+        self,
+        template_id: str,
+        version: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> CompiledTemplate:
+        """
+        Compile a template's launch configuration for fast rendering.
+
+        The template is fetched with ``get_info`` the first time and the
+        compiled result is cached by template ID and version, so rendering
+        thousands of jobs from one template costs one request.
+
+        Args:
+            template_id: ID of the template
+            version: Version required (default: the version last fetched)
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+
+        Returns:
+            Compiled template whose ``render``/``render_json`` fill in its
+            ``{{ name }}`` placeholders
+
+        Raises:
+            ShadeformValidationError: If the template is at another version,
+                or has no valid launch configuration
+        """
+        return self.compiled.compile(template_id, version, priority)
 
     def save(
-        self, name: str, config: Dict[str, Any], description: Optional[str] = None
+        self,
+        name: str,
+        config: Dict[str, Any],
+        description: Optional[str] = None,
+        priority: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Save a new template.
@@ -59,6 +122,11 @@ class TemplateClient(BaseResource):
             name: Template name
             config: Template configuration
             description: Optional template description
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+            idempotency_key: Optional key identifying this operation; by
+                default it is derived from the request, so repeating an
+                identical call returns the original result
 
         Returns:
             Created template info including id
@@ -68,29 +136,45 @@ class TemplateClient(BaseResource):
         if description:
             payload["description"] = description
 
-        return self._post_dict("/templates/save", json=payload)
+        return self._post_idempotent(
+            "/templates/save", payload, idempotency_key, priority
+        )
 
-    def update(self, template_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+    def update(
+        self, template_id: str, updates: Dict[str, Any], priority: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Update a template.
 
         Args:
             template_id: ID of the template
             updates: Update parameters
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
 
         Returns:
             Success confirmation
         """
-        return self._post_dict(f"/templates/{template_id}/update", json=updates)
-
-    def delete(self, template_id: str) -> Dict[str, Any]:
+        result = self._post_dict(
+            f"/templates/{template_id}/update", json=updates, priority=priority
+        )
+        self.compiled.invalidate(template_id)
+        return result
+
+    def delete(
+        self, template_id: str, priority: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Delete a template.
 
         Args:
             template_id: ID of the template
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
 
         Returns:
             Success confirmation
         """
-        return self._post_dict(f"/templates/{template_id}/delete")
+        result = self._post_dict(f"/templates/{template_id}/delete", priority=priority)
+        self.compiled.invalidate(template_id)
+        return result
@@ -1,7 +1,8 @@
 """Volume management resource for Shadeform SDK."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+from ..catalog import VOLUME_TYPES
 from ..error import ShadeformValidationError
 from ..utils.helpers import validate_volume_size, validate_volume_type
 from .base import BaseResource
@@ -18,6 +19,8 @@ class VolumeClient(BaseResource):
         volume_type: str,
         description: Optional[str] = None,
         snapshot_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Create a new volume.
@@ -29,14 +32,24 @@ class VolumeClient(BaseResource):
             volume_type: Type of volume (e.g., 'gp3')
             description: Optional volume description
             snapshot_id: Optional snapshot ID to create from
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+            idempotency_key: Optional key identifying this operation; by
+                default it is derived from the request, so repeating an
+                identical call returns the original result
 
         Returns:
             Created volume details including id, status, and mount command
 
         Raises:
-            ShadeformValidationError: If volume size is invalid
+            ShadeformValidationError: If volume size or type is invalid; with
+                a cached volume type catalog, sizes are checked against the
+                type's bounds instead of the generic ones
         """
-        if not validate_volume_size(size_gb):
+        index = self._catalog_index()
+        if index is not None and index.volume_types is None:
+            index = None
+        if index is None and not validate_volume_size(size_gb):
             raise ShadeformValidationError(
                 f"Invalid volume size: {size_gb}GB", field="size_gb"
             )
@@ -46,6 +59,8 @@ class VolumeClient(BaseResource):
             raise ShadeformValidationError(
                 f"Invalid volume type: {volume_type}", field="volume_type"
             )
+        if index is not None:
+            index.check_volume(provider, volume_type, size_gb)
 
         payload = {
             "provider": provider,
@@ -59,54 +74,75 @@ class VolumeClient(BaseResource):
         if snapshot_id:
             payload["snapshot_id"] = snapshot_id
 
-        return self._post_dict("/volumes/create", json=payload)
+        return self._post_idempotent(
+            "/volumes/create", payload, idempotency_key, priority
+        )
 
-    def get_info(self, volume_id: str) -> Dict[str, Any]:
+    def get_info(
+        self,
+        volume_id: str,
+        priority: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
         """
         Get information about a specific volume.
 
         Args:
             volume_id: ID of the volume
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+            fields: Fields needed from a list snapshot for it to answer
+                the call (default: the snapshots' ``fields``); only used when
+                the client has ``snapshots``
 
         Returns:
             Volume details including id, name, size, attachment status,
             and hourly cost
         """
-        return self._get_dict(f"/volumes/{volume_id}/info")
+        return self._get_info("volumes", volume_id, fields, priority)
 
-    def list_all(self) -> List[Dict[str, Any]]:
+    def list_all(self, priority: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List all volumes.
 
+        Args:
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+
         Returns:
             List of volumes with basic information (id, name, status)
         """
-        # Support both direct list responses and {"volumes": [...]} format
-        response = self._make_request("GET", "/volumes", expect_list=True)
-        if isinstance(response, dict):
-            volumes = response.get("volumes", [])
-            return volumes if isinstance(volumes, list) else []
-        return response if isinstance(response, list) else []
-
-    def delete(self, volume_id: str) -> Dict[str, Any]:
+        return self._list_snapshot("volumes", "/volumes", priority)
+
+    def delete(self, volume_id: str, priority: Optional[str] = None) -> Dict[str, Any]:
         """
         Delete a volume.
 
         Args:
             volume_id: ID of the volume
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
 
         Returns:
             Success confirmation
         """
-        return self._post_dict(f"/volumes/{volume_id}/delete")
+        self._changing("volumes", volume_id)
+        return self._post_dict(f"/volumes/{volume_id}/delete", priority=priority)
 
-    def list_types(self) -> List[Dict[str, Any]]:
+    def list_types(self, priority: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List available volume types.
 
+        Args:
+            priority: Optional scheduling priority ('interactive', 'normal'
+                or 'bulk')
+
         Returns:
             List of volume types with specifications (type, max_iops,
             min/max size)
         """
-        result = self._get_list("/volumes/types")
-        return result if isinstance(result, list) else []
+
+        def load() -> List[Dict[str, Any]]:
+            return self._get_list("/volumes/types", priority=priority)
+
+        return self._cached_list(VOLUME_TYPES, load)
@@ -0,0 +1,178 @@
+"""Priority-aware request scheduling for Shadeform SDK."""
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .error import ShadeformValidationError
+
+if TYPE_CHECKING:
+    from .concurrency import AdaptiveConcurrencyLimiter
+
+INTERACTIVE = "interactive"
+NORMAL = "normal"
+BULK = "bulk"
+
+DEFAULT_WEIGHTS: Dict[str, int] = {INTERACTIVE: 16, NORMAL: 4, BULK: 1}
+
+
+class PriorityScheduler:
+    """
+    Weighted fair dispatch queue for in-flight requests.
+
+    Requests beyond ``max_in_flight`` wait in one FIFO queue per priority
+    class. When a slot frees up, the next class is chosen by stride
+    scheduling, so each backlogged class receives slots in proportion to its
+    weight: interactive calls overtake a bulk backlog without starving it.
+    A client that also has an adaptive limiter caps the slots at the
+    limiter's current limit, so requests are never admitted only to wait
+    in the limiter's queue, which knows nothing of priorities.
+
+    Example:
+        client = ShadeformClient(api_key="...", scheduler=PriorityScheduler(16))
+        client.instances.get_info(instance_id, priority="interactive")
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Union[int, Callable[[], int]] = 16,
+        weights: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_in_flight: Number of concurrent requests, or a callable
+                returning the current limit
+            weights: Relative share of slots per priority class
+
+        Raises:
+            ValueError: If a weight is not positive
+        """
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        if any(weight <= 0 for weight in self.weights.values()):
+            raise ValueError("Priority weights must be positive")
+
+        self._capacity = max_in_flight
+        # Adaptive limiter whose limit also caps the slots, set by the client
+        self.limiter: Optional["AdaptiveConcurrencyLimiter"] = None
+        self._in_flight = 0
+        self._queues: Dict[str, Deque[threading.Event]] = {
+            name: deque() for name in self.weights
+        }
+        # Virtual finish time per class for stride scheduling
+        self._passes: Dict[str, float] = {name: 0.0 for name in self.weights}
+        self._clock = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Return the current number of in-flight slots."""
+        capacity = self._capacity() if callable(self._capacity) else self._capacity
+        if self.limiter is not None:
+            capacity = min(capacity, self.limiter.limit)
+        return max(1, capacity)
+
+    def validate(self, priority: str) -> str:
+        """
+        Check that a priority class is known.
+
+        Args:
+            priority: Priority class name
+
+        Returns:
+            The priority class
+
+        Raises:
+            ShadeformValidationError: If the class is unknown
+        """
+        if priority not in self.weights:
+            raise ShadeformValidationError(
+                f"Unknown priority {priority!r}, expected one of "
+                f"{', '.join(sorted(self.weights))}",
+                field="priority",
+            )
+        return priority
+
+    def acquire(self, priority: str = NORMAL) -> None:
+        """
+        Wait for an in-flight slot.
+
+        Args:
+            priority: Priority class of the request
+        """
+        self.validate(priority)
+        with self._lock:
+            if self._in_flight < self.capacity and not any(self._queues.values()):
+                self._in_flight += 1
+                return
+            if not self._queues[priority]:
+                # A class returning from idle must not reuse stale credit
+                self._passes[priority] = max(self._passes[priority], self._clock)
+            ticket = threading.Event()
+            self._queues[priority].append(ticket)
+            self._dispatch()
+        ticket.wait()
+
+    def release(self) -> None:
+        """Release an in-flight slot and hand it to the next waiter."""
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self.capacity:
+            backlogged = [name for name, queue in self._queues.items() if queue]
+            if not backlogged:
+                return
+            chosen = min(backlogged, key=lambda name: self._passes[name])
+            self._clock = self._passes[chosen]
+            self._passes[chosen] += 1.0 / self.weights[chosen]
+            self._in_flight += 1
+            self._queues[chosen].popleft().set()
+
+    @contextmanager
+    def slot(self, priority: str = NORMAL) -> Iterator[None]:
+        """
+        Hold an in-flight slot for the duration of a block.
+
+        Args:
+            priority: Priority class of the request
+        """
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        Pickle the scheduler configuration.
+
+        A callable ``max_in_flight`` must itself be picklable.
+        """
+        return (PriorityScheduler, (self._capacity, self.weights))
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        Return the scheduler metrics.
+
+        Returns:
+            Dictionary with capacity, in_flight and per-class queue depths
+        """
+        with self._lock:
+            metrics = {"capacity": self.capacity, "in_flight": self._in_flight}
+            for name, queue in self._queues.items():
+                metrics[f"queued_{name}"] = len(queue)
+            return metrics
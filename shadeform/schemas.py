@@ -0,0 +1,225 @@
+"""Typed schemas of Shadeform API request payloads and responses."""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from typing_extensions import Literal, NotRequired, TypedDict
+
+# Requests
+
+
+class LaunchConfigurationSchema(TypedDict):
+    """Launch configuration of an instance or template."""
+
+    type: Literal["docker", "script"]
+
+
+class VolumeMountSchema(TypedDict):
+    """Volume attached to a new instance."""
+
+    volume_id: NotRequired[str]
+
+
+class InstanceCreateRequest(TypedDict):
+    """Payload of ``POST /instances/create``."""
+
+    provider: str
+    name: str
+    region: str
+    instance_type: str
+    launch_configuration: LaunchConfigurationSchema
+    ssh_key_id: NotRequired[str]
+    volumes: NotRequired[List[VolumeMountSchema]]
+
+
+class InstanceUpdateRequest(TypedDict):
+    """Payload of ``POST /instances/{id}/update``."""
+
+    name: NotRequired[str]
+
+
+class VolumeCreateRequest(TypedDict):
+    """Payload of ``POST /volumes/create``."""
+
+    provider: str
+    name: str
+    size_gb: int
+    volume_type: str
+    description: NotRequired[str]
+    snapshot_id: NotRequired[str]
+
+
+class SSHKeyAddRequest(TypedDict):
+    """Payload of ``POST /sshkeys/add``."""
+
+    name: str
+    public_key: str
+    description: NotRequired[str]
+
+
+class TemplateSaveRequest(TypedDict):
+    """Payload of ``POST /templates/save``."""
+
+    name: str
+    launch_configuration: LaunchConfigurationSchema
+    description: NotRequired[str]
+
+
+class TemplateUpdateRequest(TypedDict):
+    """Payload of ``POST /templates/{id}/update``."""
+
+    name: NotRequired[str]
+    description: NotRequired[str]
+    launch_configuration: NotRequired[LaunchConfigurationSchema]
+
+
+# Responses
+
+
+class CreatedResponse(TypedDict):
+    """Response of a create call."""
+
+    id: str
+    status: NotRequired[str]
+
+
+class ActionResponse(TypedDict):
+    """Response of an update, delete, restart or set-default call."""
+
+    success: NotRequired[bool]
+    status: NotRequired[str]
+
+
+class InstanceSchema(TypedDict):
+    """Instance details."""
+
+    id: str
+    name: NotRequired[Optional[str]]
+    status: NotRequired[str]
+
+
+class VolumeSchema(TypedDict):
+    """Volume details."""
+
+    id: str
+    name: NotRequired[Optional[str]]
+    status: NotRequired[str]
+
+
+class SSHKeySchema(TypedDict):
+    """SSH key details."""
+
+    id: str
+    name: NotRequired[str]
+    is_default: NotRequired[bool]
+
+
+class TemplateSchema(TypedDict):
+    """Template details."""
+
+    id: str
+    name: NotRequired[str]
+
+
+class RegionAvailabilitySchema(TypedDict):
+    """Availability of an instance type in one region."""
+
+    region: str
+    available: bool
+
+
+class InstanceTypeSchema(TypedDict):
+    """Catalog entry of an instance type."""
+
+    provider: str
+    type: NotRequired[str]
+    instance_type: NotRequired[str]
+    hourly_price: NotRequired[float]
+    availability: NotRequired[List[RegionAvailabilitySchema]]
+
+
+class VolumeTypeSchema(TypedDict):
+    """Catalog entry of a volume type."""
+
+    provider: NotRequired[str]
+    name: NotRequired[str]
+
+
+class InstanceListing(TypedDict):
+    """Wrapped listing of instances."""
+
+    instances: List[InstanceSchema]
+
+
+class VolumeListing(TypedDict):
+    """Wrapped listing of volumes."""
+
+    volumes: List[VolumeSchema]
+
+
+class SSHKeyListing(TypedDict):
+    """Wrapped listing of SSH keys."""
+
+    ssh_keys: List[SSHKeySchema]
+
+
+class TemplateListing(TypedDict):
+    """Wrapped listing of templates."""
+
+    templates: List[TemplateSchema]
+
+
+class FeaturedListing(TypedDict):
+    """Wrapped listing of featured templates."""
+
+    featured: List[TemplateSchema]
+
+
+class InstanceTypeListing(TypedDict):
+    """Wrapped listing of instance types."""
+
+    instance_types: List[InstanceTypeSchema]
+
+
+class VolumeTypeListing(TypedDict):
+    """Wrapped listing of volume types."""
+
+    volume_types: List[VolumeTypeSchema]
+
+
+# (method, endpoint template) -> schema of the JSON payload
+REQUEST_SCHEMAS: Dict[Tuple[str, str], Any] = {
+    ("POST", "/instances/create"): InstanceCreateRequest,
+    ("POST", "/instances/{id}/update"): InstanceUpdateRequest,
+    ("POST", "/volumes/create"): VolumeCreateRequest,
+    ("POST", "/sshkeys/add"): SSHKeyAddRequest,
+    ("POST", "/templates/save"): TemplateSaveRequest,
+    ("POST", "/templates/{id}/update"): TemplateUpdateRequest,
+}
+
+# (method, endpoint template) -> schema of the response; listings may be
+# bare lists or wrapped in an object
+RESPONSE_SCHEMAS: Dict[Tuple[str, str], Any] = {
+    ("GET", "/instances"): Union[InstanceListing, List[InstanceSchema]],
+    ("GET", "/instances/{id}/info"): InstanceSchema,
+    ("GET", "/instances/types"): Union[InstanceTypeListing, List[InstanceTypeSchema]],
+    ("POST", "/instances/create"): CreatedResponse,
+    ("POST", "/instances/{id}/update"): ActionResponse,
+    ("POST", "/instances/{id}/delete"): ActionResponse,
+    ("POST", "/instances/{id}/restart"): ActionResponse,
+    ("GET", "/volumes"): Union[VolumeListing, List[VolumeSchema]],
+    ("GET", "/volumes/{id}/info"): VolumeSchema,
+    ("GET", "/volumes/types"): Union[VolumeTypeListing, List[VolumeTypeSchema]],
+    ("POST", "/volumes/create"): CreatedResponse,
+    ("POST", "/volumes/{id}/delete"): ActionResponse,
+    ("GET", "/sshkeys"): Union[SSHKeyListing, List[SSHKeySchema]],
+    ("GET", "/sshkeys/{id}/info"): SSHKeySchema,
+    ("POST", "/sshkeys/add"): CreatedResponse,
+    ("POST", "/sshkeys/{id}/setdefault"): ActionResponse,
+    ("POST", "/sshkeys/{id}/delete"): ActionResponse,
+    ("GET", "/templates"): Union[TemplateListing, List[TemplateSchema]],
+    ("GET", "/templates/featured"): Union[FeaturedListing, List[TemplateSchema]],
+    ("GET", "/templates/{id}/info"): TemplateSchema,
+    ("POST", "/templates/save"): CreatedResponse,
+    ("POST", "/templates/{id}/update"): ActionResponse,
+    ("POST", "/templates/{id}/delete"): ActionResponse,
+}
@@ -0,0 +1,149 @@
+"""Read-through snapshots of list responses for Shadeform SDK."""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+INSTANCES = "instances"
+VOLUMES = "volumes"
+
+
+class ListSnapshots:
+    """
+    Serve ``get_info`` from the latest ``list_all`` response.
+
+    When a client has list snapshots, every ``instances.list_all()`` and
+    ``volumes.list_all()`` response is indexed by id. While that snapshot is
+    younger than ``max_age``, ``get_info(id)`` is answered from it if the
+    listed record has all the required fields; misses and records lacking a
+    field fall through to the ``/info`` endpoint. Updates, restarts and
+    deletes drop the affected record.
+
+    The list view has fewer fields than ``/info``, so ``fields`` should name
+    the ones a status loop actually reads.
+
+    Example:
+        client = ShadeformClient(api_key="...", snapshots=ListSnapshots(max_age=5))
+        for instance in client.instances.list_all():
+            ...
+        client.instances.get_info(instance_id)  # no request
+    """
+
+    def __init__(
+        self, max_age: float = 2.0, fields: Sequence[str] = ("id", "status")
+    ) -> None:
+        """
+        Initialize the snapshots.
+
+        Args:
+            max_age: Seconds a list response answers ``get_info`` calls
+            fields: Fields a listed record needs to answer ``get_info``
+
+        Raises:
+            ValueError: If max_age is negative
+        """
+        if max_age < 0:
+            raise ValueError("max_age must be non-negative")
+        self.max_age = max_age
+        self.fields = tuple(fields)
+        # Collection -> (taken at, records by id)
+        self._snapshots: Dict[str, Tuple[float, Dict[str, Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def put(
+        self,
+        collection: str,
+        records: Iterable[Dict[str, Any]],
+        taken_at: Optional[float] = None,
+    ) -> None:
+        """
+        Replace a collection's snapshot with a fresh listing.
+
+        Args:
+            collection: Collection name ('instances' or 'volumes')
+            records: Records from ``list_all``
+            taken_at: ``time.monotonic()`` when the listing was requested
+                (default: now)
+        """
+        taken_at = time.monotonic() if taken_at is None else taken_at
+        index = {str(r["id"]): r for r in records if "id" in r}
+        with self._lock:
+            current = self._snapshots.get(collection)
+            # A slow listing must not replace a newer one
+            if current is None or current[0] <= taken_at:
+                self._snapshots[collection] = (taken_at, index)
+
+    def get(
+        self,
+        collection: str,
+        resource_id: str,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a record in a fresh snapshot.
+
+        Args:
+            collection: Collection name
+            resource_id: ID of the resource
+            fields: Required fields (default: the snapshots' ``fields``)
+
+        Returns:
+            A copy of the listed record, or None on a miss
+        """
+        required = self.fields if fields is None else fields
+        with self._lock:
+            snapshot = self._snapshots.get(collection)
+            record = None
+            if snapshot is not None and time.monotonic() - snapshot[0] <= self.max_age:
+                record = snapshot[1].get(str(resource_id))
+            if record is None or any(f not in record for f in required):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(record)
+
+    def discard(self, collection: str, resource_id: str) -> None:
+        """
+        Drop one record whose state is about to change.
+
+        Args:
+            collection: Collection name
+            resource_id: ID of the resource
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(collection)
+            if snapshot is not None:
+                snapshot[1].pop(str(resource_id), None)
+
+    def invalidate(self, collection: Optional[str] = None) -> None:
+        """
+        Drop one collection's snapshot, or all of them.
+
+        Args:
+            collection: Collection name, or None to drop every snapshot
+        """
+        with self._lock:
+            if collection is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(collection, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit and miss counts and the age of each snapshot.
+
+        Returns:
+            Dict with hits, misses and per-collection ages in seconds
+        """
+        now = time.monotonic()
+        with self._lock:
+            ages: Dict[str, float] = {
+                name: now - taken for name, (taken, _) in self._snapshots.items()
+            }
+            return {"hits": self.hits, "misses": self.misses, "ages": ages}
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the configuration without the snapshots."""
+        return (ListSnapshots, (self.max_age, list(self.fields)))
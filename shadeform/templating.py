@@ -0,0 +1,315 @@
+"""Launch templates compiled once and rendered by splicing values into JSON."""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from json.encoder import encode_basestring_ascii
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple, cast
+
+from .error import ShadeformValidationError
+
+if TYPE_CHECKING:
+    from .resources.templates import TemplateClient
+
+# {{ name }}; braces survive JSON encoding unescaped, so placeholders are
+# found in the encoded skeleton itself
+PLACEHOLDER = re.compile(r'("?)\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}("?)')
+
+# (placeholder name, whole JSON value?)
+Slot = Tuple[str, bool]
+
+
+def _check_keys(value: Any) -> None:
+    """Reject placeholders in object keys, which must stay strings."""
+    if isinstance(value, Mapping):
+        for key, item in value.items():
+            if PLACEHOLDER.search(str(key)):
+                raise ShadeformValidationError(
+                    f"Placeholders are only allowed in values, not in key {key!r}",
+                    field=str(key),
+                )
+            _check_keys(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _check_keys(item)
+
+
+class RenderedConfig(bytes):
+    """
+    Canonical JSON of a launch configuration rendered from a template.
+
+    Only ``CompiledTemplate.render_json`` makes these, so ``LaunchBatch``
+    can send them as they are: the launch type was checked when the
+    template was compiled and the encoding is the one ``instances.create``
+    uses.
+    """
+
+    __slots__ = ()
+
+
+def template_version(info: Mapping[str, Any]) -> Optional[str]:
+    """
+    Return the version of a template as reported by the API.
+
+    Args:
+        info: Template details from ``templates.get_info``
+
+    Returns:
+        The template's version, else its update time, else None
+    """
+    for field in ("version", "updated_at"):
+        value = info.get(field)
+        if value is not None:
+            return str(value)
+    return None
+
+
+class CompiledTemplate:
+    """
+    A template's launch configuration compiled for fast rendering.
+
+    The configuration is encoded once into canonical JSON and split at its
+    ``{{ name }}`` placeholders. Rendering joins the pre-encoded pieces
+    with the encoded values, so no dicts are built or walked per job, and
+    the result is byte-for-byte what ``instances.create`` would encode for
+    the equivalent dict.
+
+    A placeholder that is a whole string value, such as ``"{{ ports }}"``,
+    is replaced by the JSON encoding of any value. A placeholder inside a
+    longer string, such as ``"pytorch/pytorch:{{ tag }}"``, takes a string
+    or number, spliced into the string.
+
+    Example:
+        compiled = client.templates.compile(template_id)
+        config = compiled.render_json(tag="2.3", run_id="job-17")
+    """
+
+    def __init__(
+        self,
+        launch_configuration: Mapping[str, Any],
+        template_id: Optional[str] = None,
+        version: Optional[str] = None,
+    ) -> None:
+        """
+        Compile a launch configuration.
+
+        Args:
+            launch_configuration: Launch configuration holding placeholders
+            template_id: ID of the template it came from
+            version: Version of the template it came from
+
+        Raises:
+            ShadeformValidationError: If the configuration has no valid
+                launch type, or an object key holds a placeholder
+        """
+        if launch_configuration.get("type") not in ("docker", "script"):
+            raise ShadeformValidationError(
+                "Launch configuration type must be one of ('docker', 'script')",
+                field="launch_configuration",
+            )
+        _check_keys(launch_configuration)
+        self.template_id = template_id
+        self.version = version
+        skeleton = json.dumps(
+            launch_configuration, sort_keys=True, separators=(",", ":")
+        )
+        self._parts: List[str] = []
+        self._slots: List[Slot] = []
+        position = 0
+        for match in PLACEHOLDER.finditer(skeleton):
+            opening, name, closing = match.groups()
+            start, end = match.span()
+            # A quote after a backslash is part of the string, not its end
+            whole = bool(opening and closing) and skeleton[start - 1] in ":,[{"
+            if not whole:
+                # Keep the quote next to a placeholder inside a string
+                start += len(opening)
+                end -= len(closing)
+            self._parts.append(skeleton[position:start])
+            self._slots.append((name, whole))
+            position = end
+        self._parts.append(skeleton[position:])
+        self.placeholders = frozenset(name for name, _ in self._slots)
+
+    def _encode(self, name: str, whole: bool, value: Any) -> str:
+        if whole:
+            if isinstance(value, str):
+                return encode_basestring_ascii(value)
+            return json.dumps(value, sort_keys=True, separators=(",", ":"))
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ShadeformValidationError(
+                f"Placeholder inside a string needs a string or number, "
+                f"got {type(value).__name__}",
+                field=name,
+            )
+        return encode_basestring_ascii(str(value))[1:-1]
+
+    def render_json(
+        self, values: Optional[Mapping[str, Any]] = None, **kwargs: Any
+    ) -> RenderedConfig:
+        """
+        Render the launch configuration as encoded JSON.
+
+        Args:
+            values: Placeholder values
+            **kwargs: More placeholder values
+
+        Returns:
+            Canonical JSON of the launch configuration, which ``LaunchBatch``
+            accepts as a launch configuration as is
+
+        Raises:
+            ShadeformValidationError: If a placeholder has no value, a value
+                names no placeholder, or a value cannot go inside a string
+        """
+        if values:
+            kwargs = dict(values, **kwargs)
+        if kwargs.keys() != self.placeholders:
+            missing = sorted(self.placeholders - kwargs.keys())
+            if missing:
+                raise ShadeformValidationError(
+                    f"No value for placeholder {missing[0]}", field=missing[0]
+                )
+            unknown = sorted(kwargs.keys() - self.placeholders)
+            raise ShadeformValidationError(
+                f"Unknown placeholder {unknown[0]}", field=unknown[0]
+            )
+        parts = self._parts
+        out = [parts[0]]
+        for position, (name, whole) in enumerate(self._slots, 1):
+            out.append(self._encode(name, whole, kwargs[name]))
+            out.append(parts[position])
+        return RenderedConfig("".join(out).encode())
+
+    def render(
+        self, values: Optional[Mapping[str, Any]] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Render the launch configuration as a dict.
+
+        Args:
+            values: Placeholder values
+            **kwargs: More placeholder values
+
+        Returns:
+            Launch configuration for ``instances.create``
+
+        Raises:
+            ShadeformValidationError: As for ``render_json``
+        """
+        return cast(Dict[str, Any], json.loads(self.render_json(values, **kwargs)))
+
+    def __repr__(self) -> str:
+        return (
+            f"CompiledTemplate(template_id={self.template_id!r}, "
+            f"version={self.version!r}, placeholders={sorted(self.placeholders)!r})"
+        )
+
+
+class TemplateCache:
+    """
+    Compiled templates, keyed by template ID and version.
+
+    A template is fetched and compiled the first time it is asked for.
+    Asking for a version other than the cached one fetches the template
+    again, and a template updated or deleted through the same client is
+    dropped, so templates without a version are not served stale.
+    """
+
+    def __init__(self, templates: "TemplateClient", max_size: int = 256) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            templates: Template client used to fetch templates
+            max_size: Most compiled templates to keep; the least recently
+                used is dropped first
+        """
+        self.templates = templates
+        self.max_size = max_size
+        self._compiled: "OrderedDict[Tuple[str, Optional[str]], CompiledTemplate]"
+        self._compiled = OrderedDict()
+        # Template ID -> version last fetched
+        self._latest: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(
+        self,
+        template_id: str,
+        version: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> CompiledTemplate:
+        """
+        Return a compiled template, fetching it if it is not cached.
+
+        Args:
+            template_id: ID of the template
+            version: Version required (default: the version last fetched)
+            priority: Optional scheduling priority of the fetch
+
+        Returns:
+            The compiled template
+
+        Raises:
+            ShadeformValidationError: If the template is at another version
+                than the one required, or has no launch configuration
+        """
+        with self._lock:
+            key = (template_id, version)
+            if version is None and template_id in self._latest:
+                key = (template_id, self._latest[template_id])
+            compiled = self._compiled.get(key)
+            if compiled is not None:
+                self._compiled.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        info = self.templates.get_info(template_id, priority=priority)
+        fetched = template_version(info)
+        if version is not None and fetched != version:
+            raise ShadeformValidationError(
+                f"Template {template_id} is at version {fetched}, not {version}",
+                field="version",
+            )
+        config = info.get("launch_configuration")
+        if not isinstance(config, Mapping):
+            raise ShadeformValidationError(
+                f"Template {template_id} has no launch configuration",
+                field="launch_configuration",
+            )
+        compiled = CompiledTemplate(config, template_id, fetched)
+        with self._lock:
+            self._compiled[(template_id, fetched)] = compiled
+            self._latest[template_id] = fetched
+            while len(self._compiled) > self.max_size:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def invalidate(self, template_id: Optional[str] = None) -> None:
+        """
+        Drop compiled templates.
+
+        Args:
+            template_id: Template to drop (default: all)
+        """
+        with self._lock:
+            if template_id is None:
+                self._compiled.clear()
+                self._latest.clear()
+                return
+            self._latest.pop(template_id, None)
+            for key in [k for k in self._compiled if k[0] == template_id]:
+                del self._compiled[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cache hit and miss counts.
+
+        Returns:
+            Dict with hits, misses and size
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._compiled)}
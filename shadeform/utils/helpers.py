@@ -1,6 +1,17 @@
 """Helper utilities for Shadeform SDK."""
 
-from typing import Any, Dict, List, Optional
+import re
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from typing_extensions import TypeGuard
+
+# Matches resource paths of the form /<collection>/<id>/<action>
+_ID_PATH_PATTERN = re.compile(r"^/?([^/]+)/[^/]+/([^/]+)/?$")
+# <gpu>_<memory and interconnect>x<count>, e.g. H100_80G_SXM5x8
+_INSTANCE_TYPE_PATTERN = re.compile(r"^[A-Za-z0-9]+_[A-Za-z0-9_.-]+x[1-9][0-9]*$")
+_VOLUME_TYPE_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
 
 
 class LaunchConfiguration:
@@ -76,33 +87,18 @@ def validate_instance_type(instance_type: str) -> bool:
     """
     Validate that an instance type string is properly formatted.
 
+    Whether the type exists is checked against the instance type catalog
+    (see ``CatalogIndex``), not here, so new GPU types need no SDK release.
+
     Args:
         instance_type: Instance type string (e.g., 'A100_80Gx1')
 
     Returns:
         True if valid, False otherwise
     """
-    # Basic format check
-    if not instance_type or "_" not in instance_type:
-        return False
-
-    # Split into components
-    try:
-        gpu_type, config = instance_type.split("_", 1)
-        specs, count = config.rsplit("x", 1)
-
-        # Validate count is a positive integer
-        if not count.isdigit() or int(count) < 1:
-            return False
-
-        # Known GPU types (can be expanded)
-        valid_gpu_types = ["A100", "A10", "V100", "T4"]
-        if gpu_type not in valid_gpu_types:
-            return False
-
-        return True
-    except ValueError:
-        return False
+    return (
+        bool(instance_type) and _INSTANCE_TYPE_PATTERN.match(instance_type) is not None
+    )
 
 
 def validate_volume_size(size_gb: int) -> bool:
@@ -123,7 +119,10 @@ def validate_volume_size(size_gb: int) -> bool:
 
 def validate_volume_type(volume_type: str) -> bool:
     """
-    Validate that a volume type is supported.
+    Validate that a volume type string is properly formatted.
+
+    Whether the type exists is checked against the volume type catalog (see
+    ``CatalogIndex``), not here.
 
     Args:
         volume_type: Volume type string (e.g., 'gp3', 'io2')
@@ -131,6 +130,73 @@ def validate_volume_type(volume_type: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    # List of known volume types (can be expanded)
-    valid_volume_types = ["gp3", "io2", "standard", "st1", "sc1"]
-    return volume_type in valid_volume_types
+    return bool(volume_type) and _VOLUME_TYPE_PATTERN.match(volume_type) is not None
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Normalize an endpoint path to its template form.
+
+    Resource identifiers are replaced with a placeholder so that per-endpoint
+    statistics are shared across all resources of the same kind.
+
+    Args:
+        endpoint: API endpoint path (e.g., '/instances/abc-123/info')
+
+    Returns:
+        Endpoint template (e.g., '/instances/{id}/info')
+    """
+    match = _ID_PATH_PATTERN.match(endpoint)
+    if match:
+        return f"/{match.group(1)}/{{id}}/{match.group(2)}"
+    return f"/{endpoint.strip('/')}"
+
+
+def idempotency_key(method: str, endpoint: str, payload: Any = None) -> str:
+    """
+    Derive a deterministic idempotency key for an API call.
+
+    The same method, endpoint and JSON payload always give the same key, so
+    a retried or repeated call is recognized as the same operation.
+
+    Args:
+        method: HTTP method
+        endpoint: API endpoint path
+        payload: JSON payload, if any
+
+    Returns:
+        32-character hex key
+    """
+    import hashlib
+    import json
+
+    canonical = json.dumps(
+        [method.upper(), endpoint, payload], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def is_json_object(value: Any) -> "TypeGuard[Mapping[str, Any]]":
+    """
+    Check whether a response value is a JSON object.
+
+    Args:
+        value: Decoded response value (a dict, or a lazy object)
+
+    Returns:
+        True for dicts and other mappings
+    """
+    return isinstance(value, Mapping)
+
+
+def is_json_array(value: Any) -> "TypeGuard[Sequence[Any]]":
+    """
+    Check whether a response value is a JSON array.
+
+    Args:
+        value: Decoded response value (a list, or a lazy array)
+
+    Returns:
+        True for lists and other sequences except strings
+    """
+    return isinstance(value, Sequence) and not isinstance(value, (str, bytes))
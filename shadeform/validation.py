@@ -0,0 +1,151 @@
+"""Compiled schema validation of requests and responses for Shadeform SDK."""
+
+import itertools
+import threading
+from typing import Any, Dict, Tuple
+
+from .error import ShadeformConfigurationError, ShadeformValidationError
+from .schemas import REQUEST_SCHEMAS, RESPONSE_SCHEMAS
+from .utils.helpers import endpoint_template
+
+STRICT = "strict"
+SAMPLED = "sampled"
+OFF = "off"
+MODES = (STRICT, SAMPLED, OFF)
+
+
+class SchemaValidator:
+    """
+    Validate request payloads and responses against compiled schemas.
+
+    Each endpoint's schema in ``shadeform.schemas`` is compiled into a
+    pydantic ``TypeAdapter`` the first time it is needed. Validation is
+    strict: values are not coerced, so a string where an integer is expected
+    is an error. Fields the schemas do not name are not checked.
+
+    Modes:
+        strict: Validate every request payload and every response
+        sampled: Validate every request payload and one in ``sample_rate``
+            responses, to catch API drift at a bounded cost in production
+        off: Validate nothing
+
+    Example:
+        client = ShadeformClient(api_key="...", validation=SchemaValidator("sampled"))
+    """
+
+    def __init__(self, mode: str = STRICT, sample_rate: int = 100) -> None:
+        """
+        Initialize the validator.
+
+        Args:
+            mode: 'strict', 'sampled' or 'off'
+            sample_rate: In sampled mode, validate one in this many responses
+
+        Raises:
+            ValueError: If mode is unknown or sample_rate is not positive
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        if sample_rate < 1:
+            raise ValueError("sample_rate must be at least 1")
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self._adapters: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+        self._responses = itertools.count()
+        self.checked = 0
+        self.skipped = 0
+        self.failures = 0
+
+    def _adapter(self, schema: Any) -> Any:
+        """Return the compiled validator of a schema."""
+        adapter = self._adapters.get(schema)
+        if adapter is None:
+            try:
+                from pydantic import TypeAdapter
+            except ImportError:
+                raise ShadeformConfigurationError(
+                    "Schema validation requires pydantic>=2", "validation"
+                ) from None
+            with self._lock:
+                adapter = self._adapters.get(schema)
+                if adapter is None:
+                    adapter = TypeAdapter(schema)
+                    self._adapters[schema] = adapter
+        return adapter
+
+    def _validate(self, schema: Any, value: Any, what: str) -> None:
+        """Validate one value, raising ShadeformValidationError on failure."""
+        from pydantic import ValidationError
+
+        self.checked += 1
+        raw = getattr(value, "raw", None)
+        try:
+            if isinstance(raw, bytes):
+                # Lazy responses are validated from their encoded JSON
+                self._adapter(schema).validate_json(raw, strict=True)
+            else:
+                self._adapter(schema).validate_python(value, strict=True)
+        except ValidationError as error:
+            self.failures += 1
+            first = error.errors()[0]
+            field = ".".join(str(part) for part in first["loc"]) or None
+            raise ShadeformValidationError(f"{what}: {first['msg']}", field=field)
+
+    def check_request(self, method: str, endpoint: str, payload: Any) -> None:
+        """
+        Validate the JSON payload of a request.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            payload: JSON payload, or None if the request has none
+
+        Raises:
+            ShadeformValidationError: If the payload does not match its schema
+        """
+        if self.mode == OFF or payload is None:
+            return
+        key = (method.upper(), endpoint_template(endpoint))
+        schema = REQUEST_SCHEMAS.get(key)
+        if schema is not None:
+            self._validate(schema, payload, f"Invalid {key[0]} {key[1]} payload")
+
+    def check_response(self, method: str, endpoint: str, response: Any) -> None:
+        """
+        Validate a response, or skip it when sampling.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            response: Decoded response, or None for empty responses
+
+        Raises:
+            ShadeformValidationError: If the response does not match its schema
+        """
+        if self.mode == OFF or response is None:
+            return
+        if self.mode == SAMPLED and next(self._responses) % self.sample_rate:
+            self.skipped += 1
+            return
+        key = (method.upper(), endpoint_template(endpoint))
+        schema = RESPONSE_SCHEMAS.get(key)
+        if schema is not None:
+            self._validate(schema, response, f"Invalid {key[0]} {key[1]} response")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return how many values were checked, skipped by sampling, and invalid.
+
+        Returns:
+            Dict with checked, skipped and failures counts
+        """
+        return {
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "failures": self.failures,
+        }
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the configuration without compiled adapters."""
+        return (SchemaValidator, (self.mode, self.sample_rate))
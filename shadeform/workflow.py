@@ -0,0 +1,221 @@
+"""Dependency-aware workflow execution for multi-step provisioning."""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .error import ShadeformError, ShadeformWorkflowError
+
+logger = logging.getLogger(__name__)
+
+StepFunction = Callable[[Dict[str, Any]], Any]
+Compensation = Callable[[Any], Any]
+
+# Statuses after which a resource will never become ready
+FAILED_STATUSES = ("error", "failed", "deleted")
+
+
+class Step:
+    """A named unit of work with dependencies and an optional undo."""
+
+    def __init__(
+        self,
+        name: str,
+        fn: StepFunction,
+        after: Sequence[str] = (),
+        compensate: Optional[Compensation] = None,
+    ) -> None:
+        """
+        Initialize the step.
+
+        Args:
+            name: Unique step name
+            fn: Callable receiving the results of its dependencies by name
+            after: Names of steps that must finish first
+            compensate: Callable receiving this step's result, run to undo
+                the step if the workflow fails
+        """
+        self.name = name
+        self.fn = fn
+        self.after = list(after)
+        self.compensate = compensate
+
+
+class Workflow:
+    """
+    Run provisioning steps as a DAG.
+
+    Each step starts as soon as the steps it depends on have finished, so
+    independent branches run in parallel and the total time is that of the
+    critical path. A step receives the results of its dependencies, e.g. a
+    volume id for the instance payload. If a step fails, no new steps start;
+    once running steps finish, completed steps are compensated in reverse
+    order of completion and a ``ShadeformWorkflowError`` is raised.
+
+    Example:
+        flow = Workflow()
+        flow.step("key", lambda r: client.ssh_keys.add("ops", public_key),
+                  compensate=lambda key: client.ssh_keys.delete(key["id"]))
+        flow.step("volume", lambda r: client.volumes.create("aws", "data", 100, "gp3"),
+                  compensate=lambda vol: client.volumes.delete(vol["id"]))
+        flow.step("instance", lambda r: client.instances.create(
+                      "aws", "job", "us-west-2", "A100_80Gx1", launch,
+                      ssh_key_id=r["key"]["id"],
+                      volumes=[VolumeConfiguration.create_attachment(
+                          r["volume"]["id"], "/mnt/data")]),
+                  after=["key", "volume"],
+                  compensate=lambda inst: client.instances.delete(inst["id"]))
+        results = flow.run()
+    """
+
+    def __init__(self, max_workers: int = 8) -> None:
+        """
+        Initialize an empty workflow.
+
+        Args:
+            max_workers: Maximum number of steps running at once
+        """
+        self.max_workers = max_workers
+        self.steps: Dict[str, Step] = {}
+        # Seconds from the start of the run until each step finished
+        self.timings: Dict[str, float] = {}
+
+    def step(
+        self,
+        name: str,
+        fn: StepFunction,
+        after: Iterable[str] = (),
+        compensate: Optional[Compensation] = None,
+    ) -> str:
+        """
+        Add a step.
+
+        Dependencies must be added first, which keeps the graph acyclic.
+
+        Args:
+            name: Unique step name
+            fn: Callable receiving a dict of dependency results by name
+            after: Names of steps that must finish first
+            compensate: Callable undoing the step, given its result
+
+        Returns:
+            The step name, for use in later ``after`` lists
+
+        Raises:
+            ValueError: If the name is taken or a dependency is unknown
+        """
+        after = list(after)
+        if name in self.steps:
+            raise ValueError(f"Duplicate step {name!r}")
+        unknown = [dependency for dependency in after if dependency not in self.steps]
+        if unknown:
+            raise ValueError(f"Step {name!r} depends on unknown step {unknown[0]!r}")
+        self.steps[name] = Step(name, fn, after, compensate)
+        return name
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every step in dependency order.
+
+        Returns:
+            Results of all steps by name
+
+        Raises:
+            ShadeformWorkflowError: If a step fails; completed steps have been
+                compensated by then
+        """
+        results: Dict[str, Any] = {}
+        completed: List[str] = []
+        remaining = {name: set(step.after) for name, step in self.steps.items()}
+        running: Dict[Future, str] = {}
+        failure: Optional[ShadeformWorkflowError] = None
+        start = time.monotonic()
+        self.timings = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="shadeform-workflow"
+        ) as executor:
+            while True:
+                if failure is None:
+                    for name in [n for n, deps in remaining.items() if not deps]:
+                        del remaining[name]
+                        step = self.steps[name]
+                        inputs = {dep: results[dep] for dep in step.after}
+                        running[executor.submit(step.fn, inputs)] = name
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        if failure is None:
+                            failure = ShadeformWorkflowError(
+                                str(error), step=name, cause=error
+                            )
+                        continue
+                    results[name] = future.result()
+                    completed.append(name)
+                    self.timings[name] = time.monotonic() - start
+                    for deps in remaining.values():
+                        deps.discard(name)
+
+        if failure is not None:
+            failure.compensation_errors = self._compensate(completed, results)
+            raise failure from failure.cause
+        return results
+
+    def _compensate(
+        self, completed: List[str], results: Dict[str, Any]
+    ) -> Dict[str, BaseException]:
+        """Undo completed steps, most recent first."""
+        errors: Dict[str, BaseException] = {}
+        for name in reversed(completed):
+            compensate = self.steps[name].compensate
+            if compensate is None:
+                continue
+            try:
+                compensate(results[name])
+            except Exception as error:
+                logger.exception("Compensation for step %s failed", name)
+                errors[name] = error
+        return errors
+
+
+def wait_for_status(
+    fetch: Callable[[], Dict[str, Any]],
+    status: str = "active",
+    timeout: float = 600.0,
+    interval: float = 5.0,
+) -> Dict[str, Any]:
+    """
+    Poll a resource until it reaches a status.
+
+    Args:
+        fetch: Zero-argument callable returning the resource, e.g.
+            ``lambda: client.instances.get_info(instance_id)``
+        status: Status to wait for
+        timeout: Maximum time to wait in seconds
+        interval: Delay between polls in seconds
+
+    Returns:
+        The resource once it has the status
+
+    Raises:
+        ShadeformError: If the resource fails or the timeout passes
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        resource = fetch()
+        current = resource.get("status")
+        if current == status:
+            return resource
+        if current in FAILED_STATUSES:
+            raise ShadeformError(f"Resource entered status {current!r}")
+        if time.monotonic() + interval > deadline:
+            raise ShadeformError(
+                f"Timed out after {timeout}s waiting for status {status!r} "
+                f"(last status {current!r})"
+            )
+        time.sleep(interval)
@@ -0,0 +1,369 @@
+"""
+Local stand-in for the Shadeform API used by tests and benchmarks.
+
+The stand-in keeps instances, volumes, SSH keys and templates in memory and
+serves them over HTTP on a random local port. Latency and faults can be
+injected per request to exercise the client's resilience features.
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl
+
+DEFAULT_INSTANCE_TYPES: List[Dict[str, Any]] = [
+    {
+        "type": "A100_80Gx1",
+        "provider": "aws",
+        "memory_gb": 80,
+        "vCPUs": 12,
+        "hourly_price": 3.50,
+        "availability": [
+            {"region": "us-west-2", "available": True},
+            {"region": "us-east-1", "available": False},
+        ],
+    },
+    {
+        "type": "A100_80Gx1",
+        "provider": "lambdalabs",
+        "memory_gb": 80,
+        "vCPUs": 30,
+        "hourly_price": 1.29,
+        "availability": [{"region": "us-south-1", "available": True}],
+    },
+    {
+        "type": "H100_80Gx8",
+        "provider": "datacrunch",
+        "memory_gb": 640,
+        "vCPUs": 176,
+        "hourly_price": 21.20,
+        "availability": [{"region": "fin-01", "available": True}],
+    },
+    {
+        "type": "T4_16Gx1",
+        "provider": "gcp",
+        "memory_gb": 16,
+        "vCPUs": 4,
+        "hourly_price": 0.35,
+        "availability": [{"region": "us-central1", "available": True}],
+    },
+]
+
+DEFAULT_VOLUME_TYPES: List[Dict[str, Any]] = [
+    {"name": "gp3", "provider": "aws", "min_size_gb": 1, "max_size_gb": 16384},
+    {"name": "io2", "provider": "aws", "min_size_gb": 4, "max_size_gb": 16384},
+    {"name": "pd-ssd", "provider": "gcp", "min_size_gb": 10, "max_size_gb": 65536},
+]
+
+Response = Tuple[int, Any, Dict[str, str]]
+
+
+class StandInAPI:
+    """In-memory implementation of the Shadeform API routes."""
+
+    def __init__(self, boot_time: float = 0.0) -> None:
+        self.boot_time = boot_time
+        # Per-provider boot times overriding boot_time
+        self.boot_times: Dict[str, float] = {}
+        # (provider, region) pairs that have no capacity
+        self.unavailable: Set[Tuple[str, str]] = set()
+        self.instance_types = [dict(t) for t in DEFAULT_INSTANCE_TYPES]
+        self.volume_types = [dict(t) for t in DEFAULT_VOLUME_TYPES]
+        self.instances: Dict[str, Dict[str, Any]] = {}
+        self.volumes: Dict[str, Dict[str, Any]] = {}
+        self.ssh_keys: Dict[str, Dict[str, Any]] = {}
+        self.templates: Dict[str, Dict[str, Any]] = {}
+        self.featured: List[str] = []
+        self.calls: List[Tuple[str, str]] = []
+        # (path, idempotency key) -> response replayed for repeated calls
+        self.idempotent: Dict[Tuple[str, str], Response] = {}
+        self.lock = threading.Lock()
+
+    def _instance_view(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        view = dict(record)
+        if (
+            view["status"] == "pending"
+            and time.monotonic() - view.pop("_launched")
+            >= self.boot_times.get(view.get("provider"), self.boot_time)
+        ):
+            record["status"] = view["status"] = "active"
+            record["ip"] = view["ip"] = "10.0.0.%d" % (len(self.instances) % 250 + 1)
+        view.pop("_launched", None)
+        return view
+
+    def count(self, method: str, path: str) -> int:
+        """Return how many times a route has been called."""
+        with self.lock:
+            return sum(1 for call in self.calls if call == (method, path))
+
+    def handle(
+        self, method: str, path: str, body: Any, headers: Dict[str, str]
+    ) -> Response:
+        """Dispatch a request to its route handler."""
+        with self.lock:
+            self.calls.append((method, path))
+            route, _, query = path.partition("?")
+            parts = [p for p in route.split("/") if p]
+            if method == "GET":
+                # Query parameters stand in for the body of GET routes
+                body = dict(parse_qsl(query))
+            key = headers.get("Idempotency-Key")
+            if key is not None and (route, key) in self.idempotent:
+                return self.idempotent[(route, key)]
+            response = self._route(method, parts, body or {}, headers)
+            if key is not None and response[0] < 500:
+                self.idempotent[(route, key)] = response
+            return response
+
+    def _route(
+        self, method: str, parts: List[str], body: Dict[str, Any], headers: Dict[str, str]
+    ) -> Response:
+        if not parts:
+            return 404, {"message": "Not found"}, {}
+        collection, rest = parts[0], parts[1:]
+        handler = getattr(self, f"_{collection}", None)
+        if handler is None:
+            return 404, {"message": "Not found"}, {}
+        return handler(method, rest, body, headers)
+
+    @staticmethod
+    def _lookup(
+        store: Dict[str, Dict[str, Any]], key: str, kind: str
+    ) -> Optional[Response]:
+        if key not in store:
+            return 404, {"message": f"{kind} {key} not found"}, {}
+        return None
+
+    def _instances(
+        self, method: str, rest: List[str], body: Dict[str, Any], headers: Dict[str, str]
+    ) -> Response:
+        if method == "GET" and not rest:
+            views = [self._instance_view(i) for i in self.instances.values()]
+            return 200, {"instances": views}, {}
+        if method == "GET" and rest == ["types"]:
+            types = [
+                t
+                for t in self.instance_types
+                if body.get("cloud") in (None, t["provider"])
+                and body.get("gpu_type") in (None, t["type"].split("_")[0])
+                and (
+                    body.get("available") != "true"
+                    or any(a["available"] for a in t.get("availability", []))
+                )
+            ]
+            return 200, {"instance_types": types}, {}
+        if method == "POST" and rest == ["create"]:
+            if (body.get("provider"), body.get("region")) in self.unavailable:
+                return 409, {"message": "No capacity available"}, {}
+            instance_id = str(uuid.uuid4())
+            self.instances[instance_id] = {
+                "id": instance_id,
+                "name": body.get("name"),
+                "provider": body.get("provider"),
+                "region": body.get("region"),
+                "instance_type": body.get("instance_type"),
+                "launch_configuration": body.get("launch_configuration"),
+                "volume_ids": [v.get("volume_id") for v in body.get("volumes", [])],
+                "status": "pending",
+                "ip": None,
+                "_launched": time.monotonic(),
+            }
+            return 200, {"id": instance_id, "status": "pending"}, {}
+        if len(rest) == 2:
+            instance_id, action = rest
+            missing = self._lookup(self.instances, instance_id, "instance")
+            if missing:
+                return missing
+            if method == "GET" and action == "info":
+                return 200, self._instance_view(self.instances[instance_id]), {}
+            if method == "POST" and action == "delete":
+                del self.instances[instance_id]
+                return 200, {"success": True}, {}
+            if method == "POST" and action == "update":
+                self.instances[instance_id].update(body)
+                return 200, {"success": True}, {}
+            if method == "POST" and action == "restart":
+                return 200, {"success": True, "status": "rebooting"}, {}
+        return 404, {"message": "Not found"}, {}
+
+    def _volumes(
+        self, method: str, rest: List[str], body: Dict[str, Any], headers: Dict[str, str]
+    ) -> Response:
+        if method == "GET" and not rest:
+            return 200, {"volumes": list(self.volumes.values())}, {}
+        if method == "GET" and rest == ["types"]:
+            return 200, {"volume_types": self.volume_types}, {}
+        if method == "POST" and rest == ["create"]:
+            volume_id = str(uuid.uuid4())
+            self.volumes[volume_id] = dict(body, id=volume_id, status="active")
+            return 200, {"id": volume_id, "status": "active"}, {}
+        if len(rest) == 2:
+            volume_id, action = rest
+            missing = self._lookup(self.volumes, volume_id, "volume")
+            if missing:
+                return missing
+            if method == "GET" and action == "info":
+                return 200, dict(self.volumes[volume_id]), {}
+            if method == "POST" and action == "delete":
+                del self.volumes[volume_id]
+                return 200, {"success": True}, {}
+        return 404, {"message": "Not found"}, {}
+
+    def _sshkeys(
+        self, method: str, rest: List[str], body: Dict[str, Any], headers: Dict[str, str]
+    ) -> Response:
+        if method == "GET" and not rest:
+            return 200, {"ssh_keys": list(self.ssh_keys.values())}, {}
+        if method == "POST" and rest == ["add"]:
+            key_id = str(uuid.uuid4())
+            self.ssh_keys[key_id] = dict(body, id=key_id, is_default=False)
+            return 200, {"id": key_id}, {}
+        if len(rest) == 2:
+            key_id, action = rest
+            missing = self._lookup(self.ssh_keys, key_id, "ssh key")
+            if missing:
+                return missing
+            if method == "GET" and action == "info":
+                return 200, dict(self.ssh_keys[key_id]), {}
+            if method == "POST" and action == "setdefault":
+                for key in self.ssh_keys.values():
+                    key["is_default"] = key["id"] == key_id
+                return 200, {"success": True}, {}
+            if method == "POST" and action == "delete":
+                del self.ssh_keys[key_id]
+                return 200, {"success": True}, {}
+        return 404, {"message": "Not found"}, {}
+
+    def _templates(
+        self, method: str, rest: List[str], body: Dict[str, Any], headers: Dict[str, str]
+    ) -> Response:
+        if method == "GET" and not rest:
+            return 200, {"templates": list(self.templates.values())}, {}
+        if method == "GET" and rest == ["featured"]:
+            featured = [self.templates[t] for t in self.featured if t in self.templates]
+            return 200, {"featured": featured}, {}
+        if method == "POST" and rest == ["save"]:
+            template_id = str(uuid.uuid4())
+            self.templates[template_id] = dict(body, id=template_id)
+            return 200, {"id": template_id}, {}
+        if len(rest) == 2:
+            template_id, action = rest
+            missing = self._lookup(self.templates, template_id, "template")
+            if missing:
+                return missing
+            if method == "GET" and action == "info":
+                return 200, dict(self.templates[template_id]), {}
+            if method == "POST" and action == "update":
+                self.templates[template_id].update(body)
+                return 200, {"success": True}, {}
+            if method == "POST" and action == "delete":
+                del self.templates[template_id]
+                return 200, {"success": True}, {}
+        return 404, {"message": "Not found"}, {}
+
+
+class StandInServer:
+    """
+    HTTP server wrapping a StandInAPI on a random local port.
+
+    Args:
+        api: API state to serve (a fresh one is created if omitted)
+        latency: Optional callable (method, path) -> seconds of injected delay
+        fault: Optional callable (method, path) -> status code to fail with
+    """
+
+    def __init__(
+        self,
+        api: Optional[StandInAPI] = None,
+        latency: Optional[Callable[[str, str], float]] = None,
+        fault: Optional[Callable[[str, str], Optional[int]]] = None,
+    ) -> None:
+        self.api = api or StandInAPI()
+        self.latency = latency
+        self.fault = fault
+        self.extra_headers: Dict[str, str] = {}
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _make_handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _dispatch(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                path = self.path[len("/v1"):] if self.path.startswith("/v1") else self.path
+                with server._lock:
+                    server.requests += 1
+                if server.latency is not None:
+                    delay = server.latency(method, path)
+                    if delay:
+                        time.sleep(delay)
+                status = server.fault(method, path) if server.fault else None
+                if status:
+                    status, payload, headers = status, {"message": "Injected fault"}, {}
+                else:
+                    body = json.loads(raw) if raw else None
+                    status, payload, headers = server.api.handle(
+                        method, path, body, dict(self.headers)
+                    )
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in {**server.extra_headers, **headers}.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                self._dispatch("GET")
+
+            def do_POST(self) -> None:
+                self._dispatch("POST")
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
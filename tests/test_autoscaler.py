@@ -0,0 +1,122 @@
+import pytest
+from shadeform import ShadeformClient
+from shadeform.autoscaler import Autoscaler, ScalingPolicy
+from shadeform.fleet import InstanceGroup
+from tests.standin import StandInServer
+
+LAUNCH = {"type": "docker", "image": "worker:latest"}
+
+def _policy(count=1, **kwargs):
+    group = InstanceGroup("aws", "A100_80Gx1", "us-west-2", count, LAUNCH, name="gpu")
+    options = {
+        "throughput": 1, "drain_time": 10, "max_count": 6,
+        "scale_up_cooldown": 0, "scale_down_cooldown": 0, "max_batch": 3,
+    }
+    options.update(kwargs)
+    return ScalingPolicy(group, **options)
+
+def test_target_from_throughput():
+    """Test the target covers the backlog within the drain time and bounds."""
+    policy = _policy()
+    assert policy.target(0) == 1
+    assert policy.target(25) == 3
+    assert policy.target(1000) == 6
+
+def test_scales_with_simulated_queue():
+    """Test the fleet follows a simulated queue end to end."""
+    queue = {"gpu": 0}
+    busy = set()
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        events = []
+        client.instrumentation.on("autoscale", lambda **e: events.append(e))
+        scaler = Autoscaler(client, [_policy()], lambda: queue, busy=lambda: busy)
+
+        assert scaler.step()["gpu"]["launched"] == 1
+        queue["gpu"] = 55
+        assert scaler.step()["gpu"] == {
+            "depth": 55, "current": 1, "target": 6, "launched": 3, "deleted": 0
+        }
+        assert scaler.step()["gpu"]["launched"] == 2
+        assert len(server.api.instances) == 6
+        assert server.api.count("GET", "/instances") == 3
+
+        # Jobs finished except on two busy workers: shrink, keeping them
+        busy.update(list(server.api.instances)[:2])
+        queue["gpu"] = 15
+        assert scaler.step()["gpu"]["deleted"] == 4
+        assert set(server.api.instances) == busy
+
+        # Busy workers are kept even at the minimum
+        queue["gpu"] = 0
+        assert scaler.step()["gpu"]["deleted"] == 0
+        assert len(events) == 4
+        client.close()
+
+def test_hysteresis_still_scales_down_to_minimum():
+    """Test small surpluses are kept unless the target is the minimum."""
+    queue = {"gpu": 25}
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        scaler = Autoscaler(client, [_policy(count=0)], lambda: queue)
+        assert scaler.step()["gpu"]["launched"] == 3
+        queue["gpu"] = 15
+        assert scaler.step()["gpu"]["deleted"] == 0
+        queue["gpu"] = 0
+        assert scaler.step()["gpu"]["deleted"] == 3
+        assert not server.api.instances
+        client.close()
+
+def test_cooldowns_damp_scaling():
+    """Test scaling waits for the cooldowns."""
+    queue = {"gpu": 55}
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        policy = _policy(scale_up_cooldown=60, scale_down_cooldown=60, hysteresis=0)
+        scaler = Autoscaler(client, [policy], lambda: queue)
+        assert scaler.step()["gpu"]["launched"] == 3
+        assert scaler.step()["gpu"]["launched"] == 0
+        queue["gpu"] = 0
+        assert scaler.step()["gpu"]["deleted"] == 0
+        client.close()
+
+def test_invalid_policy():
+    """Test policies reject impossible bounds."""
+    with pytest.raises(ValueError):
+        _policy(max_count=0)
+    with pytest.raises(ValueError):
+        _policy(throughput=0)
+
+def test_scaling_runs_at_bulk_priority():
+    """Test launches and deletes are scheduled as bulk work."""
+    queue = {"gpu": 25}
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        seen = []
+        request = client.request
+        client.request = lambda method, endpoint, **kwargs: (
+            seen.append((endpoint, kwargs.get("priority"))) or request(method, endpoint, **kwargs)
+        )
+        scaler = Autoscaler(client, [_policy(count=0)], lambda: queue)
+        assert scaler.step()["gpu"]["launched"] == 3
+        queue["gpu"] = 0
+        assert scaler.step()["gpu"]["deleted"] == 3
+        writes = [priority for endpoint, priority in seen if endpoint != "/instances"]
+        assert len(writes) == 6 and set(writes) == {"bulk"}
+        client.close()
+
+def test_groups_count_only_their_own_instances():
+    """Test a group never counts instances of a group whose name extends it."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        east = InstanceGroup("aws", "A100_80Gx1", "us-east-1", 1, LAUNCH, name="gpu-east")
+        scaler = Autoscaler(
+            client, [_policy(), ScalingPolicy(east, throughput=1)], lambda: {}
+        )
+        scaler.step()
+        assert {g: len(i) for g, i in scaler.inventory().items()} == {
+            "gpu": 1, "gpu-east": 1
+        }
+        assert scaler.step()["gpu"]["current"] == 1
+        assert len(server.api.instances) == 2
+        client.close()
@@ -0,0 +1,53 @@
+import time
+from shadeform import ShadeformClient
+from shadeform.availability import AvailabilityScanner
+from tests.standin import StandInServer
+
+PROVIDERS = ["aws", "lambdalabs", "datacrunch", "gcp"]
+
+def test_scan_ranks_available_offers_by_price():
+    """Test a scan fans out per provider and returns offers cheapest first."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        view = AvailabilityScanner(client).scan(providers=PROVIDERS)
+        assert view.complete
+        assert list(view) == [
+            ("T4_16Gx1", "gcp", "us-central1"),
+            ("A100_80Gx1", "lambdalabs", "us-south-1"),
+            ("A100_80Gx1", "aws", "us-west-2"),
+            ("H100_80Gx8", "datacrunch", "fin-01"),
+        ]
+        assert view[("A100_80Gx1", "aws", "us-west-2")]["hourly_price"] == 3.50
+        assert view.cheapest("A100_80Gx1")["provider"] == "lambdalabs"
+        assert view.candidates(1) == [
+            {"provider": "gcp", "region": "us-central1", "instance_type": "T4_16Gx1"}
+        ]
+        assert server.api.count("GET", "/instances/types?cloud=aws&available=true") == 1
+        client.close()
+
+def test_scan_filters_and_caches_within_ttl():
+    """Test filters apply to offers and repeated scans reuse cached queries."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        scanner = AvailabilityScanner(client, ttl=60)
+        view = scanner.scan(gpu_types=["A100"], max_price=2.0)
+        assert list(view) == [("A100_80Gx1", "lambdalabs", "us-south-1")]
+        scanner.scan(gpu_types=["A100"], max_price=2.0)
+        assert server.requests == 1
+        scanner.invalidate()
+        scanner.scan(gpu_types=["A100"])
+        assert server.requests == 2
+        client.close()
+
+def test_scan_stops_once_enough_offers_are_found():
+    """Test a scan returns early without waiting for slow providers."""
+    slow = lambda method, path: 1.0 if "cloud=datacrunch" in path else 0
+    with StandInServer(latency=slow) as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        start = time.monotonic()
+        view = AvailabilityScanner(client).scan(providers=PROVIDERS, enough=2)
+        assert time.monotonic() - start < 0.5
+        assert not view.complete
+        assert len(view) >= 2
+        assert all(key[1] != "datacrunch" for key in view)
+        client.close()
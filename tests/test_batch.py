@@ -0,0 +1,85 @@
+import json
+import pytest
+from shadeform import (
+    LaunchConfiguration,
+    ShadeformBatchValidationError,
+    ShadeformClient,
+    ShadeformValidationError,
+)
+from shadeform.batch import LaunchBatch
+from shadeform.catalog import CatalogIndex
+from shadeform.utils.helpers import idempotency_key
+from shadeform.validation import SchemaValidator
+from tests.standin import DEFAULT_INSTANCE_TYPES, StandInServer
+
+LAUNCH = LaunchConfiguration.docker("pytorch/pytorch:latest", env_vars={"A": "é"})
+
+def _batch(count, **kwargs):
+    columns = dict(
+        names=[f"w-{i}" for i in range(count)],
+        instance_types="A100_80Gx1",
+        regions="us-west-2",
+        providers="aws",
+        launch_configs=LAUNCH,
+    )
+    columns.update(kwargs)
+    return LaunchBatch(**columns)
+
+def test_validation_reports_every_invalid_row():
+    """Test one pass reports all bad rows, each distinct value checked once."""
+    batch = _batch(
+        6,
+        names=["a", "b", "a", "", "c", "d"],
+        instance_types=["A100_80Gx1", "A100", "A100_80Gx1", "A100_80Gx1", "A100_80Gx1", "H100_80Gx8"],
+        regions=["us-west-2", "us-west-2", "us-west-2", "us-west-2", "fin-01", "us-west-2"],
+        launch_configs=[LAUNCH, LAUNCH, LAUNCH, LAUNCH, {"type": "vm"}, LAUNCH],
+    )
+    assert _batch(3).validate() == []
+    errors = batch.validate(CatalogIndex(DEFAULT_INSTANCE_TYPES))
+    assert [(row, field) for row, field, _ in errors] == [
+        (1, "instance_type"),
+        (2, "name"),
+        (3, "name"),
+        (4, "region"),
+        (4, "launch_configuration"),
+        (5, "provider"),
+    ]
+    with pytest.raises(ShadeformBatchValidationError) as info:
+        batch.check()
+    assert info.value.rows == [1, 2, 3, 4]
+    with pytest.raises(ShadeformValidationError):
+        _batch(3, regions=["us-west-2"])
+    unhashable = _batch(2, instance_types=[["A100_80Gx1"], "A100_80Gx1"], ssh_key_ids=[None, {}])
+    assert [(row, field) for row, field, _ in unhashable.validate()] == [
+        (0, "instance_type"),
+        (1, "ssh_key_id"),
+    ]
+
+def test_bodies_match_single_create_payloads():
+    """Test bodies decode to the create payload and keys match create's keys."""
+    batch = _batch(4, ssh_key_ids=["k", None, "k", None], volumes=[None, [{"volume_id": "v"}], None, None])
+    for row, (body, key) in enumerate(zip(batch.bodies(), batch.keys())):
+        payload = batch.payload(row)
+        assert json.loads(body) == payload
+        assert key == idempotency_key("POST", "/instances/create", payload)
+    assert batch.payload(0)["launch_configuration"] is batch.payload(3)["launch_configuration"]
+    assert "ssh_key_id" not in batch.payload(1) and batch.payload(1)["volumes"]
+
+def test_create_batch_submits_every_row_once():
+    """Test a batch is created concurrently and resending it is idempotent."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        batch = _batch(20)
+        created = [f.result(timeout=10) for f in client.instances.create_batch(batch)]
+        assert len({c["id"] for c in created}) == 20
+        assert {i["name"] for i in server.api.instances.values()} == set(batch.names)
+        again = [f.result(timeout=10) for f in client.instances.create_batch(batch)]
+        assert again == created and len(server.api.instances) == 20
+        with pytest.raises(ShadeformBatchValidationError):
+            client.instances.create_batch(_batch(2, names=["x", "x"]))
+        client.validation = SchemaValidator("strict")
+        with pytest.raises(ShadeformBatchValidationError) as info:
+            client.instances.create_batch(_batch(2, names=["y", "z"], ssh_key_ids=[None, 7]))
+        assert info.value.errors[0][:2] == (1, "ssh_key_id")
+        assert server.api.count("POST", "/instances/create") == 40
+        client.close()
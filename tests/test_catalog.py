@@ -0,0 +1,60 @@
+import time
+import pytest
+from shadeform import ShadeformClient, ShadeformValidationError
+from shadeform.catalog import INSTANCE_TYPES, VOLUME_TYPES, CatalogCache, CatalogIndex
+from tests.standin import DEFAULT_INSTANCE_TYPES, DEFAULT_VOLUME_TYPES, StandInServer
+
+LAUNCH = {"type": "docker", "image": "pytorch/pytorch:latest"}
+
+def test_index_checks_offers_and_volume_bounds():
+    """Test the index accepts catalog combinations and names the bad field."""
+    index = CatalogIndex(DEFAULT_INSTANCE_TYPES, DEFAULT_VOLUME_TYPES)
+    index.check_instance("H100_80Gx8", "datacrunch", "fin-01")
+    index.check_instance("A100_80Gx1", "aws", "us-east-1")
+    for args, field in [
+        (("B200_192Gx8", "aws", "us-west-2"), "instance_type"),
+        (("H100_80Gx8", "aws", "fin-01"), "provider"),
+        (("A100_80Gx1", "aws", "fin-01"), "region"),
+    ]:
+        with pytest.raises(ShadeformValidationError) as info:
+            index.check_instance(*args)
+        assert info.value.field == field
+    index.check_volume("gcp", "pd-ssd", 20000)
+    for args, field in [
+        (("aws", "st1", 100), "volume_type"),
+        (("gcp", "gp3", 100), "provider"),
+        (("aws", "io2", 2), "size_gb"),
+    ]:
+        with pytest.raises(ShadeformValidationError) as info:
+            index.check_volume(*args)
+        assert info.value.field == field
+    CatalogIndex().check_instance("B200_192Gx8", "aws", "mars-1")
+
+def test_creates_are_rejected_offline_from_cached_catalogs():
+    """Test impossible creates fail without a request once catalogs are cached."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        client.warmup(preload=[INSTANCE_TYPES, VOLUME_TYPES]).result(timeout=10)
+        with pytest.raises(ShadeformValidationError) as info:
+            client.instances.create("aws", "w", "fin-01", "A100_80Gx1", LAUNCH)
+        assert info.value.field == "region"
+        with pytest.raises(ShadeformValidationError):
+            client.volumes.create("aws", "data", 100, "pd-ssd")
+        assert server.api.count("POST", "/instances/create") == 0
+        assert server.api.count("POST", "/volumes/create") == 0
+        client.instances.create("datacrunch", "w", "fin-01", "H100_80Gx8", LAUNCH)
+        client.volumes.create("gcp", "big", 20000, "pd-ssd")
+        assert len(server.api.instances) == len(server.api.volumes) == 1
+        client.close()
+
+def test_index_follows_the_cached_catalogs():
+    """Test the index is rebuilt on refetch and absent once catalogs expire."""
+    cache = CatalogCache(ttl=0.05)
+    assert cache.index() is None
+    cache.put(INSTANCE_TYPES, [{"type": "A100_80Gx1", "provider": "aws"}])
+    first = cache.index()
+    assert cache.index() is first and first.volume_types is None
+    cache.put(INSTANCE_TYPES, [{"type": "H100_80Gx8", "provider": "aws"}])
+    assert cache.index().instance_types == {"H100_80Gx8"}
+    time.sleep(0.06)
+    assert cache.index() is None
@@ -0,0 +1,125 @@
+import time
+import pytest
+from shadeform import ShadeformClient, ShadeformAPIError, ShadeformCircuitOpenError
+from shadeform.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerPolicy
+from tests.standin import StandInServer
+
+def test_breaker_opens_on_failure_rate():
+    """Test the breaker opens once the failure rate crosses the threshold."""
+    breaker = CircuitBreaker("/instances/create", minimum_calls=4)
+    for failed in (False, True, True, False):
+        breaker.before_call()
+        breaker.after_call(failed, 0.01)
+    assert breaker.state == OPEN
+    with pytest.raises(ShadeformCircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.endpoint == "/instances/create"
+    assert excinfo.value.retry_after > 0
+
+def test_breaker_needs_minimum_calls():
+    """Test a few failures below minimum_calls do not trip the breaker."""
+    breaker = CircuitBreaker("/instances", minimum_calls=10)
+    for _ in range(5):
+        breaker.before_call()
+        breaker.after_call(True, 0.01)
+    assert breaker.state == CLOSED
+
+def test_breaker_opens_on_slow_calls():
+    """Test slow calls trip the breaker even when they succeed."""
+    breaker = CircuitBreaker(
+        "/instances", minimum_calls=3, slow_call_duration=0.5, slow_call_rate_threshold=0.6
+    )
+    for duration in (1.0, 1.0, 0.1):
+        breaker.before_call()
+        breaker.after_call(False, duration)
+    assert breaker.state == OPEN
+
+def test_half_open_probes_close_breaker():
+    """Test successful probes close a half-open breaker."""
+    breaker = CircuitBreaker("/volumes", minimum_calls=1, open_duration=0.01, half_open_calls=2)
+    breaker.before_call()
+    breaker.after_call(True, 0.01)
+    time.sleep(0.02)
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+    breaker.before_call()
+    with pytest.raises(ShadeformCircuitOpenError):
+        breaker.before_call()
+    breaker.after_call(False, 0.01)
+    breaker.after_call(False, 0.01)
+    assert breaker.state == CLOSED
+
+def test_half_open_probe_failure_reopens():
+    """Test a failed probe reopens the breaker."""
+    breaker = CircuitBreaker("/volumes", minimum_calls=1, open_duration=0.01)
+    breaker.before_call()
+    breaker.after_call(True, 0.01)
+    time.sleep(0.02)
+    breaker.before_call()
+    breaker.after_call(True, 0.01)
+    assert breaker.state == OPEN
+
+def test_policy_keys_by_endpoint_template():
+    """Test breakers are shared across resource ids of the same endpoint."""
+    policy = CircuitBreakerPolicy()
+    assert policy.get("/instances/a/info") is policy.get("/instances/b/info")
+    assert policy.get("/instances/a/info") is not policy.get("/instances/create")
+
+def test_client_fails_fast_and_reports_state_changes():
+    """Test a degraded endpoint fails fast while healthy endpoints still work."""
+    failing = lambda method, path: 500 if path == "/instances/create" else None
+    with StandInServer(fault=failing) as server:
+        client = ShadeformClient(
+            api_key="test-api-key",
+            base_url=server.base_url,
+            circuit_breakers=CircuitBreakerPolicy(minimum_calls=3),
+            mutation_retries=0,
+        )
+        events = []
+        client.instrumentation.on("circuit_state_change", lambda **e: events.append(e))
+        launch = {"type": "docker", "image": "pytorch/pytorch:latest"}
+        for _ in range(3):
+            with pytest.raises(ShadeformAPIError):
+                client.instances.create("aws", "n", "us-west-2", "A100_80Gx1", launch)
+        with pytest.raises(ShadeformCircuitOpenError):
+            client.instances.create("aws", "n", "us-west-2", "A100_80Gx1", launch)
+        assert server.requests == 3
+        assert client.instances.list_all() == []
+    assert events == [
+        {
+            "event": "circuit_state_change",
+            "endpoint": "/instances/create",
+            "old_state": CLOSED,
+            "new_state": OPEN,
+        }
+    ]
+
+def test_shared_policy_reports_to_every_client():
+    """Test clients sharing a policy all get state changes until closed."""
+    policy = CircuitBreakerPolicy(minimum_calls=1)
+    changes = []
+    policy.on_state_change = lambda *change: changes.append(change)
+    first = ShadeformClient(api_key="test-api-key", circuit_breakers=policy)
+    second = ShadeformClient(api_key="test-api-key", circuit_breakers=policy)
+    events = {first: [], second: []}
+    for client in events:
+        client.instrumentation.on("circuit_state_change", lambda client=client, **e: events[client].append(e))
+    policy.get("/instances/create").after_call(True, 0.0)
+    assert len(events[first]) == len(events[second]) == len(changes) == 1
+    first.close()
+    policy.get("/volumes/create").after_call(True, 0.0)
+    assert len(events[first]) == 1
+    assert len(events[second]) == len(changes) == 2
+    second.close()
+
+def test_client_errors_do_not_trip_breaker():
+    """Test 4xx responses are not counted as endpoint failures."""
+    with StandInServer() as server:
+        policy = CircuitBreakerPolicy(minimum_calls=2)
+        client = ShadeformClient(
+            api_key="test-api-key", base_url=server.base_url, circuit_breakers=policy
+        )
+        for _ in range(3):
+            with pytest.raises(ShadeformAPIError):
+                client.instances.get_info("missing")
+        assert policy.states() == {"/instances/{id}/info": CLOSED}
@@ -124,4 +124,23 @@ def test_client_request_with_json_body(mock_request):
     
     mock_request.assert_called_once()
     args, kwargs = mock_request.call_args
-    assert kwargs.get("json") == {"name": "test"}
\ No newline at end of file
+    assert kwargs.get("json") == {"name": "test"}
+
+@patch('requests.Session.request')
+def test_client_request_emits_instrumentation_event(mock_request):
+    """Test request hooks receive the endpoint, status and duration."""
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.content = b'{"key": "value"}'
+    mock_response.json.return_value = {"key": "value"}
+    mock_request.return_value = mock_response
+
+    client = ShadeformClient(api_key="test-api-key")
+    events = []
+    client.instrumentation.on("request", lambda **event: events.append(event))
+    client.request("GET", "/test")
+
+    assert len(events) == 1
+    assert events[0]["endpoint"] == "/test"
+    assert events[0]["status_code"] == 200
+    assert events[0]["failed"] is False
@@ -0,0 +1,94 @@
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from shadeform import ShadeformClient, ShadeformAPIError, ShadeformError
+from shadeform.concurrency import AdaptiveConcurrencyLimiter
+from tests.standin import StandInServer
+
+def test_invalid_limits():
+    """Test inconsistent limits are rejected."""
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=5)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(backoff=1.5)
+
+def test_additive_increase_on_healthy_latency():
+    """Test the limit grows by about one per window of successes."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+    for _ in range(40):
+        limiter.acquire()
+        limiter.release(0.01)
+    assert 8 <= limiter.limit <= 12
+
+def test_multiplicative_decrease_on_drop():
+    """Test a dropped request halves the limit."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=16)
+    with limiter.acquire() as slot:
+        slot.drop()
+    assert limiter.limit == 8
+
+def test_decrease_on_latency_inflation():
+    """Test inflated latency is treated as congestion."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=16, latency_tolerance=2.0)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(0.01)
+    limiter.acquire()
+    limiter.release(0.5)
+    assert limiter.limit < 16
+
+def test_requests_queue_beyond_limit():
+    """Test requests over the limit wait and are reported as queue depth."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    held = limiter.acquire()
+    waiter = threading.Thread(target=lambda: limiter.acquire().__exit__(None, None, None))
+    waiter.start()
+    time.sleep(0.05)
+    assert limiter.metrics()["queue_depth"] == 1
+    held.__exit__(None, None, None)
+    waiter.join(timeout=1)
+    assert limiter.metrics()["in_flight"] == 0
+
+def test_acquire_timeout():
+    """Test waiting for a slot times out."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1, timeout=0.02)
+    limiter.acquire()
+    with pytest.raises(ShadeformError, match="concurrency slot"):
+        limiter.acquire()
+
+def test_client_respects_limit_against_standin():
+    """Test fan-out through the client never exceeds the adaptive limit."""
+    peak = [0]
+    active = [0]
+    lock = threading.Lock()
+    def latency(method, path):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return 0
+
+    with StandInServer(latency=latency) as server:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=3, max_limit=3)
+        client = ShadeformClient(
+            api_key="test-api-key", base_url=server.base_url, concurrency=limiter
+        )
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(lambda _: client.instances.list_all(), range(32)))
+    assert peak[0] <= 3
+    assert limiter.metrics()["in_flight"] == 0
+
+def test_client_backs_off_on_503():
+    """Test overload responses shrink the limit."""
+    with StandInServer(fault=lambda method, path: 503) as server:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=32)
+        client = ShadeformClient(
+            api_key="test-api-key", base_url=server.base_url, concurrency=limiter
+        )
+        with pytest.raises(ShadeformAPIError) as excinfo:
+            client.instances.list_all()
+        assert excinfo.value.status_code == 503
+    assert limiter.limit == 16
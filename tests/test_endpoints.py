@@ -0,0 +1,83 @@
+import pickle
+import socket
+import pytest
+from shadeform import ShadeformClient, ShadeformError
+from shadeform.endpoints import EndpointSelector
+from tests.standin import StandInServer
+
+def _dead_url():
+    """Return a base URL nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/v1"
+
+def test_routes_to_lowest_ewma_endpoint():
+    """Test requests follow the endpoint with the lowest probed latency."""
+    slow_probe = lambda method, path: 0.05 if path == "" else 0
+    with StandInServer(latency=slow_probe) as slow, StandInServer() as fast:
+        selector = EndpointSelector([slow.base_url, fast.base_url], probe_interval=60)
+        client = ShadeformClient(api_key="test-api-key", base_url=selector)
+        selector.probe()
+        for _ in range(3):
+            client.instances.list_all()
+        assert slow.api.count("GET", "/instances") == 0
+        assert fast.api.count("GET", "/instances") == 3
+
+        stats = client.endpoints.stats()
+        assert stats[slow.base_url]["ewma_latency"] > stats[fast.base_url]["ewma_latency"]
+        assert stats[fast.base_url]["requests"] == 3
+        assert all(s["healthy"] for s in stats.values())
+        client.close()
+
+def test_fails_over_on_connection_error():
+    """Test a request moves on when the preferred endpoint refuses connections."""
+    dead = _dead_url()
+    with StandInServer() as server:
+        client = ShadeformClient(
+            api_key="test-api-key",
+            base_url=EndpointSelector([dead, server.base_url], probe_interval=60),
+        )
+        launch = {"type": "docker", "image": "pytorch/pytorch:latest"}
+        created = client.instances.create("aws", "n", "us-west-2", "A100_80Gx1", launch)
+        assert server.api.count("POST", "/instances/create") == 1
+        assert client.instances.get_info(created["id"])["name"] == "n"
+
+        stats = client.endpoints.stats()
+        assert stats[dead]["healthy"] is False
+        assert stats[dead]["failures"] >= 1
+        assert stats[server.base_url]["requests"] == 2
+        client.close()
+
+def test_all_endpoints_down_raises():
+    """Test the error surfaces once every endpoint has been tried."""
+    client = ShadeformClient(
+        api_key="test-api-key",
+        base_url=EndpointSelector([_dead_url(), _dead_url()], probe_interval=60),
+    )
+    with pytest.raises(ShadeformError):
+        client.instances.list_all()
+    assert not any(s["healthy"] for s in client.endpoints.stats().values())
+    client.close()
+
+def test_probe_restores_endpoint():
+    """Test a successful probe marks a downed endpoint healthy again."""
+    with StandInServer() as server:
+        selector = EndpointSelector([server.base_url, _dead_url()], probe_interval=60)
+        selector.mark_down(server.base_url, "connection refused")
+        assert selector.select() != server.base_url
+        selector.probe()
+        assert selector.select() == server.base_url
+        selector.close()
+
+def test_client_accepts_url_list_and_pickles():
+    """Test a list of base URLs builds a selector that survives pickling."""
+    urls = ["https://a.example/v1", "https://b.example/v1/"]
+    client = ShadeformClient(api_key="test-api-key", base_url=urls)
+    assert client.endpoints.urls == ["https://a.example/v1", "https://b.example/v1"]
+    assert client.base_url == "https://a.example/v1"
+    clone = pickle.loads(pickle.dumps(client))
+    assert clone.endpoints.urls == client.endpoints.urls
+    single = ShadeformClient(api_key="test-api-key", base_url=["https://a.example/v1"])
+    assert single.endpoints is None
+    assert single.base_url == "https://a.example/v1"
@@ -0,0 +1,126 @@
+import pytest
+from shadeform import ShadeformClient, ShadeformValidationError
+from shadeform.fleet import (
+    FleetReconciler,
+    FleetSpec,
+    InstanceGroup,
+    SSHKeySpec,
+    VolumeSpec,
+)
+from tests.standin import StandInServer
+
+LAUNCH = {"type": "docker", "image": "pytorch/pytorch:latest"}
+
+def _spec(a100=3, t4=1, key="ssh-ed25519 AAAA1"):
+    return FleetSpec(
+        "train",
+        instances=[
+            InstanceGroup(
+                "aws", "A100_80Gx1", "us-west-2", a100, LAUNCH,
+                ssh_key="ops", volumes={"data": "/mnt/data"},
+            ),
+            InstanceGroup("gcp", "T4_16Gx1", "us-central1", t4, LAUNCH, name="infer"),
+        ],
+        volumes=[VolumeSpec("aws", "data", 100, "gp3")],
+        ssh_keys=[SSHKeySpec("ops", key)],
+    )
+
+def test_converges_and_is_idempotent():
+    """Test a spec is applied from scratch and a second plan is empty."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        server.api.instances["other"] = {"id": "other", "name": "unmanaged", "status": "active"}
+        reconciler = FleetReconciler(client)
+        plan = reconciler.plan(_spec())
+        assert plan.summary() == {
+            "create_ssh_key": 1, "create_volume": 1, "create_instance": 4
+        }
+        assert reconciler.apply(plan).ok
+        assert server.api.count("GET", "/instances") == 1
+
+        names = sorted(i["name"] for i in client.instances.list_all())
+        assert names == [
+            "train-A100_80Gx1-us-west-2-0", "train-A100_80Gx1-us-west-2-1",
+            "train-A100_80Gx1-us-west-2-2", "train-infer-0", "unmanaged",
+        ]
+        volume_id = client.volumes.list_all()[0]["id"]
+        a100 = [i for i in server.api.instances.values() if i.get("instance_type") == "A100_80Gx1"]
+        assert len(a100) == 3
+        assert all(i["volume_ids"] == [volume_id] for i in a100)
+        assert reconciler.plan(_spec()).is_empty
+        client.close()
+
+def test_minimal_changes():
+    """Test scaling, renaming and key rotation use the fewest calls."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        reconciler = FleetReconciler(client)
+        reconciler.reconcile(_spec()).raise_for_errors()
+
+        # A stray instance of the right kind is renamed into a free slot
+        stray = next(i for i in server.api.instances.values() if i["name"] == "train-infer-0")
+        stray["name"] = "train-infer-old"
+        plan = reconciler.plan(_spec(a100=1, t4=1, key="ssh-ed25519 AAAA2"))
+        assert plan.summary() == {
+            "create_ssh_key": 1, "delete_ssh_key": 1,
+            "update_instance": 1, "delete_instance": 2,
+        }
+        assert reconciler.apply(plan).ok
+        assert reconciler.plan(_spec(a100=1, t4=1, key="ssh-ed25519 AAAA2")).is_empty
+
+        empty = reconciler.plan(FleetSpec("train"))
+        assert empty.summary() == {
+            "delete_ssh_key": 1, "delete_volume": 1, "delete_instance": 2
+        }
+        volume_delete = next(a for a in empty if a.resource == "volume")
+        assert len(volume_delete.depends_on) == 2
+        assert reconciler.apply(empty).ok
+        assert client.instances.list_all() == []
+        client.close()
+
+def test_failed_dependency_skips_dependents():
+    """Test instances are not created when their volume could not be."""
+    fail = lambda method, path: 500 if path == "/volumes/create" else None
+    with StandInServer(fault=fail) as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        result = FleetReconciler(client).reconcile(_spec())
+        assert [a.resource for a, _ in result.failed] == ["volume"]
+        assert len(result.skipped) == 3
+        assert server.api.count("POST", "/instances/create") == 1
+        with pytest.raises(Exception):
+            result.raise_for_errors()
+        client.close()
+
+def test_unknown_reference_is_rejected():
+    """Test groups must refer to volumes and keys that exist."""
+    spec = FleetSpec(
+        "train",
+        instances=[InstanceGroup("aws", "A100_80Gx1", "us-west-2", 1, LAUNCH, ssh_key="x")],
+    )
+    with pytest.raises(ShadeformValidationError):
+        FleetReconciler(None).plan(spec, {"instances": [], "volumes": [], "ssh_keys": []})
+    plan = FleetReconciler(None).plan(
+        spec, {"instances": [], "volumes": [], "ssh_keys": [{"id": "k1", "name": "x"}]}
+    )
+    assert [a.params["ssh_key"] for a in plan.actions] == ["k1"]
+
+def test_fleets_do_not_claim_each_other():
+    """Test a fleet prefix cannot extend another fleet's prefix."""
+    with pytest.raises(ShadeformValidationError) as error:
+        FleetSpec("x-y")
+    assert error.value.field == "prefix"
+    fleet = lambda prefix: FleetSpec(
+        prefix,
+        instances=[InstanceGroup("aws", "A100_80Gx1", "us-west-2", 2, LAUNCH)],
+        volumes=[VolumeSpec("aws", "data", 10, "gp3")],
+    )
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        reconciler = FleetReconciler(client)
+        reconciler.reconcile(fleet("xy")).raise_for_errors()
+        reconciler.reconcile(fleet("x")).raise_for_errors()
+        assert reconciler.plan(FleetSpec("x")).summary() == {
+            "delete_volume": 1, "delete_instance": 2
+        }
+        assert reconciler.plan(fleet("xy")).is_empty
+        client.close()
@@ -0,0 +1,96 @@
+import threading
+import time
+import pytest
+from concurrent.futures import Future
+from shadeform import ShadeformClient, ShadeformAPIError, ShadeformError
+from shadeform.futures import FuturesClient, as_completed, gather
+from shadeform.scheduler import PriorityScheduler
+from tests.standin import StandInServer
+
+def test_resource_methods_return_futures():
+    """Test resource calls through the facade return futures."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        launch = {"type": "docker", "image": "pytorch/pytorch:latest"}
+        created = [
+            client.futures.instances.create("aws", f"n{i}", "us-west-2", "A100_80Gx1", launch)
+            for i in range(10)
+        ]
+        assert all(isinstance(future, Future) for future in created)
+        ids = [result["id"] for result in gather(created, timeout=10)]
+        infos = gather([client.futures.instances.get_info(i) for i in ids], timeout=10)
+        assert [info["name"] for info in infos] == [f"n{i}" for i in range(10)]
+        client.close()
+
+def test_gather_return_exceptions():
+    """Test failures can be returned in place of results."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        futures = [client.futures.volumes.get_info("missing"), client.futures.volumes.list_all()]
+        results = gather(futures, timeout=10, return_exceptions=True)
+        assert isinstance(results[0], ShadeformAPIError)
+        assert results[1] == []
+        with pytest.raises(ShadeformAPIError):
+            gather(futures, timeout=10)
+        client.close()
+
+def test_gather_deadline_cancels_pending():
+    """Test a missed deadline raises and cancels queued calls."""
+    client = ShadeformClient(api_key="test-api-key")
+    futures = FuturesClient(client, max_workers=1)
+    release = threading.Event()
+    blocker = futures.submit(release.wait)
+    queued = futures.submit(lambda: "never")
+    with pytest.raises(ShadeformError, match="Timed out"):
+        gather([blocker, queued], timeout=0.05)
+    assert queued.cancelled()
+    release.set()
+    futures.shutdown()
+
+def test_as_completed_deadline():
+    """Test as_completed yields finished futures and enforces its deadline."""
+    client = ShadeformClient(api_key="test-api-key")
+    futures = FuturesClient(client, max_workers=2)
+    fast = futures.submit(lambda: "fast")
+    slow = futures.submit(time.sleep, 0.5)
+    seen = []
+    with pytest.raises(ShadeformError):
+        for future in as_completed([fast, slow], timeout=0.1):
+            seen.append(future.result())
+    assert seen == ["fast"]
+    futures.shutdown()
+
+def test_submissions_are_bounded():
+    """Test submit blocks once max_pending calls are outstanding."""
+    client = ShadeformClient(api_key="test-api-key")
+    futures = FuturesClient(client, max_workers=1, max_pending=2)
+    release = threading.Event()
+    futures.submit(release.wait)
+    futures.submit(release.wait)
+    third = []
+    thread = threading.Thread(target=lambda: third.append(futures.submit(lambda: 3)))
+    thread.start()
+    time.sleep(0.05)
+    assert third == []
+    release.set()
+    thread.join(timeout=2)
+    assert third[0].result(timeout=2) == 3
+    futures.shutdown()
+
+def test_futures_respect_scheduler_and_emit_events():
+    """Test facade calls go through the scheduler and instrumentation."""
+    with StandInServer() as server:
+        scheduler = PriorityScheduler(max_in_flight=2)
+        client = ShadeformClient(
+            api_key="test-api-key", base_url=server.base_url, scheduler=scheduler
+        )
+        peak = []
+        server.latency = lambda method, path: peak.append(scheduler.metrics()["in_flight"])
+        events = []
+        client.instrumentation.on("future_completed", lambda **e: events.append(e))
+        gather([client.futures.templates.list_all(priority="bulk") for _ in range(8)])
+        client.close()
+    assert max(peak) <= 2
+    assert len(events) == 8
+    assert events[0]["name"] == "TemplateClient.list_all"
+    assert events[0]["failed"] is False
@@ -0,0 +1,103 @@
+import itertools
+import time
+import pytest
+from unittest.mock import patch
+from shadeform import ShadeformClient
+from shadeform.hedging import HedgePolicy, LatencyTracker
+from shadeform.utils.helpers import endpoint_template
+from tests.standin import StandInServer
+
+def test_endpoint_template():
+    """Test resource ids are replaced in endpoint templates."""
+    assert endpoint_template("/instances/abc-123/info") == "/instances/{id}/info"
+    assert endpoint_template("instances/abc-123/delete") == "/instances/{id}/delete"
+    assert endpoint_template("/instances/types") == "/instances/types"
+    assert endpoint_template("/instances") == "/instances"
+
+def test_latency_tracker_percentile():
+    """Test percentile computation over the rolling window."""
+    tracker = LatencyTracker(window=100)
+    assert tracker.percentile(95) is None
+    for i in range(100):
+        tracker.record(i / 100.0)
+    assert tracker.percentile(50) == pytest.approx(0.5)
+    assert tracker.percentile(95) == pytest.approx(0.95)
+
+def test_no_hedge_until_min_samples():
+    """Test requests are not hedged while the endpoint is still warming up."""
+    policy = HedgePolicy(min_samples=5, budget=1.0)
+    calls = []
+    for _ in range(5):
+        assert policy.run("/instances", lambda: calls.append(1) or "ok") == "ok"
+    assert len(calls) == 5
+    assert policy.stats()["hedges"] == 0
+
+def test_hedge_wins_on_slow_primary():
+    """Test a slow request is hedged and the faster response is used."""
+    policy = HedgePolicy(min_samples=3, budget=1.0, min_delay=0.01)
+    for _ in range(3):
+        policy.run("/instances/{id}/info", lambda: "warm")
+
+    delays = iter([0.5, 0.0])
+    def call():
+        time.sleep(next(delays))
+        return "done"
+
+    start = time.monotonic()
+    assert policy.run("/instances/{id}/info", call) == "done"
+    assert time.monotonic() - start < 0.4
+    stats = policy.stats()
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+    policy.close()
+
+def test_hedge_budget_caps_extra_load():
+    """Test the hedge budget limits how many requests are duplicated."""
+    policy = HedgePolicy(min_samples=1, budget=0.1, min_delay=0.001)
+    policy.run("/instances", lambda: None)
+    for _ in range(30):
+        policy.run("/instances", lambda: time.sleep(0.003))
+    assert policy.stats()["hedges"] <= 0.1 * 31 + 1
+    policy.close()
+
+def test_hedge_error_falls_back_to_other_request():
+    """Test a failed request does not mask a successful hedge."""
+    policy = HedgePolicy(min_samples=1, budget=1.0, min_delay=0.01)
+    policy.run("/volumes", lambda: "warm")
+    counter = itertools.count()
+    def call():
+        if next(counter) == 0:
+            time.sleep(0.05)
+            raise RuntimeError("boom")
+        time.sleep(0.1)
+        return "ok"
+    assert policy.run("/volumes", call) == "ok"
+    policy.close()
+
+@patch('shadeform.client.ShadeformClient.request')
+def test_post_requests_are_never_hedged(mock_request):
+    """Test hedging only applies to GET requests."""
+    mock_request.return_value = {"success": True}
+    policy = HedgePolicy(min_samples=0, budget=1.0)
+    client = ShadeformClient(api_key="test-api-key", hedging=policy)
+    client.instances.delete("instance-123")
+    assert policy.stats()["requests"] == 0
+
+def test_hedging_against_standin_latency_outliers():
+    """Test hedging trims injected latency outliers against the stand-in API."""
+    counter = itertools.count()
+    latency = lambda method, path: 0.3 if next(counter) % 10 == 9 else 0.0
+    with StandInServer(latency=latency) as server:
+        policy = HedgePolicy(min_samples=5, budget=0.5, percentile=80)
+        client = ShadeformClient(
+            api_key="test-api-key", base_url=server.base_url, hedging=policy
+        )
+        slowest = 0.0
+        for i in range(30):
+            start = time.monotonic()
+            client.instances.list_all()
+            if i >= 5:
+                slowest = max(slowest, time.monotonic() - start)
+        assert slowest < 0.3
+        assert policy.stats()["hedge_wins"] >= 1
+        policy.close()
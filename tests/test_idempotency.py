@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from shadeform import ShadeformAPIError, ShadeformClient
+from shadeform.utils.helpers import idempotency_key
+from tests.standin import StandInServer
+
+LAUNCH = {"type": "docker", "image": "pytorch/pytorch:latest"}
+
+def _create(client, **kwargs):
+    return client.instances.create(
+        "aws", "worker", "us-west-2", "A100_80Gx1", LAUNCH, **kwargs
+    )
+
+def test_idempotency_key_is_deterministic():
+    """Test keys depend only on the method, endpoint and payload."""
+    key = idempotency_key("POST", "/instances/create", {"b": 1, "a": [1, 2]})
+    assert key == idempotency_key("post", "/instances/create", {"a": [1, 2], "b": 1})
+    assert key != idempotency_key("POST", "/volumes/create", {"b": 1, "a": [1, 2]})
+    assert len(key) == 32
+
+def test_repeated_create_returns_original():
+    """Test a repeated create is answered by the server from its key."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        first = _create(client)
+        assert _create(client) == first
+        assert len(server.api.instances) == 1
+        other = _create(client, idempotency_key="second-worker")
+        assert other["id"] != first["id"]
+        assert len(server.api.instances) == 2
+        client.close()
+
+def test_failed_create_is_retried_with_same_key():
+    """Test 5xx responses to creates are retried safely."""
+    failures = iter([503, 502])
+    fault = lambda method, path: next(failures, None) if path == "/volumes/create" else None
+    with StandInServer(fault=fault) as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        volume = client.volumes.create("aws", "data", 100, "gp3")
+        assert list(server.api.volumes) == [volume["id"]]
+        assert server.requests == 3
+        client.close()
+
+def test_retries_are_bounded_and_skip_client_errors():
+    """Test creates give up after the retry budget and never retry 4xx."""
+    fault = lambda method, path: 500 if path == "/sshkeys/add" else None
+    with StandInServer(fault=fault) as server:
+        client = ShadeformClient(
+            api_key="test-api-key", base_url=server.base_url, mutation_retries=1
+        )
+        with pytest.raises(ShadeformAPIError):
+            client.ssh_keys.add("ops", "ssh-ed25519 AAAA")
+        assert server.requests == 2
+        server.api.unavailable = {("aws", "us-west-2")}
+        with pytest.raises(ShadeformAPIError):
+            _create(client)
+        assert server.requests == 3
+        client.close()
+
+def test_concurrent_identical_creates_share_one_request():
+    """Test identical creates in flight at once send a single request."""
+    latency = lambda method, path: 0.1 if path == "/instances/create" else 0
+    with StandInServer(latency=latency) as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        barrier = threading.Barrier(8)
+
+        def create(_):
+            barrier.wait()
+            return _create(client)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(create, range(8)))
+        assert len({r["id"] for r in results}) == 1
+        assert server.api.count("POST", "/instances/create") == 1
+        assert server.requests == 1
+        client.close()
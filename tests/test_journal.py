@@ -0,0 +1,123 @@
+import pickle
+import pytest
+from shadeform import ShadeformClient, ShadeformError
+from shadeform.batch import LaunchBatch
+from shadeform.journal import OperationJournal
+from tests.standin import StandInServer
+
+LAUNCH = {"type": "docker", "image": "pytorch/pytorch:latest"}
+
+def _create(client, name):
+    return client.instances.create("aws", name, "us-west-2", "A100_80Gx1", LAUNCH)
+
+def test_restart_replays_completed_calls(tmp_path):
+    """Test a restarted process gets completed creates from the journal."""
+    path = str(tmp_path / "ops.journal")
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url, journal=path)
+        first = [_create(client, f"worker-{i}") for i in range(3)]
+        volume = client.volumes.create("aws", "data", 100, "gp3")
+        client.close()
+
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url, journal=path)
+        assert [_create(client, f"worker-{i}") for i in range(4)][:3] == first
+        assert client.volumes.create("aws", "data", 100, "gp3") == volume
+        assert server.api.count("POST", "/instances/create") == 4
+        assert server.api.count("POST", "/volumes/create") == 1
+        assert len(server.api.instances) == 4
+        client.close()
+
+def test_interrupted_create_is_resolved_by_name(tmp_path):
+    """Test a create whose outcome was lost is looked up rather than resent."""
+    path = str(tmp_path / "ops.journal")
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        created = _create(client, "worker-0")
+        journal = OperationJournal(path)
+        body = {
+            "provider": "aws",
+            "name": "worker-0",
+            "region": "us-west-2",
+            "instance_type": "A100_80Gx1",
+            "launch_configuration": LAUNCH,
+        }
+        key = journal.key("POST", "/instances/create", body)
+        journal.begin(key, "POST", "/instances/create", body)
+        journal.begin("lost", "POST", "/instances/x/restart")
+        client.close()
+
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url, journal=path)
+        assert len(client.journal.pending()) == 2
+        result = _create(client, "worker-0")
+        assert result["id"] == created["id"]
+        assert server.api.count("POST", "/instances/create") == 1
+        assert [r["key"] for r in client.journal.pending()] == ["lost"]
+        client.close()
+
+def test_interrupted_batch_is_resolved_with_one_listing(tmp_path):
+    """Test interrupted batch rows are journaled with names and found by one listing."""
+    path = str(tmp_path / "ops.journal")
+    batch = LaunchBatch([f"worker-{i}" for i in range(4)], "A100_80Gx1", "us-west-2", "aws", LAUNCH)
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url, journal=path)
+        ids = [f.result()["id"] for f in client.instances.create_batch(batch)]
+        intents = [r for r in client.journal.journal.records() if r["state"] == "intent"]
+        assert sorted(r["payload"]["name"] for r in intents) == batch.names
+        # Lose every outcome, as in a crash mid-batch
+        client.journal.journal.rewrite(lambda r: r["state"] == "intent")
+        client.close()
+
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url, journal=path)
+        assert len(client.journal.pending()) == 4
+        assert [f.result()["id"] for f in client.instances.create_batch(batch)] == ids
+        assert server.api.count("POST", "/instances/create") == 4
+        assert server.api.count("GET", "/instances") == 1
+        client.close()
+
+def test_compaction_keeps_records_of_other_processes(tmp_path):
+    """Test compacting a shared journal keeps what other writers appended."""
+    path = str(tmp_path / "ops.journal")
+    ours, theirs = OperationJournal(path), OperationJournal(path)
+    ours.begin("a", "POST", "/instances/create", {"name": "a"})
+    theirs.begin("b", "POST", "/instances/create", {"name": "b"})
+    theirs.begin("c", "POST", "/instances/create", {"name": "c"})
+    ours.complete("a", {"id": "1"})
+    theirs.complete("c", {"id": "3"})
+    ours.compact()
+    records = [(r["key"], r["state"]) for r in ours.journal.records()]
+    assert records == [("b", "intent"), ("a", "done"), ("c", "done")]
+    assert [r["key"] for r in OperationJournal(path).pending()] == ["b"]
+
+def test_failed_calls_are_resent_and_journal_compacts(tmp_path):
+    """Test failures are journaled, retried on repeat, and compaction keeps one record each."""
+    path = str(tmp_path / "ops.journal")
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url, journal=path)
+        with pytest.raises(ShadeformError):
+            client.instances.delete("missing")
+        key = client.journal.key("POST", "/instances/missing/delete")
+        assert client.journal.lookup(key)["state"] == "failed"
+        assert client.journal.lookup(key)["status_code"] == 404
+        with pytest.raises(ShadeformError):
+            client.instances.delete("missing")
+        assert server.api.count("POST", "/instances/missing/delete") == 2
+
+        created = _create(client, "worker-0")
+        client.instances.restart(created["id"])
+        client.instances.restart(created["id"])
+        assert server.api.count("POST", f"/instances/{created['id']}/restart") == 2
+        client.close()
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url, journal=path)
+        client.instances.restart(created["id"])
+        client.instances.restart(created["id"])
+        client.instances.restart(created["id"])
+        assert server.api.count("POST", f"/instances/{created['id']}/restart") == 3
+
+        key_id = client.ssh_keys.add("ops", "ssh-ed25519 AAAA")["id"]
+        client.ssh_keys.delete(key_id)
+        client.journal.compact()
+        records = list(client.journal.journal.records())
+        assert len(records) == 8
+        assert {r["state"] for r in records} == {"failed", "done"}
+        assert pickle.loads(pickle.dumps(client)).journal.journal.path == path
+        client.close()
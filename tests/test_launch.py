@@ -0,0 +1,108 @@
+import os
+import socket
+import pytest
+from shadeform import ShadeformClient, ShadeformError
+from shadeform.journal import Journal
+from shadeform.launch import RACE_TAG, rank_candidates
+from tests.standin import DEFAULT_INSTANCE_TYPES, StandInAPI, StandInServer
+
+LAUNCH = {"type": "docker", "image": "pytorch/pytorch:latest"}
+AWS = {"provider": "aws", "region": "us-west-2", "instance_type": "A100_80Gx1"}
+AWS_EAST = {"provider": "aws", "region": "us-east-1", "instance_type": "A100_80Gx1"}
+LAMBDA = {"provider": "lambdalabs", "region": "us-south-1", "instance_type": "A100_80Gx1"}
+GCP = {"provider": "gcp", "region": "us-central1", "instance_type": "T4_16Gx1"}
+
+def test_rank_candidates_by_price_and_availability():
+    """Test candidates are ordered cheapest first with unavailable ones last."""
+    ranked = rank_candidates([AWS_EAST, AWS, LAMBDA, GCP], DEFAULT_INSTANCE_TYPES)
+    assert ranked == [GCP, LAMBDA, AWS, AWS_EAST]
+
+def test_fastest_candidate_wins_and_loser_is_deleted(tmp_path):
+    """Test the first active launch wins, is renamed and the other is deleted."""
+    api = StandInAPI()
+    api.boot_times = {"lambdalabs": 5.0, "aws": 0.02}
+    with StandInServer(api) as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        journal = Journal(str(tmp_path / "launch.journal"))
+        instance = client.instances.create_first_available(
+            [AWS, LAMBDA], "job", LAUNCH, poll_interval=0.01, journal=journal
+        )
+        assert instance["provider"] == "aws"
+        assert instance["name"] == "job"
+        assert list(api.instances) == [instance["id"]]
+        assert api.instances[instance["id"]]["name"] == "job"
+        assert api.count("POST", "/instances/create") == 2
+        assert client.instances.recover_launches(journal) == []
+        client.close()
+
+def test_rejected_candidate_falls_through():
+    """Test a candidate without capacity is replaced by the next one."""
+    api = StandInAPI()
+    api.unavailable = {("lambdalabs", "us-south-1")}
+    with StandInServer(api) as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        instance = client.instances.create_first_available(
+            [AWS, LAMBDA], "job", LAUNCH, hedge=1, poll_interval=0.01
+        )
+        assert instance["provider"] == "aws"
+        assert list(api.instances) == [instance["id"]]
+        client.close()
+
+def test_all_candidates_failing_leaves_nothing_running():
+    """Test a race without a winner raises and deletes every launch."""
+    api = StandInAPI(boot_time=60)
+    api.unavailable = {("lambdalabs", "us-south-1")}
+    with StandInServer(api) as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        with pytest.raises(ShadeformError, match="No candidate became active"):
+            client.instances.create_first_available(
+                [AWS, LAMBDA], "job", LAUNCH, timeout=0.2, poll_interval=0.01
+            )
+        assert api.instances == {}
+        with pytest.raises(ValueError):
+            client.instances.create_first_available([], "job", LAUNCH)
+        client.close()
+
+def test_recover_deletes_orphans_of_dead_process(tmp_path):
+    """Test recovery deletes launches of a crashed race and compacts the journal."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        journal = Journal(str(tmp_path / "launch.journal"))
+        token = "deadbeef0000"
+        journal.append(
+            {
+                "op": "race",
+                "race": token,
+                "event": "start",
+                "name": "job",
+                "pid": os.getpid(),
+                "host": socket.gethostname(),
+            }
+        )
+        orphan = client.instances.create(
+            "aws", f"job{RACE_TAG}{token}-0", "us-west-2", "A100_80Gx1", LAUNCH
+        )
+        # Created but never journaled, as in a crash right after the request
+        untracked = client.instances.create(
+            "aws", f"job{RACE_TAG}{token}-1", "us-west-2", "A100_80Gx1", LAUNCH
+        )
+        keep = client.instances.create("aws", "other", "us-west-2", "A100_80Gx1", LAUNCH)
+        journal.append({"op": "race", "race": token, "event": "created", "id": orphan["id"]})
+
+        deleted = client.instances.recover_launches(str(tmp_path / "launch.journal"))
+        assert sorted(deleted) == sorted([orphan["id"], untracked["id"]])
+        assert list(server.api.instances) == [keep["id"]]
+        assert list(journal.records()) == []
+        client.close()
+
+def test_journal_survives_torn_record(tmp_path):
+    """Test a record torn by a crash is skipped and later appends stay readable."""
+    path = tmp_path / "launch.journal"
+    journal = Journal(str(path))
+    journal.append({"op": "race", "race": "a", "event": "start"})
+    with open(path, "a") as handle:
+        handle.write('{"op": "race", "ra')
+    journal.append({"op": "race", "race": "a", "event": "closed"})
+    assert [r["event"] for r in journal.records()] == ["start", "closed"]
+    journal.rewrite(lambda r: r["event"] != "start")
+    assert [r["event"] for r in journal.records()] == ["closed"]
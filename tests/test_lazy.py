@@ -0,0 +1,73 @@
+import json
+import pickle
+from collections.abc import Mapping, Sequence
+import pytest
+from shadeform import ShadeformClient, lazy as lazy_module
+from shadeform.lazy import LazyArray, LazyObject, loads
+from shadeform.snapshot import ListSnapshots
+from tests.standin import StandInServer
+
+LAUNCH = {"type": "docker", "image": "pytorch/pytorch:latest"}
+
+DOCUMENT = {
+    "instances": [
+        {"id": "a", "status": "active", "configuration": {"gpus": [1, 2], "tag": "]}"}},
+        {"id": "b\"q", "status": None, "launch_configuration": {}, "ports": []},
+    ],
+    "name": "café \\ list",
+    "total": 2,
+}
+
+@pytest.fixture(autouse=True, params=["msgspec", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test over msgspec raw values and over the stdlib scanner."""
+    if request.param == "msgspec":
+        pytest.importorskip("msgspec")
+    else:
+        monkeypatch.setattr(lazy_module, "msgspec", None)
+    return request.param
+
+def test_loads_decodes_on_access():
+    """Test lazy objects read like the eagerly decoded document."""
+    data = loads((" \n" + json.dumps(DOCUMENT, indent=1) + "\n").encode())
+    assert isinstance(data, LazyObject) and isinstance(data["instances"], LazyArray)
+    assert data["instances"][0]["configuration"]["tag"] == "]}"
+    assert data["instances"][-1]["id"] == 'b"q'
+    assert data["name"] == DOCUMENT["name"]
+    assert data == DOCUMENT and data.materialize() == DOCUMENT
+    assert dict(data)["total"] == 2 and len(data["instances"]) == 2
+    assert "missing" not in data and data.get("missing") is None
+    assert pickle.loads(pickle.dumps(data)) == DOCUMENT
+    assert loads(b"[]") == [] and loads(b" 7 ") == 7
+    with pytest.raises(ValueError):
+        loads(b'{"id": "a", "status": }')["status"]
+    with pytest.raises(ValueError):
+        loads(b"  ")
+
+def test_lazy_client_matches_eager_client():
+    """Test lazy GET responses equal eager ones and POST results stay dicts."""
+    with StandInServer() as server:
+        eager = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        lazy = ShadeformClient(
+            api_key="test-api-key",
+            base_url=server.base_url,
+            lazy_responses=True,
+            snapshots=ListSnapshots(max_age=60),
+        )
+        created = [
+            lazy.instances.create("aws", f"w-{i}", "us-west-2", "A100_80Gx1", LAUNCH)
+            for i in range(3)
+        ]
+        assert all(type(c) is dict for c in created)
+        listed = lazy.instances.list_all()
+        assert isinstance(listed, Sequence) and not isinstance(listed, list)
+        assert [i["id"] for i in listed] == [c["id"] for c in created]
+        assert listed == eager.instances.list_all()
+        info = lazy.instances.get_info(created[0]["id"])
+        assert info == eager.instances.get_info(created[0]["id"])
+        lazy.snapshots.invalidate()
+        info = lazy.instances.get_info(created[1]["id"])
+        assert isinstance(info, Mapping) and info["status"] == "active"
+        assert pickle.loads(pickle.dumps(lazy)).lazy_responses is True
+        eager.close()
+        lazy.close()
@@ -0,0 +1,76 @@
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from shadeform import ShadeformClient
+from shadeform.circuit import CircuitBreakerPolicy
+from shadeform.concurrency import AdaptiveConcurrencyLimiter
+from shadeform.hedging import HedgePolicy
+from shadeform.ratelimit import RateLimiter
+from shadeform.scheduler import PriorityScheduler
+from tests.standin import StandInServer
+
+def _count_instances(client):
+    return os.getpid(), len(client.instances.list_all())
+
+def _list_in_child(client, results):
+    results.put(len(client.instances.list_all()))
+
+def test_pickle_carries_configuration_only(tmp_path):
+    """Test a pickled client keeps its configuration and policies."""
+    client = ShadeformClient(
+        api_key="test-api-key",
+        base_url="http://localhost:1/v1",
+        hedging=HedgePolicy(percentile=90),
+        rate_limiter=RateLimiter(read_rate=5, path=str(tmp_path / "bucket.json")),
+        concurrency=AdaptiveConcurrencyLimiter(initial_limit=8),
+        circuit_breakers=CircuitBreakerPolicy(minimum_calls=3),
+        scheduler=PriorityScheduler(max_in_flight=6),
+        max_connections=7,
+    )
+    client.session  # build a session so there is transport state to drop
+    clone = pickle.loads(pickle.dumps(client))
+
+    assert clone.api_key == "test-api-key"
+    assert clone.base_url == "http://localhost:1/v1"
+    assert clone.max_connections == 7
+    assert clone.hedging.percentile == 90
+    assert clone.rate_limiter.path == client.rate_limiter.path
+    assert clone.concurrency.limit == 8
+    assert clone.circuit_breakers.breaker_options == {"minimum_calls": 3}
+    assert clone.scheduler.capacity == 6
+    assert clone.scheduler.limiter is clone.concurrency
+    assert clone._adapter is None
+    assert clone.session.headers["X-API-Key"] == "test-api-key"
+
+def test_forked_child_gets_fresh_connection_pool():
+    """Test a forked child does not reuse the parent's pooled sockets."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        client.instances.list_all()
+        parent_adapter = client._adapter
+        assert server.connections == 1
+
+        results = multiprocessing.get_context("fork").Queue()
+        child = multiprocessing.get_context("fork").Process(
+            target=_list_in_child, args=(client, results)
+        )
+        child.start()
+        child.join(timeout=10)
+        assert results.get(timeout=5) == 0
+        assert server.connections == 2
+
+        # The parent keeps using its own pooled connection
+        client.instances.list_all()
+        assert client._adapter is parent_adapter
+        assert server.connections == 2
+
+def test_spawned_process_pool_uses_pickled_client():
+    """Test a client can be shipped to spawn-mode worker processes."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+            results = list(pool.map(_count_instances, [client] * 4))
+    assert all(count == 0 for _, count in results)
+    assert all(pid != os.getpid() for pid, _ in results)
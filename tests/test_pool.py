@@ -0,0 +1,107 @@
+import time
+import pytest
+from shadeform import ShadeformClient, ShadeformError
+from shadeform.fleet import InstanceGroup
+from shadeform.pool import InstancePool
+from tests.standin import StandInAPI, StandInServer
+
+LAUNCH = {"type": "docker", "image": "pytorch/pytorch:latest"}
+
+def _pool(client, count=2, **kwargs):
+    group = InstanceGroup("aws", "A100_80Gx1", "us-west-2", count, LAUNCH, name="a100")
+    options = {"sync_interval": 0.02, **kwargs}
+    return InstancePool(client, [group], prefix="test", **options)
+
+def test_lease_is_served_from_standby():
+    """Test leases are instant once the pool is warm and it tops back up."""
+    with StandInServer(StandInAPI(boot_time=0.05)) as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        with _pool(client) as pool:
+            assert pool.wait_ready(timeout=5)
+            start = time.monotonic()
+            instance = pool.lease(instance_type="A100_80Gx1", timeout=1)
+            assert time.monotonic() - start < 0.01
+            assert instance["status"] == "active"
+            assert instance["name"].startswith("test-a100-")
+
+            assert pool.wait_ready(timeout=5)
+            assert pool.stats() == {"a100": {"launching": 0, "ready": 2, "leased": 1}}
+            pool.release(instance)
+            assert pool.stats()["a100"]["ready"] == 3
+        assert server.api.instances == {}
+        assert server.api.count("GET", "/instances/{}/info".format(instance["id"])) == 0
+        client.close()
+
+def test_idle_extras_are_recycled():
+    """Test instances beyond the standby count are deleted after the idle TTL."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        with _pool(client, count=1, idle_ttl=0.1) as pool:
+            assert pool.wait_ready(timeout=5)
+            instance = pool.lease(timeout=1)
+            assert pool.wait_ready(timeout=5)
+            pool.release(instance)
+            deadline = time.monotonic() + 5
+            while len(server.api.instances) > 1 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert len(server.api.instances) == 1
+            assert pool.stats()["a100"]["ready"] == 1
+        client.close()
+
+def test_unhealthy_instances_are_replaced():
+    """Test instances failing the health check are never leased."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        checked = []
+        health = lambda info: checked.append(info["id"]) or len(checked) > 1
+        with _pool(client, count=1, health_check=health) as pool:
+            instance = pool.lease(timeout=5)
+            assert instance["id"] != checked[0]
+            assert checked[0] not in server.api.instances
+            pool.release(instance, recycle=True)
+        client.close()
+
+def test_standby_runs_at_bulk_priority():
+    """Test standby launches and deletes are scheduled as bulk work."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        seen = []
+        request = client.request
+        client.request = lambda method, endpoint, **kwargs: (
+            seen.append((endpoint, kwargs.get("priority"))) or request(method, endpoint, **kwargs)
+        )
+        with _pool(client, count=1) as pool:
+            pool.release(pool.lease(timeout=5), recycle=True)
+            assert pool.wait_ready(timeout=5)
+        writes = [priority for endpoint, priority in seen if endpoint != "/instances"]
+        assert "/instances/create" in dict(seen)
+        assert writes and set(writes) == {"bulk"}
+        client.close()
+
+def test_groups_adopt_only_their_own_instances():
+    """Test a group never adopts instances of a group whose name extends it."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        east = client.instances.create(
+            "aws", "test-gpu-east-0123abcd", "us-east-1", "A100_80Gx1", LAUNCH
+        )
+        groups = [
+            InstanceGroup("aws", "A100_80Gx1", "us-west-2", 1, LAUNCH, name="gpu"),
+            InstanceGroup("aws", "A100_80Gx1", "us-east-1", 1, LAUNCH, name="gpu-east"),
+        ]
+        with InstancePool(client, groups, prefix="test", sync_interval=0.02) as pool:
+            assert pool.wait_ready(timeout=5)
+            assert pool.stats() == {
+                "gpu": {"launching": 0, "ready": 1, "leased": 0},
+                "gpu-east": {"launching": 0, "ready": 1, "leased": 0},
+            }
+            assert server.api.count("POST", "/instances/create") == 2
+            assert pool.lease(region="us-west-2", timeout=1)["id"] != east["id"]
+        client.close()
+
+def test_lease_times_out():
+    """Test lease raises when nothing becomes available in time."""
+    client = ShadeformClient(api_key="test-api-key", base_url="http://127.0.0.1:1/v1")
+    pool = _pool(client, count=0)
+    with pytest.raises(ShadeformError):
+        pool.lease(timeout=0.05)
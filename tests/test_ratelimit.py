@@ -0,0 +1,105 @@
+import multiprocessing
+import time
+import pytest
+from shadeform import ShadeformClient, ShadeformAPIError, ShadeformRateLimitError
+from shadeform.ratelimit import RateLimiter, bucket_for_method
+from tests.standin import StandInServer
+
+def _drain(path, count, results):
+    limiter = RateLimiter(read_rate=0.01, burst=10, path=path, blocking=False)
+    taken = 0
+    for _ in range(count):
+        try:
+            limiter.acquire("GET")
+            taken += 1
+        except ShadeformRateLimitError:
+            pass
+    results.put(taken)
+
+def test_bucket_for_method():
+    """Test reads and mutations use separate buckets."""
+    assert bucket_for_method("GET") == "read"
+    assert bucket_for_method("post") == "mutation"
+
+def test_fail_fast_when_exhausted():
+    """Test a non-blocking limiter raises once the burst is used."""
+    limiter = RateLimiter(read_rate=0.01, mutation_rate=0.01, burst=3, blocking=False)
+    for _ in range(3):
+        limiter.acquire("GET")
+    with pytest.raises(ShadeformRateLimitError) as excinfo:
+        limiter.acquire("GET")
+    assert excinfo.value.retry_after > 0
+    # Mutation budget is independent of the read budget
+    limiter.acquire("POST")
+
+def test_blocking_waits_for_refill():
+    """Test a blocking limiter waits for the next token."""
+    limiter = RateLimiter(read_rate=50, burst=1)
+    limiter.acquire("GET")
+    start = time.monotonic()
+    limiter.acquire("GET")
+    assert time.monotonic() - start >= 0.015
+
+def test_blocking_timeout():
+    """Test a blocking limiter gives up after its timeout."""
+    limiter = RateLimiter(read_rate=0.1, burst=1, timeout=0.05)
+    limiter.acquire("GET")
+    with pytest.raises(ShadeformRateLimitError):
+        limiter.acquire("GET")
+
+def test_file_backed_bucket_shared_across_processes(tmp_path):
+    """Test processes sharing a state file draw from one budget."""
+    path = str(tmp_path / "bucket.json")
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_drain, args=(path, 10, results))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert sum(results.get() for _ in workers) == 10
+
+def test_retry_after_pauses_bucket(tmp_path):
+    """Test a 429 with Retry-After blocks every limiter on the same file."""
+    path = str(tmp_path / "bucket.json")
+    first = RateLimiter(burst=5, path=path, blocking=False)
+    second = RateLimiter(burst=5, path=path, blocking=False)
+    first.observe("GET", 429, {"Retry-After": "30"})
+    with pytest.raises(ShadeformRateLimitError) as excinfo:
+        second.acquire("GET")
+    assert excinfo.value.retry_after > 25
+    second.acquire("POST")
+
+def test_rate_adapts_to_rate_limit_headers():
+    """Test remaining quota is spread over the reset window."""
+    limiter = RateLimiter(read_rate=100, burst=100, blocking=False)
+    limiter.observe("GET", 200, {"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": "10"})
+    limiter.acquire("GET")
+    limiter.acquire("GET")
+    wait = limiter.try_acquire("GET")
+    assert wait == pytest.approx(5.0, rel=0.1)
+
+def test_rate_recovers_after_window_reset():
+    """Test an exhausted window stops throttling once it has reset."""
+    limiter = RateLimiter(read_rate=100, burst=100, blocking=False)
+    limiter.observe("GET", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.2"})
+    assert limiter.try_acquire("GET") > 1
+    time.sleep(0.25)
+    for _ in range(100):
+        limiter.acquire("GET")
+
+def test_client_observes_server_429():
+    """Test the client feeds rate limit responses back into the limiter."""
+    with StandInServer(fault=lambda method, path: 429) as server:
+        server.extra_headers["Retry-After"] = "60"
+        limiter = RateLimiter(blocking=False)
+        client = ShadeformClient(
+            api_key="test-api-key", base_url=server.base_url, rate_limiter=limiter
+        )
+        with pytest.raises(ShadeformAPIError):
+            client.instances.list_all()
+        with pytest.raises(ShadeformRateLimitError):
+            client.instances.list_all()
+        assert server.requests == 1
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 from shadeform import ShadeformClient
 
 @patch('shadeform.client.ShadeformClient.request')
@@ -27,7 +27,8 @@ def test_create_instance(mock_request):
             "region": "us-west-2",
             "instance_type": "A100_80Gx1",
             "launch_configuration": launch_config
-        }
+        },
+        headers={"Idempotency-Key": ANY}
     )
     assert result["id"] == "instance-123"
 
@@ -155,4 +156,19 @@ def test_list_instance_types(mock_request):
     
     mock_request.assert_called_once_with("GET", "/instances/types")
     assert isinstance(result, list)
-    assert result[0]["type"] == "A100_80Gx1"
\ No newline at end of file
+    assert result[0]["type"] == "A100_80Gx1"
+
+
+@patch('shadeform.client.ShadeformClient.request')
+def test_list_instance_types_filtered(mock_request):
+    """Test filtered instance type listings pass query parameters."""
+    mock_request.return_value = {"instance_types": []}
+
+    client = ShadeformClient(api_key="test-api-key")
+    client.instances.list_types(provider="aws", gpu_type="A100", available=True)
+
+    mock_request.assert_called_once_with(
+        "GET",
+        "/instances/types",
+        params={"cloud": "aws", "gpu_type": "A100", "available": "true"}
+    )
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 from shadeform import ShadeformClient
 
 @patch('shadeform.client.ShadeformClient.request')
@@ -23,7 +23,8 @@ def test_add_ssh_key(mock_request):
         json={
             "name": "test-key",
             "public_key": "ssh-rsa AAAA..."
-        }
+        },
+        headers={"Idempotency-Key": ANY}
     )
     assert result["id"] == "key-123"
     assert result["name"] == "test-key"
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 from shadeform import ShadeformClient
 
 @patch('shadeform.client.ShadeformClient.request')
@@ -93,7 +93,8 @@ def test_save_template(mock_request):
             "name": "custom-template",
             "description": "Custom PyTorch environment",
             "launch_configuration": launch_config
-        }
+        },
+        headers={"Idempotency-Key": ANY}
     )
     assert result["id"] == "tmpl-123"
 
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 from shadeform import ShadeformClient
 from shadeform.error import ShadeformValidationError
 
@@ -29,7 +29,8 @@ def test_create_volume(mock_request):
             "name": "test-volume",
             "volume_type": "gp3",
             "size_gb": 100
-        }
+        },
+        headers={"Idempotency-Key": ANY}
     )
     assert result["id"] == "vol-123"
     assert result["size_gb"] == 100
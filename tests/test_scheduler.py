@@ -0,0 +1,106 @@
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from shadeform import ShadeformClient, ShadeformValidationError
+from shadeform.concurrency import AdaptiveConcurrencyLimiter
+from shadeform.scheduler import BULK, INTERACTIVE, NORMAL, PriorityScheduler
+from tests.standin import StandInServer
+
+def _queue_order(scheduler, arrivals):
+    """Queue requests behind a held slot and return the order they run in."""
+    order = []
+    lock = threading.Lock()
+    scheduler.acquire(NORMAL)
+    threads = []
+    for priority in arrivals:
+        def run(priority=priority):
+            with scheduler.slot(priority):
+                with lock:
+                    order.append(priority)
+        thread = threading.Thread(target=run)
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.005)
+    scheduler.release()
+    for thread in threads:
+        thread.join(timeout=2)
+    return order
+
+def test_unknown_priority_rejected():
+    """Test an unknown priority class raises a validation error."""
+    scheduler = PriorityScheduler()
+    with pytest.raises(ShadeformValidationError):
+        scheduler.acquire("urgent")
+
+def test_interactive_overtakes_bulk_backlog():
+    """Test interactive requests jump ahead of queued bulk requests."""
+    scheduler = PriorityScheduler(max_in_flight=1)
+    order = _queue_order(scheduler, [BULK] * 5 + [INTERACTIVE])
+    assert order.index(INTERACTIVE) <= 1
+
+def test_bulk_is_not_starved():
+    """Test bulk requests still get their weighted share."""
+    scheduler = PriorityScheduler(max_in_flight=1, weights={INTERACTIVE: 2, NORMAL: 1, BULK: 1})
+    order = _queue_order(scheduler, [INTERACTIVE] * 6 + [BULK] * 2)
+    assert BULK in order[:4]
+
+def test_dynamic_capacity():
+    """Test capacity can follow another limiter."""
+    capacity = [2]
+    scheduler = PriorityScheduler(max_in_flight=lambda: capacity[0])
+    assert scheduler.metrics()["capacity"] == 2
+    capacity[0] = 5
+    assert scheduler.capacity == 5
+
+@patch('shadeform.client.ShadeformClient.request')
+def test_resource_methods_forward_priority(mock_request):
+    """Test the per-call priority reaches the client request."""
+    mock_request.return_value = {"id": "instance-123"}
+    client = ShadeformClient(api_key="test-api-key")
+    client.instances.get_info("instance-123", priority=INTERACTIVE)
+    mock_request.assert_called_once_with(
+        "GET", "/instances/instance-123/info", priority=INTERACTIVE
+    )
+
+def test_client_dispatches_through_scheduler():
+    """Test requests through the client are counted by the scheduler."""
+    seen = []
+    with StandInServer() as server:
+        scheduler = PriorityScheduler(max_in_flight=2)
+        client = ShadeformClient(
+            api_key="test-api-key", base_url=server.base_url, scheduler=scheduler
+        )
+        server.latency = lambda method, path: seen.append(scheduler.metrics()["in_flight"])
+        client.instances.list_all(priority=BULK)
+        client.volumes.list_all(priority=INTERACTIVE)
+        with pytest.raises(ShadeformValidationError):
+            client.templates.list_all(priority="urgent")
+    assert seen == [1, 1]
+    assert scheduler.metrics()["in_flight"] == 0
+
+def test_priorities_hold_with_adaptive_limiter():
+    """Test interactive calls overtake bulk ones when both limits are set."""
+    arrivals = []
+    with StandInServer() as server:
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        client = ShadeformClient(
+            api_key="test-api-key",
+            base_url=server.base_url,
+            concurrency=limiter,
+            scheduler=PriorityScheduler(max_in_flight=16),
+        )
+        server.latency = lambda method, path: arrivals.append(path) or 0.05
+        calls = [(client.volumes.list_all, BULK)] * 5
+        calls.append((client.instances.list_all, INTERACTIVE))
+        threads = []
+        for call, priority in calls:
+            thread = threading.Thread(target=call, kwargs={"priority": priority})
+            thread.start()
+            threads.append(thread)
+            time.sleep(0.005)
+        for thread in threads:
+            thread.join(timeout=5)
+        assert client.scheduler.capacity == 1
+        client.close()
+    assert arrivals.index("/instances") <= 1
@@ -0,0 +1,68 @@
+import pickle
+import time
+import pytest
+from shadeform import ShadeformAPIError, ShadeformClient
+from shadeform.snapshot import ListSnapshots
+from tests.standin import StandInServer
+
+LAUNCH = {"type": "docker", "image": "pytorch/pytorch:latest"}
+
+def _client(server, **kwargs):
+    return ShadeformClient(
+        api_key="test-api-key",
+        base_url=server.base_url,
+        snapshots=ListSnapshots(**kwargs),
+    )
+
+def _launch(client, count):
+    return [
+        client.instances.create("aws", f"w-{i}", "us-west-2", "A100_80Gx1", LAUNCH)["id"]
+        for i in range(count)
+    ]
+
+def test_get_info_is_served_from_list_snapshot():
+    """Test get_info after list_all needs no per-item requests."""
+    with StandInServer() as server:
+        client = _client(server, max_age=60)
+        ids = _launch(client, 5)
+        volume = client.volumes.create("aws", "data", 100, "gp3")
+        listed = {i["id"]: i for i in client.instances.list_all()}
+        client.volumes.list_all()
+        for instance_id in ids:
+            assert client.instances.get_info(instance_id) == listed[instance_id]
+        assert client.volumes.get_info(volume["id"])["name"] == "data"
+        assert server.api.count("GET", "/instances/{}/info".format(ids[0])) == 0
+        assert client.snapshots.stats()["hits"] == 6
+        client.close()
+
+def test_misses_and_missing_fields_fall_through():
+    """Test unknown ids and records lacking required fields hit /info."""
+    with StandInServer() as server:
+        client = _client(server, max_age=60)
+        ids = _launch(client, 2)
+        client.instances.list_all()
+        late = client.instances.create("aws", "late", "us-west-2", "A100_80Gx1", LAUNCH)["id"]
+        assert client.instances.get_info(late)["id"] == late
+        assert server.api.count("GET", f"/instances/{late}/info") == 1
+        client.instances.get_info(ids[0], fields=["id", "hourly_price"])
+        assert server.api.count("GET", f"/instances/{ids[0]}/info") == 1
+        assert client.snapshots.stats()["misses"] == 2
+        client.close()
+
+def test_stale_and_changed_records_are_refetched():
+    """Test snapshots expire and mutations drop the affected record."""
+    with StandInServer() as server:
+        client = _client(server, max_age=0.05)
+        ids = _launch(client, 2)
+        client.instances.list_all()
+        time.sleep(0.1)
+        client.instances.get_info(ids[0])
+        assert server.api.count("GET", f"/instances/{ids[0]}/info") == 1
+
+        client.snapshots.max_age = 60
+        client.instances.list_all()
+        client.instances.delete(ids[1])
+        with pytest.raises(ShadeformAPIError):
+            client.instances.get_info(ids[1])
+        assert pickle.loads(pickle.dumps(client)).snapshots.max_age == 60
+        client.close()
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+from shadeform import ShadeformClient
+from shadeform.resources import InstanceClient
+
+def _loaded_modules(code):
+    """Run code in a fresh interpreter and return the modules it imported."""
+    script = code + "\nimport sys\nprint(' '.join(sorted(sys.modules)))"
+    output = subprocess.check_output([sys.executable, "-c", script], text=True)
+    return set(output.split())
+
+def test_import_does_not_load_requests():
+    """Test importing the package does not import requests or resources."""
+    modules = _loaded_modules("import shadeform")
+    assert "requests" not in modules
+    assert "shadeform.client" not in modules
+    assert "shadeform.resources.instances" not in modules
+
+def test_construction_is_lazy():
+    """Test building a client defers the session and resource clients."""
+    modules = _loaded_modules(
+        "from shadeform import ShadeformClient\n"
+        "client = ShadeformClient(api_key='test-api-key')"
+    )
+    assert "requests" not in modules
+    assert not any(name.startswith("shadeform.resources.") for name in modules)
+
+def test_only_touched_resources_are_loaded():
+    """Test touching instances does not import the other resource modules."""
+    modules = _loaded_modules(
+        "from shadeform import ShadeformClient\n"
+        "ShadeformClient(api_key='test-api-key').instances"
+    )
+    assert "shadeform.resources.instances" in modules
+    assert "shadeform.resources.volumes" not in modules
+    assert "shadeform.resources.templates" not in modules
+
+def test_resource_clients_are_cached():
+    """Test a resource client is built once per client."""
+    client = ShadeformClient(api_key="test-api-key")
+    assert "instances" not in vars(client)
+    assert isinstance(client.instances, InstanceClient)
+    assert client.instances is client.instances
+    assert client.instances.client is client
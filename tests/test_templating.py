@@ -0,0 +1,97 @@
+import json
+import pytest
+from shadeform import LaunchConfiguration, ShadeformClient, ShadeformValidationError
+from shadeform.batch import LaunchBatch
+from shadeform.templating import CompiledTemplate
+from tests.standin import StandInServer
+
+TEMPLATE = LaunchConfiguration.docker(
+    "pytorch/pytorch:{{ tag }}",
+    command="python train.py --run {{run_id}} --seed {{seed}}",
+    env_vars={"RUN": "{{run_id}}", "NOTE": 'é "{{ note }}"'},
+    ports="{{ports}}",
+)
+
+def _expected(tag, run_id, seed, note, ports):
+    return LaunchConfiguration.docker(
+        f"pytorch/pytorch:{tag}",
+        command=f"python train.py --run {run_id} --seed {seed}",
+        env_vars={"RUN": run_id, "NOTE": f'é "{note}"'},
+        ports=ports,
+    )
+
+def test_render_matches_the_equivalent_dict():
+    """Test rendered JSON is the canonical encoding of the filled-in dict."""
+    compiled = CompiledTemplate(TEMPLATE)
+    assert compiled.placeholders == {"tag", "run_id", "seed", "note", "ports"}
+    values = dict(tag="2.3", run_id='job-"7"', seed=17, note="ü\n", ports=[22, 8888])
+    expected = _expected(**values)
+    assert compiled.render(values) == expected
+    assert compiled.render_json(**values) == json.dumps(
+        expected, sort_keys=True, separators=(",", ":")
+    ).encode()
+
+    with pytest.raises(ShadeformValidationError) as missing:
+        compiled.render(tag="2.3")
+    assert missing.value.field == "note"
+    with pytest.raises(ShadeformValidationError) as unknown:
+        compiled.render(values, extra=1)
+    assert unknown.value.field == "extra"
+    with pytest.raises(ShadeformValidationError) as nested:
+        compiled.render(values, tag=["2.3"])
+    assert nested.value.field == "tag"
+    with pytest.raises(ShadeformValidationError):
+        CompiledTemplate({"type": "{{ kind }}"})
+    with pytest.raises(ShadeformValidationError) as key:
+        CompiledTemplate({"type": "docker", "environment": [{"{{ k }}": 1}]})
+    assert key.value.field == "{{ k }}"
+
+def test_compile_fetches_once_per_version():
+    """Test compiled templates are cached until the template changes."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        template_id = client.templates.save("train", TEMPLATE)["id"]
+        info = f"/templates/{template_id}/info"
+        for seed in range(20):
+            client.templates.compile(template_id).render_json(
+                tag="2.3", run_id=f"job-{seed}", seed=seed, note="", ports=[22]
+            )
+        assert server.api.count("GET", info) == 1
+        assert client.templates.compiled.stats()["hits"] == 19
+
+        client.templates.update(template_id, {"version": "2"})
+        assert client.templates.compile(template_id).version == "2"
+        assert client.templates.compile(template_id, version="2").version == "2"
+        assert server.api.count("GET", info) == 2
+        with pytest.raises(ShadeformValidationError) as error:
+            client.templates.compile(template_id, version="3")
+        assert error.value.field == "version"
+        client.close()
+
+def test_rendered_configs_launch_as_a_batch():
+    """Test LaunchBatch sends rendered configurations as given."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        template_id = client.templates.save("train", TEMPLATE)["id"]
+        compiled = client.templates.compile(template_id)
+        jobs = [dict(tag="2.3", run_id=f"job-{i}", seed=i, note="", ports=[22]) for i in range(4)]
+        batch = LaunchBatch(
+            names=[job["run_id"] for job in jobs],
+            instance_types="A100_80Gx1",
+            regions="us-west-2",
+            providers="aws",
+            launch_configs=[compiled.render_json(job) for job in jobs],
+        )
+        batch.check()
+        assert batch.payload(1)["launch_configuration"] == _expected(**jobs[1])
+        for raw in (b'{"type":"bogus"}', b'{"type": "docker"}'):
+            errors = LaunchBatch(["x"], "A100_80Gx1", "us-west-2", "aws", raw).validate()
+            assert errors == [(0, "launch_configuration", errors[0][2])]
+        ids = [f.result()["id"] for f in client.instances.create_batch(batch)]
+        launched = client.instances.get_info(ids[2])
+        assert launched["launch_configuration"]["command"].endswith("job-2 --seed 2")
+        created = client.instances.create(
+            "aws", "job-3", "us-west-2", "A100_80Gx1", _expected(**jobs[3])
+        )
+        assert created["id"] == ids[3]
+        client.close()
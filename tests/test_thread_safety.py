@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from shadeform import ShadeformClient
+from tests.standin import StandInServer
+
+THREADS = 48
+MAX_CONNECTIONS = 8
+
+def _exercise(client, worker):
+    """Run one full lifecycle through every resource client."""
+    name = f"worker-{worker}"
+    launch = {"type": "docker", "image": "pytorch/pytorch:latest"}
+
+    key = client.ssh_keys.add(name, f"ssh-ed25519 AAAA{worker}")
+    assert client.ssh_keys.get_info(key["id"])["name"] == name
+
+    volume = client.volumes.create("aws", name, 100, "gp3")
+    assert client.volumes.get_info(volume["id"])["name"] == name
+
+    instance = client.instances.create(
+        "aws", name, "us-west-2", "A100_80Gx1", launch, ssh_key_id=key["id"]
+    )
+    assert client.instances.get_info(instance["id"])["name"] == name
+    client.instances.update(instance["id"], {"name": f"{name}-renamed"})
+    assert client.instances.get_info(instance["id"])["name"] == f"{name}-renamed"
+    client.instances.restart(instance["id"])
+    client.instances.delete(instance["id"])
+    client.volumes.delete(volume["id"])
+
+    template = client.templates.save(name, launch)
+    assert client.templates.get_info(template["id"])["name"] == name
+    client.templates.delete(template["id"])
+    client.instances.list_types()
+    return threading.get_ident(), id(client.session)
+
+def test_shared_client_under_thread_load():
+    """Test many threads can share one client with a bounded connection pool."""
+    with StandInServer() as server:
+        client = ShadeformClient(
+            api_key="test-api-key",
+            base_url=server.base_url,
+            max_connections=MAX_CONNECTIONS,
+        )
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(lambda w: _exercise(client, w), range(THREADS * 2)))
+
+        assert len(client.ssh_keys.list_all()) == THREADS * 2
+        assert client.instances.list_all() == []
+        assert client.volumes.list_all() == []
+        assert client.templates.list_all() == []
+        assert server.connections <= MAX_CONNECTIONS
+        client.close()
+
+    sessions_by_thread = {}
+    for thread_id, session_id in results:
+        sessions_by_thread.setdefault(thread_id, set()).add(session_id)
+    assert all(len(ids) == 1 for ids in sessions_by_thread.values())
+
+def test_each_thread_gets_its_own_session():
+    """Test sessions are per thread but share the connection adapter."""
+    client = ShadeformClient(api_key="test-api-key")
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(client.session))
+    thread.start()
+    thread.join()
+    assert sessions[0] is not client.session
+    assert sessions[0].get_adapter("https://") is client.session.get_adapter("https://")
+    assert sessions[0].headers["X-API-Key"] == "test-api-key"
@@ -1,4 +1,5 @@
 from shadeform.utils import LaunchConfiguration, VolumeConfiguration
+from shadeform.utils.helpers import validate_instance_type, validate_volume_type
 
 def test_docker_launch_config_minimal():
     """Test creating a minimal Docker launch configuration."""
@@ -117,4 +118,13 @@ def test_docker_launch_config_command_list():
     )
     
     assert config["type"] == "docker"
-    assert config["command"] == "python -m pytest tests/"
\ No newline at end of file
+    assert config["command"] == "python -m pytest tests/"
+
+def test_instance_and_volume_type_formats():
+    """Test type validators check the format, not a fixed list of names."""
+    assert validate_instance_type("H100_80Gx8")
+    assert validate_instance_type("H100_80G_SXM5x8")
+    assert not validate_instance_type("H100")
+    assert not validate_instance_type("A100_80Gx0")
+    assert validate_volume_type("pd-ssd")
+    assert not validate_volume_type("gp 3")
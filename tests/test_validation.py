@@ -0,0 +1,68 @@
+import pickle
+import pytest
+from shadeform import ShadeformClient, ShadeformValidationError
+from shadeform.validation import SchemaValidator
+from tests.standin import StandInServer
+
+LAUNCH = {"type": "docker", "image": "pytorch/pytorch:latest"}
+
+def _client(server, validation, **kwargs):
+    return ShadeformClient(
+        api_key="test-api-key", base_url=server.base_url, validation=validation, **kwargs
+    )
+
+def test_strict_mode_accepts_valid_traffic():
+    """Test every call of a normal workflow passes strict validation."""
+    with StandInServer() as server:
+        client = _client(server, "strict")
+        instance = client.instances.create("aws", "w", "us-west-2", "A100_80Gx1", LAUNCH)
+        client.instances.update(instance["id"], {"name": "w2"})
+        client.instances.list_all()
+        client.instances.get_info(instance["id"])
+        client.instances.list_types()
+        client.volumes.create("aws", "data", 100, "gp3")
+        client.volumes.list_types()
+        key = client.ssh_keys.add("ops", "ssh-ed25519 AAAA")
+        client.ssh_keys.set_default(key["id"])
+        client.ssh_keys.list_all()
+        client.templates.save("t", LAUNCH, description="d")
+        client.templates.list_all()
+        client.instances.delete(instance["id"])
+        stats = client.validation.stats()
+        assert stats["failures"] == 0 and stats["checked"] == 18
+        client.close()
+
+def test_invalid_payloads_are_rejected_before_sending():
+    """Test payloads not matching their schema raise without a request."""
+    with StandInServer() as server:
+        client = _client(server, SchemaValidator("sampled"))
+        with pytest.raises(ShadeformValidationError) as info:
+            client.templates.save("t", {"type": "vm"})
+        assert info.value.field == "launch_configuration.type"
+        with pytest.raises(ShadeformValidationError) as info:
+            client.instances.update("any", {"name": 5})
+        assert info.value.field == "name"
+        assert server.requests == 0
+        client.close()
+
+def test_response_drift_is_caught_and_sampled():
+    """Test malformed responses raise, and sampling skips most responses."""
+    with StandInServer() as server:
+        server.api.instance_types[0]["availability"] = [{"region": "us-west-2"}]
+        client = _client(server, "strict", lazy_responses=True)
+        with pytest.raises(ShadeformValidationError) as info:
+            client.instances.list_types()
+        assert info.value.field.endswith("availability.0.available")
+
+        validator = SchemaValidator("sampled", sample_rate=3)
+        client = _client(server, validator)
+        for _ in range(6):
+            client.volumes.list_all()
+        assert validator.stats() == {"checked": 2, "skipped": 4, "failures": 0}
+        assert pickle.loads(pickle.dumps(client)).validation.sample_rate == 3
+        off = _client(server, "off")
+        assert len(off.instances.list_types()) == 4
+        with pytest.raises(ValueError):
+            SchemaValidator("loose")
+        client.close()
+        off.close()
@@ -0,0 +1,90 @@
+import threading
+import time
+import pytest
+import urllib3
+from shadeform import ShadeformClient, ShadeformValidationError
+from shadeform.catalog import INSTANCE_TYPES, CatalogCache
+from tests.standin import StandInServer
+
+def test_warmup_opens_connections_and_preloads():
+    """Test warmup leaves a hot pool and a filled catalog cache."""
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        summary = client.warmup(
+            connections=4,
+            preload=["instance_types", "volume_types", "templates_featured"],
+        ).result(timeout=10)
+        assert summary == {
+            "connections": 4,
+            "preloaded": ["instance_types", "volume_types", "templates_featured"],
+        }
+        assert server.connections == 4
+        assert server.requests == 3
+
+        types = client.instances.list_types()
+        assert types[0]["type"] == "A100_80Gx1"
+        assert client.volumes.list_types()[0]["name"] == "gp3"
+        assert server.api.count("GET", "/instances/types") == 1
+        assert client.instances.list_all() == []
+        assert server.connections == 4
+        client.close()
+
+def test_warmup_connections_are_capped():
+    """Test warmup never opens more than max_connections."""
+    with StandInServer() as server:
+        client = ShadeformClient(
+            api_key="test-api-key", base_url=server.base_url, max_connections=2
+        )
+        assert client.warmup(connections=10).result(timeout=10)["connections"] == 2
+        assert client.warmup(connections=10).result(timeout=10)["connections"] == 0
+        assert server.connections == 2
+        assert client.catalog is None
+        client.close()
+
+def test_warmup_falls_back_to_requests(monkeypatch):
+    """Test warmup opens connections with requests on unknown urllib3 versions."""
+    monkeypatch.setattr(urllib3, "__version__", "3.0.0")
+    with StandInServer() as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        assert client.warmup(connections=2).result(timeout=10)["connections"] >= 1
+        assert server.connections >= 1
+        client.close()
+
+def test_warmup_rejects_unknown_catalog():
+    """Test unknown catalog names are rejected up front."""
+    client = ShadeformClient(api_key="test-api-key")
+    with pytest.raises(ShadeformValidationError):
+        client.warmup(preload=["gpus"])
+
+def test_catalog_cache_expires():
+    """Test entries are refetched once older than the ttl."""
+    cache = CatalogCache(ttl=0.05)
+    loads = []
+    loader = lambda: loads.append(1) or [{"type": "A100_80Gx1"}]
+    cache.get_or_load(INSTANCE_TYPES, loader)
+    cache.get_or_load(INSTANCE_TYPES, loader)
+    assert len(loads) == 1
+    time.sleep(0.06)
+    assert cache.get(INSTANCE_TYPES) is None
+    cache.get_or_load(INSTANCE_TYPES, loader)
+    assert len(loads) == 2
+
+def test_catalog_cache_single_flight():
+    """Test concurrent misses share one fetch."""
+    cache = CatalogCache()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return []
+
+    threads = [
+        threading.Thread(target=cache.get_or_load, args=(INSTANCE_TYPES, loader))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1
@@ -0,0 +1,101 @@
+import time
+import pytest
+from shadeform import ShadeformClient, ShadeformWorkflowError, VolumeConfiguration
+from shadeform.workflow import Workflow, wait_for_status
+from tests.standin import StandInAPI, StandInServer
+
+LAUNCH = {"type": "docker", "image": "pytorch/pytorch:latest"}
+
+def _provisioning(client):
+    """Build the key + volume -> instance -> active workflow."""
+    flow = Workflow()
+    flow.step(
+        "key",
+        lambda r: client.ssh_keys.add("ops", "ssh-ed25519 AAAA"),
+        compensate=lambda key: client.ssh_keys.delete(key["id"]),
+    )
+    flow.step(
+        "volume",
+        lambda r: wait_for_status(
+            lambda: client.volumes.get_info(
+                client.volumes.create("aws", "data", 100, "gp3")["id"]
+            ),
+            interval=0.01,
+        ),
+        compensate=lambda volume: client.volumes.delete(volume["id"]),
+    )
+    flow.step(
+        "instance",
+        lambda r: client.instances.create(
+            "aws", "job", "us-west-2", "A100_80Gx1", LAUNCH,
+            ssh_key_id=r["key"]["id"],
+            volumes=[VolumeConfiguration.create_attachment(r["volume"]["id"], "/mnt/data")],
+        ),
+        after=["key", "volume"],
+        compensate=lambda instance: client.instances.delete(instance["id"]),
+    )
+    flow.step(
+        "active",
+        lambda r: wait_for_status(
+            lambda: client.instances.get_info(r["instance"]["id"]), interval=0.01
+        ),
+        after=["instance"],
+    )
+    return flow
+
+def test_provisioning_runs_on_critical_path():
+    """Test independent steps overlap and results flow into dependents."""
+    slow = lambda method, path: 0.2 if path in ("/sshkeys/add", "/volumes/create") else 0
+    with StandInServer(StandInAPI(boot_time=0.05), latency=slow) as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        flow = _provisioning(client)
+        # Time the critical path, not the first request's imports and connect
+        client.instances.list_all()
+        start = time.monotonic()
+        results = flow.run()
+        assert time.monotonic() - start < 0.39
+        assert results["active"]["status"] == "active"
+        instance = server.api.instances[results["instance"]["id"]]
+        assert instance["volume_ids"] == [results["volume"]["id"]]
+        assert flow.timings["key"] < flow.timings["instance"] < flow.timings["active"]
+        client.close()
+
+def test_failure_compensates_completed_steps():
+    """Test a failed step undoes the steps that completed before it."""
+    fail = lambda method, path: 500 if path == "/instances/create" else None
+    with StandInServer(fault=fail) as server:
+        client = ShadeformClient(api_key="test-api-key", base_url=server.base_url)
+        with pytest.raises(ShadeformWorkflowError) as excinfo:
+            _provisioning(client).run()
+        assert excinfo.value.step == "instance"
+        assert excinfo.value.compensation_errors == {}
+        assert server.api.ssh_keys == {}
+        assert server.api.volumes == {}
+        assert server.api.instances == {}
+        client.close()
+
+def test_failure_stops_new_steps_and_reports_cleanup_errors():
+    """Test dependents of a failed step never start."""
+    started = []
+    flow = Workflow(max_workers=2)
+
+    def boom(results):
+        raise RuntimeError("boom")
+
+    def broken_undo(result):
+        raise RuntimeError("undo failed")
+
+    flow.step("a", lambda r: started.append("a") or 1, compensate=broken_undo)
+    flow.step("b", boom)
+    flow.step("c", lambda r: started.append("c"), after=["a", "b"])
+    with pytest.raises(ShadeformWorkflowError) as excinfo:
+        flow.run()
+    assert started == ["a"]
+    assert isinstance(excinfo.value.cause, RuntimeError)
+    assert list(excinfo.value.compensation_errors) == ["a"]
+
+def test_unknown_dependency_is_rejected():
+    """Test steps may only depend on steps added before them."""
+    flow = Workflow()
+    with pytest.raises(ValueError):
+        flow.step("instance", lambda r: None, after=["volume"])